@@ -1,8 +1,42 @@
 # app/config.py
-from app.env import LOG_LEVEL, PLUGIN_DIRECTORY, DATABASE_URL
+from app.env import (
+    LOG_LEVEL, LOG_FILE, LOG_MAX_BYTES, LOG_BACKUP_COUNT, PLUGIN_DIRECTORY, DATABASE_URL,
+    RESULT_CACHE_SIZE, RESULT_CACHE_MAX_BYTES, HISTORY_CAPACITY, HISTORY_BACKEND, HISTORY_LOG_PATH,
+    NUMERIC_BACKEND, FIXED_POINT_SCALE, LARGE_OPERAND_DIGITS, PARALLEL_REDUCE_MIN_OPERANDS,
+    PLUGIN_RELOAD, PLUGIN_RELOAD_INTERVAL,
+    ISOLATED_PLUGINS, ISOLATION_WORKERS, ISOLATION_TIMEOUT, ISOLATION_MEMORY_MB,
+    SERVER_HOST, SERVER_PORT, SERVER_MAX_CONCURRENCY, SERVER_MAX_PENDING, SERVER_PIPELINE_DEPTH,
+    METRICS_ENABLED, METRICS_EXPORT_PATH, METRICS_EXPORT_INTERVAL,
+)
 
 # ✅ Application Configuration (Can be extended later)
 class Config:
     LOG_LEVEL = LOG_LEVEL
+    LOG_FILE = LOG_FILE
+    LOG_MAX_BYTES = LOG_MAX_BYTES
+    LOG_BACKUP_COUNT = LOG_BACKUP_COUNT
     PLUGIN_DIRECTORY = PLUGIN_DIRECTORY
-    DATABASE_URL = DATABASE_URL
\ No newline at end of file
+    DATABASE_URL = DATABASE_URL
+    RESULT_CACHE_SIZE = RESULT_CACHE_SIZE
+    RESULT_CACHE_MAX_BYTES = RESULT_CACHE_MAX_BYTES
+    HISTORY_CAPACITY = HISTORY_CAPACITY
+    HISTORY_BACKEND = HISTORY_BACKEND
+    HISTORY_LOG_PATH = HISTORY_LOG_PATH
+    NUMERIC_BACKEND = NUMERIC_BACKEND
+    FIXED_POINT_SCALE = FIXED_POINT_SCALE
+    LARGE_OPERAND_DIGITS = LARGE_OPERAND_DIGITS
+    PARALLEL_REDUCE_MIN_OPERANDS = PARALLEL_REDUCE_MIN_OPERANDS
+    PLUGIN_RELOAD = PLUGIN_RELOAD
+    PLUGIN_RELOAD_INTERVAL = PLUGIN_RELOAD_INTERVAL
+    ISOLATED_PLUGINS = ISOLATED_PLUGINS
+    ISOLATION_WORKERS = ISOLATION_WORKERS
+    ISOLATION_TIMEOUT = ISOLATION_TIMEOUT
+    ISOLATION_MEMORY_MB = ISOLATION_MEMORY_MB
+    SERVER_HOST = SERVER_HOST
+    SERVER_PORT = SERVER_PORT
+    SERVER_MAX_CONCURRENCY = SERVER_MAX_CONCURRENCY
+    SERVER_MAX_PENDING = SERVER_MAX_PENDING
+    SERVER_PIPELINE_DEPTH = SERVER_PIPELINE_DEPTH
+    METRICS_ENABLED = METRICS_ENABLED
+    METRICS_EXPORT_PATH = METRICS_EXPORT_PATH
+    METRICS_EXPORT_INTERVAL = METRICS_EXPORT_INTERVAL
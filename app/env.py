@@ -11,8 +11,44 @@ def get_env_var(var_name, default=None):
 
 # ✅ Define key environment variables
 LOG_LEVEL = get_env_var("LOG_LEVEL", "INFO").upper()
+LOG_FILE = get_env_var("LOG_FILE", "app.log")
+LOG_MAX_BYTES = int(get_env_var("LOG_MAX_BYTES", str(10 * 1024 * 1024)))
+LOG_BACKUP_COUNT = int(get_env_var("LOG_BACKUP_COUNT", "5"))
 PLUGIN_DIRECTORY = get_env_var("PLUGIN_DIRECTORY", "operations")
 DATABASE_URL = get_env_var("DATABASE_URL", "sqlite:///calculator2.db")
+RESULT_CACHE_SIZE = int(get_env_var("RESULT_CACHE_SIZE", "1024"))
+RESULT_CACHE_MAX_BYTES = int(get_env_var("RESULT_CACHE_MAX_BYTES", str(8 * 1024 * 1024)))
+HISTORY_CAPACITY = int(get_env_var("HISTORY_CAPACITY", "10000"))
+HISTORY_BACKEND = get_env_var("HISTORY_BACKEND", "memory").lower()
+HISTORY_LOG_PATH = get_env_var("HISTORY_LOG_PATH", "calculator2_history.log")
+NUMERIC_BACKEND = get_env_var("NUMERIC_BACKEND", "decimal").lower()
+FIXED_POINT_SCALE = int(get_env_var("FIXED_POINT_SCALE", "2"))
+LARGE_OPERAND_DIGITS = int(get_env_var("LARGE_OPERAND_DIGITS", "1000"))
+PARALLEL_REDUCE_MIN_OPERANDS = int(get_env_var("PARALLEL_REDUCE_MIN_OPERANDS", "0"))
+PLUGIN_RELOAD = get_env_var("PLUGIN_RELOAD", "false").lower() in ("1", "true", "yes", "on")
+PLUGIN_RELOAD_INTERVAL = float(get_env_var("PLUGIN_RELOAD_INTERVAL", "1"))
+ISOLATED_PLUGINS = get_env_var("ISOLATED_PLUGINS", "")
+ISOLATION_WORKERS = int(get_env_var("ISOLATION_WORKERS", "2"))
+ISOLATION_TIMEOUT = float(get_env_var("ISOLATION_TIMEOUT", "5"))
+ISOLATION_MEMORY_MB = int(get_env_var("ISOLATION_MEMORY_MB", "256"))
+SERVER_HOST = get_env_var("SERVER_HOST", "127.0.0.1")
+SERVER_PORT = int(get_env_var("SERVER_PORT", "8765"))
+SERVER_MAX_CONCURRENCY = int(get_env_var("SERVER_MAX_CONCURRENCY", "64"))
+SERVER_MAX_PENDING = int(get_env_var("SERVER_MAX_PENDING", "1024"))
+SERVER_PIPELINE_DEPTH = int(get_env_var("SERVER_PIPELINE_DEPTH", "128"))
+METRICS_ENABLED = get_env_var("METRICS_ENABLED", "false").lower() in ("1", "true", "yes", "on")
+METRICS_EXPORT_PATH = get_env_var("METRICS_EXPORT_PATH", "")
+METRICS_EXPORT_INTERVAL = float(get_env_var("METRICS_EXPORT_INTERVAL", "15"))
 
 # ✅ Export all relevant variables
-__all__ = ["get_env_var", "LOG_LEVEL", "PLUGIN_DIRECTORY", "DATABASE_URL"]
+__all__ = [
+    "get_env_var", "LOG_LEVEL", "LOG_FILE", "LOG_MAX_BYTES", "LOG_BACKUP_COUNT",
+    "PLUGIN_DIRECTORY", "DATABASE_URL",
+    "RESULT_CACHE_SIZE", "RESULT_CACHE_MAX_BYTES", "HISTORY_CAPACITY",
+    "HISTORY_BACKEND", "HISTORY_LOG_PATH", "NUMERIC_BACKEND", "FIXED_POINT_SCALE",
+    "LARGE_OPERAND_DIGITS", "PARALLEL_REDUCE_MIN_OPERANDS",
+    "PLUGIN_RELOAD", "PLUGIN_RELOAD_INTERVAL",
+    "ISOLATED_PLUGINS", "ISOLATION_WORKERS", "ISOLATION_TIMEOUT", "ISOLATION_MEMORY_MB",
+    "SERVER_HOST", "SERVER_PORT", "SERVER_MAX_CONCURRENCY", "SERVER_MAX_PENDING", "SERVER_PIPELINE_DEPTH",
+    "METRICS_ENABLED", "METRICS_EXPORT_PATH", "METRICS_EXPORT_INTERVAL",
+]
@@ -0,0 +1,60 @@
+"""Per-call dispatch overhead: validated entry points versus the trusted fast path.
+
+Run from the project root:
+
+    python benchmarks/bench_dispatch.py [--number N]
+"""
+
+import argparse
+import os
+import sys
+import timeit
+from decimal import Decimal
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from calculator import CalculatorREPL  # noqa: E402  pylint: disable=wrong-import-position
+from history import History  # noqa: E402  pylint: disable=wrong-import-position
+from operation_base import Operation  # noqa: E402  pylint: disable=wrong-import-position
+
+OPERATORS = {"add": "+", "subtract": "-", "multiply": "*", "divide": "/"}
+
+
+def measure(statement, namespace, number, repeat=5):
+    """Best-of-`repeat` time per call in nanoseconds."""
+    return min(timeit.repeat(statement, globals=namespace, number=number, repeat=repeat)) / number * 1e9
+
+
+def run(number):
+    """Benchmarks every built-in operation and prints one table row per entry point."""
+    a, b = Decimal("12345.6789"), Decimal("3.21")
+    History.set_capacity(1)  # keep the history deque from growing during the run
+    print(f"{'operation':<10} {'path':<28} {'ns/call':>9} {'overhead':>9}")
+    for name, symbol in OPERATORS.items():
+        namespace = {
+            "a": a, "b": b, "name": name,
+            "run_operation": CalculatorREPL.run_operation,
+            "operation_class": Operation.get_operation(name),
+            "kernel": Operation.bind(name),
+        }
+        baseline = measure(f"a {symbol} b", namespace, number)
+        paths = {
+            "run_operation (cached)": "run_operation(name, a, b)",
+            "Operation.execute": "operation_class.execute(a, b)",
+            "Operation.bind (trusted)": "kernel(a, b)",
+            "bare arithmetic": f"a {symbol} b",
+        }
+        for label, statement in paths.items():
+            elapsed = baseline if statement == f"a {symbol} b" else measure(statement, namespace, number)
+            print(f"{name:<10} {label:<28} {elapsed:>9.1f} {elapsed - baseline:>9.1f}")
+
+
+def main(argv=None):
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=200_000, help="calls per timing repeat")
+    run(parser.parse_args(argv).number)
+
+
+if __name__ == "__main__":
+    main()
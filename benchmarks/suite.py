@@ -0,0 +1,261 @@
+"""Benchmark suite: operation throughput, REPL parsing, history growth, large operands and plugin loading.
+
+Every result is a time per call in nanoseconds (lower is better). Run from
+the project root:
+
+    python benchmarks/suite.py --output results.json
+    python benchmarks/suite.py --save-baseline             # record benchmarks/baseline.json
+    python benchmarks/suite.py --threshold 0.15            # compare with it; exit 1 on regressions
+
+Baselines are machine-specific: record one on the machine that compares against it.
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import timeit
+from decimal import Decimal
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from calculator import CalculatorREPL  # noqa: E402  pylint: disable=wrong-import-position
+from history import History  # noqa: E402  pylint: disable=wrong-import-position
+from operation_base import Operation  # noqa: E402  pylint: disable=wrong-import-position
+
+DEFAULT_BASELINE = os.path.join(PROJECT_ROOT, "benchmarks", "baseline.json")
+DEFAULT_THRESHOLD = 0.10
+RESULTS_VERSION = 1
+HISTORY_SIZES = (1_000, 10_000, 100_000)
+OPERAND_DIGITS = (10, 100, 1_000, 10_000, 100_000, 1_000_000)
+
+BENCHMARKS = {}
+
+
+def benchmark(group):
+    """Registers a benchmark function returning `{result_name: ns_per_call}`."""
+    def register(function):
+        BENCHMARKS[group] = function
+        return function
+    return register
+
+
+def per_call(function, number, repeat=5):
+    """Best-of-`repeat` nanoseconds per call of a zero-argument callable."""
+    return min(timeit.repeat(function, number=number, repeat=repeat)) / number * 1e9
+
+
+@benchmark("operations")
+def bench_operations(scale=1.0):
+    """Throughput of `execute` for every registered `Operation` subclass."""
+    a, b = Decimal("12345.6789"), Decimal("3.21")
+    number = max(1, int(100_000 * scale))
+    return {f"operations.{name}.execute": per_call(lambda cls=operation_class: cls.execute(a, b), number)
+            for name, operation_class in sorted(Operation.registry.items())}
+
+
+@benchmark("repl")
+def bench_repl_parsing(scale=1.0):
+    """Parsing REPL calculation lines, valid and malformed."""
+    number = max(1, int(100_000 * scale))
+    parse = CalculatorREPL.parse_calculation
+
+    def invalid():
+        try:
+            parse("add five 3")
+        except ValueError:
+            pass
+
+    return {
+        "repl.parse_calculation": per_call(lambda: parse("multiply 12.5 -3.75"), number),
+        "repl.parse_calculation.invalid": per_call(invalid, number),
+    }
+
+
+@benchmark("history")
+def bench_history(scale=1.0):
+    """`add_entry` cost and `get_history` cost as history grows."""
+    results = {}
+    capacity, store = History.capacity(), History.detach_store()
+    a, b, result = Decimal("1.5"), Decimal("2.5"), Decimal("4.0")
+    try:
+        for size in HISTORY_SIZES:
+            size = max(1, int(size * scale))
+            History.set_capacity(None)
+
+            def fill(count=size):
+                History.clear_history()
+                for _ in range(count):
+                    History.add_entry("add", a, b, result)
+
+            results[f"history.add_entry[{size}]"] = per_call(fill, 1, repeat=3) / size
+            results[f"history.get_history[{size}]"] = per_call(History.get_history, 1, repeat=3)
+    finally:
+        History.clear_history()
+        History.set_capacity(capacity)
+        if store is not None:
+            History.attach_store(store)
+    return results
+
+
+def _random_operand(rng, digits):
+    """A `digits`-digit Decimal in [0.1, 1), built exactly (no context rounding)."""
+    return Decimal("0." + "".join(rng.choices("0123456789", k=digits - 1)) + "7")
+
+
+@benchmark("large_operands")
+def bench_large_operands(scale=1.0):
+    """`Multiply`/`Divide.execute` against the bare Decimal operators as operands grow to a million digits."""
+    from operations.divide import Divide  # pylint: disable=import-outside-toplevel
+    from operations.multiply import Multiply  # pylint: disable=import-outside-toplevel
+
+    rng, results = random.Random(21), {}
+    for digits in OPERAND_DIGITS:
+        a, b = _random_operand(rng, digits), _random_operand(rng, digits)
+        number = max(1, int(1_000_000 * scale / digits))
+        results[f"large.multiply.execute[{digits}]"] = per_call(lambda a=a, b=b: Multiply.execute(a, b), number)
+        results[f"large.multiply.operator[{digits}]"] = per_call(lambda a=a, b=b: a * b, number, repeat=3)
+        results[f"large.divide.execute[{digits}]"] = per_call(lambda a=a, b=b: Divide.execute(a, b), number)
+        results[f"large.divide.operator[{digits}]"] = per_call(lambda a=a, b=b: a / b, number, repeat=3)
+    return results
+
+
+_PLUGIN_SCRIPT = """
+import os, sys, time
+sys.path.insert(0, {root!r})
+import plugin_loader
+if {mode!r} == "discover.cold":
+    for directory in plugin_loader.plugin_directories():
+        manifest = os.path.join(directory, "__pycache__", plugin_loader.MANIFEST_NAME)
+        if os.path.exists(manifest):
+            os.remove(manifest)
+start = time.perf_counter()
+if {mode!r} == "load":
+    plugin_loader.load_plugins()
+else:
+    plugin_loader.discover_plugins()
+print(time.perf_counter() - start)
+"""
+
+
+def _plugin_startup(mode):
+    """Seconds one fresh interpreter spends in plugin startup (`load`, `discover.cold` or `discover.warm`)."""
+    completed = subprocess.run([sys.executable, "-c", _PLUGIN_SCRIPT.format(root=PROJECT_ROOT, mode=mode)],
+                               capture_output=True, text=True, check=True, cwd=PROJECT_ROOT)
+    return float(completed.stdout)
+
+
+@benchmark("plugins")
+def bench_plugin_loading(scale=1.0):
+    """Plugin startup in fresh interpreters: `load_plugins`, and `discover_plugins` cold and warm (manifest present)."""
+    repeat = max(1, int(5 * scale))
+    samples = {"load": [], "discover.cold": [], "discover.warm": []}
+    for _ in range(repeat):
+        for mode, times in samples.items():  # ✅ In this order: each warm run follows the cold run's manifest
+            times.append(_plugin_startup(mode))
+    return {
+        "plugins.load_plugins": min(samples["load"]) * 1e9,
+        "plugins.discover_plugins.cold": min(samples["discover.cold"]) * 1e9,
+        "plugins.discover_plugins.warm": min(samples["discover.warm"]) * 1e9,
+    }
+
+
+def run(groups=None, scale=1.0):
+    """Runs the selected benchmark groups (all by default) and returns the results document."""
+    results = {}
+    for group, function in BENCHMARKS.items():
+        if groups is None or group in groups:
+            results.update(function(scale))
+    return {
+        "version": RESULTS_VERSION,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": {name: round(value, 3) for name, value in results.items()},
+    }
+
+
+def compare(current, baseline, threshold=DEFAULT_THRESHOLD):
+    """
+    Compares two results documents.
+
+    Returns:
+        list[tuple]: `(name, baseline_ns, current_ns, change)` for every result in
+        both, where `change` is the relative slowdown (0.25 = 25% slower).
+        list[str]: Names whose slowdown exceeds `threshold`.
+    """
+    rows, regressions = [], []
+    for name, current_ns in current["results"].items():
+        baseline_ns = baseline["results"].get(name)
+        if not baseline_ns:
+            continue
+        change = current_ns / baseline_ns - 1
+        rows.append((name, baseline_ns, current_ns, change))
+        if change > threshold:
+            regressions.append(name)
+    return rows, regressions
+
+
+def format_results(results, rows=None):
+    """Returns a text table of results, with baseline deltas when `rows` are given."""
+    changes = {name: (baseline_ns, change) for name, baseline_ns, _, change in rows or ()}
+    lines = [f"{'benchmark':<40} {'ns/call':>14} {'baseline':>14} {'change':>8}"]
+    for name, value in results["results"].items():
+        if name in changes:
+            baseline_ns, change = changes[name]
+            lines.append(f"{name:<40} {value:>14.1f} {baseline_ns:>14.1f} {change:>+8.1%}")
+        else:
+            lines.append(f"{name:<40} {value:>14.1f} {'-':>14} {'-':>8}")
+    return "\n".join(lines)
+
+
+def _write(path, document):
+    with open(path, "w", encoding="utf-8") as target:
+        json.dump(document, target, indent=2)
+        target.write("\n")
+
+
+def main(argv=None):
+    """Command-line entry point; returns 1 when a result regressed past the threshold."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--group", action="append", choices=sorted(BENCHMARKS),
+                        help="run only this group (repeatable)")
+    parser.add_argument("--scale", type=float, default=1.0, help="multiply iteration counts (e.g. 0.1 for a quick run)")
+    parser.add_argument("--output", metavar="JSON", help="write the results here")
+    parser.add_argument("--baseline", metavar="JSON", default=DEFAULT_BASELINE, help="baseline to compare with")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed relative slowdown before failing (default 0.10 = 10%%)")
+    parser.add_argument("--save-baseline", action="store_true", help="store the results as the new baseline")
+    args = parser.parse_args(argv)
+
+    results = run(args.group, args.scale)
+    if args.output:
+        _write(args.output, results)
+    if args.save_baseline:
+        _write(args.baseline, results)
+        print(format_results(results))
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(format_results(results))
+        print(f"No baseline at {args.baseline}; run with --save-baseline to record one.")
+        return 0
+
+    with open(args.baseline, encoding="utf-8") as source:
+        baseline = json.load(source)
+    rows, regressions = compare(results, baseline, args.threshold)
+    print(format_results(results, rows))
+    if regressions:
+        print(f"Regressions over {args.threshold:.0%}: {', '.join(regressions)}")
+        return 1
+    print(f"No regressions over {args.threshold:.0%}.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,21 +1,50 @@
 """Calculator REPL"""
+import sys
+if __name__ == "__main__" and any(arg.startswith("--startup-profile") for arg in sys.argv[1:]):
+    import startup_profile  # ✅ Must be installed before any other import to see them all
+    startup_profile.install()
+elif __name__ == "__main__" and len(sys.argv) >= 4 and not sys.argv[1].startswith("-"):
+    import daemon_client  # ✅ Standard library only, so a warm daemon answers before the app is loaded
+    _call = daemon_client.parse_one_shot(sys.argv[1:])
+    if _call is not None:
+        _status = daemon_client.forward(_call[0], _call[1], backend=_call[2])
+        if _status is not None:
+            sys.exit(_status)
+
 from operation_base import Operation
-import plugin_loader
 from history import History
 from menu import show_menu
-from decimal import Decimal, InvalidOperation
-import sys
+from app.config import Config
+from result_cache import ResultCache
+import stream
+import expression
+import numeric_backend
+import daemon_client
+import plugin_loader
+from metrics import Metrics, MetricsExporter, NOT_FOUND, INVALID_INPUT
+from errors import CALCULATION_ERRORS, INVALID_NUMBER, describe_error
+from time import perf_counter_ns
+from decimal import Decimal
+from itertools import repeat
+import argparse
+import atexit
 from log_config import logger
 
 logger.info("Calculator started")
 
-plugin_loader.load_plugins()
-
 class CalculatorREPL:
     """Command-line Read-Eval-Print Loop (REPL) for the calculator."""
 
+    result_cache = ResultCache(Config.RESULT_CACHE_SIZE, Config.RESULT_CACHE_MAX_BYTES)
+
+    # Number type for this session (see `numeric_backend`); `run_operation`/`run_batch` can override it per call.
+    backend = numeric_backend.get_backend(Config.NUMERIC_BACKEND)
+
+    # Named cells and formulas (`x = add a b`) for this session, recomputed incrementally; see `session_sheet`.
+    sheet = None
+
     @staticmethod
-    def run_operation(operation_name, a: Decimal, b: Decimal):
+    def run_operation(operation_name, a: Decimal, b: Decimal, backend=None, history=None):
         """
         Executes a calculator operation dynamically from the plugin system.
         
@@ -23,30 +52,231 @@ class CalculatorREPL:
             operation_name (str): The operation name (e.g., "add", "subtract").
             a (Decimal): First operand.
             b (Decimal): Second operand.
+            backend (str | NumericBackend | None): Numeric backend for this call;
+                defaults to the session backend. Operands of other types are converted.
+            history (SessionHistory | None): Records the calculation here instead of the shared `History`.
             
         Returns:
-            Decimal | str: The result or an error message.
+            Decimal | float | Fraction | FixedPoint | str: The result or an error message.
+        """
+        backend = numeric_backend.get_backend(backend) if backend else CalculatorREPL.backend
+        started = perf_counter_ns() if Metrics.enabled else 0
+        try:
+            operation_class = Operation.registry[operation_name.lower()]
+            if isinstance(backend, numeric_backend.DecimalBackend):
+                result = CalculatorREPL.result_cache.execute(operation_class, a, b)
+            else:
+                a, b = backend.convert(a), backend.convert(b)
+                result = backend.execute(operation_class, a, b)
+        except KeyError:
+            result, error = f"Operation '{operation_name}' not found.", NOT_FOUND
+        except CALCULATION_ERRORS as exc:
+            result, error = describe_error(exc)
+        else:
+            error = None
+            (History if history is None else history).add_entry(operation_name, a, b, result)
+        if started:
+            Metrics.observe(operation_name.lower(), perf_counter_ns() - started, error)
+        return result
+
+    @staticmethod
+    def run_batch(operation_names, a_values, b_values, backend=None, history=None):
+        """
+        Executes many calculations in one call.
+
+        Each distinct operation name is resolved once, operands that are
+        already of the backend's number type are passed through without
+        conversion, and history is written in a single bulk update. A long
+        batch of one vectorized operation may run as a single array call
+        (see `NumericBackend.execute_batch`).
+
+        Args:
+            operation_names (str | Iterable[str]): One operation applied to every pair,
+                or one operation name per pair.
+            a_values (Iterable): First operands.
+            b_values (Iterable): Second operands.
+            backend (str | NumericBackend | None): Numeric backend for this call;
+                defaults to the session backend.
+            history (SessionHistory | None): Records the calculations here instead of the shared `History`.
+
+        Returns:
+            list[Decimal | float | Fraction | FixedPoint | str]: Results or error messages, in input order.
+
+        Raises:
+            ValueError: If the input sequences have different lengths.
         """
+        single_name = operation_names if isinstance(operation_names, str) else None
+        if single_name is not None:
+            rows = ((single_name, a, b) for a, b in zip(a_values, b_values, strict=True))
+        else:
+            rows = zip(operation_names, a_values, b_values, strict=True)
+
+        backend = numeric_backend.get_backend(backend) if backend else CalculatorREPL.backend
+        number_type, convert, execute = backend.type, backend.convert, backend.execute
+
+        observe = Metrics.observe if Metrics.enabled else None  # no clock reads at all when disabled
+        if single_name is not None and isinstance(a_values, (list, tuple)) and isinstance(b_values, (list, tuple)):
+            operation_class = Operation.registry.get(single_name.lower())
+            if operation_class is not None and operation_class.capabilities().vectorized:
+                started = perf_counter_ns() if observe else 0
+                batch = backend.execute_batch(operation_class, a_values, b_values)
+                if batch is not None:
+                    a_values, b_values, results = batch
+                    (History if history is None else history).add_entries(
+                        zip(repeat(single_name), a_values, b_values, results))
+                    if observe:
+                        elapsed = (perf_counter_ns() - started) // max(1, len(results))
+                        for _ in results:
+                            observe(single_name.lower(), elapsed)
+                    return results
+
+        resolved = {}
+        results = []
+        entries = []
+        for operation_name, a, b in rows:
+            started = perf_counter_ns() if observe else 0
+            try:
+                operation_class = resolved[operation_name]
+            except KeyError:
+                operation_class = Operation.registry.get(operation_name.lower())
+                resolved[operation_name] = operation_class
+
+            if operation_class is None:
+                results.append(f"Operation '{operation_name}' not found.")
+                if observe:
+                    observe(operation_name, 0, NOT_FOUND)
+                continue
+
+            try:
+                if a.__class__ is not number_type:
+                    a = convert(a)
+                if b.__class__ is not number_type:
+                    b = convert(b)
+                result = execute(operation_class, a, b)
+            except CALCULATION_ERRORS as exc:
+                result, error = describe_error(exc)
+            else:
+                error = None
+                entries.append((operation_name, a, b, result))
+
+            results.append(result)
+            if observe:
+                observe(operation_name.lower(), perf_counter_ns() - started, error)
+
+        (History if history is None else history).add_entries(entries)
+        return results
+
+    @staticmethod
+    def run_reduction(operation_name, operands, backend=None, history=None):
+        """
+        Applies a variadic operation (e.g. `add`, `multiply`) to any number of operands.
+
+        The operands are combined by tree reduction (exactly for Decimal, then
+        rounded once) and recorded as a single history entry. Associative
+        operations over at least `PARALLEL_REDUCE_MIN_OPERANDS` Decimal operands
+        are reduced in chunks across worker processes, with the same result.
+
+        Args:
+            operation_name (str): The operation name.
+            operands (Iterable): The operands; converted to the backend's type if needed.
+            backend (str | NumericBackend | None): Numeric backend for this call;
+                defaults to the session backend.
+            history (SessionHistory | None): Records the calculation here instead of the shared `History`.
+
+        Returns:
+            Decimal | float | Fraction | FixedPoint | str: The result or an error message.
+        """
+        backend = numeric_backend.get_backend(backend) if backend else CalculatorREPL.backend
+        started = perf_counter_ns() if Metrics.enabled else 0
         try:
             operation_class = Operation.registry[operation_name.lower()]
-            result = operation_class.execute(a, b)  # Ensure it calls the correct function
-            History.add_entry(operation_name, a, b, result)
-            return result
+            number_type, convert = backend.type, backend.convert
+            operands = [operand if operand.__class__ is number_type else convert(operand) for operand in operands]
+            if (0 < Config.PARALLEL_REDUCE_MIN_OPERANDS <= len(operands) and number_type is Decimal
+                    and operation_class.capabilities().associative):
+                import parallel  # pylint: disable=import-outside-toplevel  # ✅ Only large reductions pay for it
+                result = parallel.parallel_reduce(operation_name.lower(), operands)
+            else:
+                result = backend.reduce(operation_class, operands)
         except KeyError:
-            return f"Operation '{operation_name}' not found."
-        except ZeroDivisionError:
-            return "Error: Division by zero is not allowed."
+            result, error = f"Operation '{operation_name}' not found.", NOT_FOUND
+        except TypeError as exc:  # e.g. "Operation 'divide' takes exactly two operands."
+            result, error = f"Error: {exc}", INVALID_INPUT
+        except CALCULATION_ERRORS as exc:
+            result, error = describe_error(exc)
+        else:
+            error = None
+            (History if history is None else history).add_reduction(operation_name, operands, result)
+        if started:
+            Metrics.observe(operation_name.lower(), perf_counter_ns() - started, error)
+        return result
+
+    @staticmethod
+    def evaluate_expression(text, variables=None, history=None):
+        """
+        Evaluates an infix expression such as `(a + b) * c / d` as a single calculation.
+
+        Plans are compiled once per expression text, so repeated expressions with
+        different variable values skip parsing entirely.
+
+        Args:
+            text (str): The expression.
+            variables (dict | None): Values for the expression's variables.
+            history (SessionHistory | None): Records the expression here instead of the shared `History`.
+
+        Returns:
+            Decimal | str: The result or an error message.
+        """
+        started = perf_counter_ns() if Metrics.enabled else 0
+        try:
+            result = expression.evaluate(text, variables)
+        except KeyError as exc:
+            result, error = str(exc.args[0]), NOT_FOUND
+        except (ValueError, NameError, TypeError) as exc:  # e.g. an undefined variable or a syntax error
+            result, error = f"Error: {exc}", INVALID_INPUT
+        except CALCULATION_ERRORS as exc:
+            result, error = describe_error(exc)
+        else:
+            error = None
+            (History if history is None else history).add_expression(text, variables, result)
+        if started:
+            Metrics.observe("eval", perf_counter_ns() - started, error)
+        return result
+
+    @classmethod
+    def parse_calculation(cls, line):
+        """
+        Parses a `<operation> <number1> <number2> [<number3> ...]` line with the session backend.
+
+        Returns:
+            tuple: `(operation_name, operands)` with at least two operands.
+
+        Raises:
+            ValueError: With the message shown to the user.
+        """
+        operation, *operands = line.split() or [None]
+        if len(operands) < 2:
+            raise ValueError("Error: Invalid format! Use: <operation> <number1> <number2>")
+        try:
+            return operation, [cls.backend.convert(operand) for operand in operands]
+        except ValueError:
+            raise ValueError(INVALID_NUMBER) from None
 
     @classmethod
     def repl(cls):
         """Starts the interactive REPL session."""
         print("\n== Welcome to REPL Calculator ==")
-        print("Type 'menu' for options, or enter calculations (e.g., add 2 3).")
+        print("Type 'menu' for options, or enter calculations (e.g., add 2 3, add 1 2 3 4, eval (2 + 3) * 4 or x = add a b).")
 
         commands = {
             "menu": show_menu,
             "history": lambda: print("\n".join(History.get_history())),
             "last": lambda: print(History.get_last_entry()),
+            "cache": lambda: print(cls.result_cache.stats()),
+            "stats": lambda: print(Metrics.format_stats()),
+            "cells": lambda: print("\n".join(map(str, cls.session_sheet().cells())) or "No cells defined."),
+            "ops": lambda: print("\n".join(f"{name}: {capabilities}"
+                                           for name, capabilities in Operation.registry.capabilities().items())),
             "clear": lambda: (History.clear_history(), print("History cleared.")),
             "exit": lambda: sys.exit("Exiting calculator. Goodbye!"),
             "quit": lambda: sys.exit("Exiting calculator. Goodbye!"),
@@ -63,27 +293,214 @@ class CalculatorREPL:
             except SystemExit:
                 break  # Exit cleanly
 
-            # Try executing an arithmetic operation
-            try:
-                parts = user_input.split()
+            if user_input == "backend" or user_input.startswith("backend "):
+                cls.switch_backend(user_input[8:].strip())
+                continue
 
-                if len(parts) != 3:
-                    print("Error: Invalid format! Use: <operation> <number1> <number2>")
-                    continue
+            if "=" in user_input or user_input.startswith("del "):
+                cls.update_sheet(user_input)
+                continue
 
-                operation, a, b = parts
+            # Try evaluating an expression or executing an arithmetic operation
+            try:
+                if user_input.startswith("eval "):
+                    print(f"Result: {cls.evaluate_expression(user_input[5:].strip())}")
+                    continue
 
                 try:
-                    a, b = Decimal(a), Decimal(b)
-                except InvalidOperation:
-                    print("Error: Invalid number format! Ensure you're using numeric values.")
+                    operation, operands = cls.parse_calculation(user_input)
+                except ValueError as exc:
+                    print(str(exc))
                     continue
 
-                result = cls.run_operation(operation, a, b)
+                if len(operands) == 2:
+                    result = cls.run_operation(operation, *operands)
+                else:
+                    result = cls.run_reduction(operation, operands)
                 print(f"Result: {result}")
 
             except Exception as e:
                 print(f"Unexpected error: {e}")
 
-if __name__ == "__main__":
+    @classmethod
+    def session_sheet(cls):
+        """The session's `spreadsheet.Sheet`, created on first use so plain calculations never import it."""
+        if cls.sheet is None:
+            import spreadsheet  # pylint: disable=import-outside-toplevel
+            cls.sheet = spreadsheet.Sheet()
+        return cls.sheet
+
+    @classmethod
+    def update_sheet(cls, line):
+        """REPL `name = formula` and `del name` commands: updates a cell and prints every cell that changed."""
+        try:
+            if line.startswith("del "):
+                name = line[4:].strip()
+                cells = cls.session_sheet().delete(name)
+                print(f"Deleted {name}.")
+            else:
+                name, _, formula = line.partition("=")
+                cells = cls.session_sheet().assign(name.strip(), formula.strip())
+        except KeyError:
+            print(f"Error: Undefined variable '{name}'")
+            return
+        except ValueError as exc:
+            print(f"Error: {exc}")
+            return
+        for cell in cells:
+            print(f"{cell.name} = {cell.value}")
+
+    @classmethod
+    def switch_backend(cls, name):
+        """REPL `backend [name]` command: shows or changes the session's numeric backend."""
+        if name:
+            try:
+                cls.backend = numeric_backend.get_backend(name)
+            except ValueError as exc:
+                print(f"Error: {exc}. Choose from: {', '.join(numeric_backend.BACKENDS)}")
+                return
+        print(f"Numeric backend: {cls.backend.name}")
+
+def configure_history(backend=None):
+    """Attaches the persistent history store selected by HISTORY_BACKEND (`memory` keeps history in-process only)."""
+    backend = backend or Config.HISTORY_BACKEND
+    if backend == "memory":
+        return None
+    if backend == "sqlite":
+        from history_sqlite import SQLiteHistoryStore  # pylint: disable=import-outside-toplevel
+        store = SQLiteHistoryStore.from_url(Config.DATABASE_URL)
+    elif backend == "mmap":
+        from history_mmap import MmapHistoryLog  # pylint: disable=import-outside-toplevel
+        store = MmapHistoryLog(Config.HISTORY_LOG_PATH)
+    else:
+        raise ValueError(f"Unknown HISTORY_BACKEND '{backend}'")
+    History.attach_store(store)
+    atexit.register(store.close)
+    return store
+
+def run_once(operation_name, *operands):
+    """
+    Runs a one-shot `<operation> <a> <b> [<c> ...]` in this process, printing like `daemon_client.forward`.
+
+    Returns:
+        int: Exit status (0 for a result printed to stdout, 1 for an error printed to stderr).
+    """
+    try:
+        operands = [CalculatorREPL.backend.convert(operand) for operand in operands]
+    except ValueError:
+        result = INVALID_NUMBER
+    else:
+        if len(operands) == 2:
+            result = CalculatorREPL.run_operation(operation_name, *operands)
+        else:
+            result = CalculatorREPL.run_reduction(operation_name, operands)
+    if isinstance(result, str):
+        print(result, file=sys.stderr)
+        return 1
+    print(result)
+    return 0
+
+def configure_metrics(path=None, interval=None):
+    """Starts the OpenMetrics file exporter when METRICS_EXPORT_PATH is set (which also enables metrics)."""
+    path = path or Config.METRICS_EXPORT_PATH
+    if not path:
+        return None
+    Metrics.enable()
+    exporter = MetricsExporter(path, interval or Config.METRICS_EXPORT_INTERVAL).start()
+    atexit.register(exporter.stop)
+    return exporter
+
+def configure_plugin_reload(enabled=None, interval=None):
+    """Starts the plugin watcher when PLUGIN_RELOAD is set, so changed plugins apply without a restart."""
+    if not (Config.PLUGIN_RELOAD if enabled is None else enabled):
+        return None
+    watcher = plugin_loader.PluginWatcher(interval=interval or Config.PLUGIN_RELOAD_INTERVAL).start()
+    atexit.register(watcher.stop)
+    return watcher
+
+def main(argv=None):
+    """Command-line entry point: interactive REPL by default, one-shot calculations, pipe, server or daemon mode."""
+    parser = argparse.ArgumentParser(description="REPL Calculator")
+    parser.add_argument(
+        "calculation", nargs="*", metavar="OPERATION A B",
+        # Variadic operations take more operands: `add 1 2 3`
+        help="run one calculation and exit (answered by the resident daemon when one is running)",
+    )
+    parser.add_argument(
+        "--stream", nargs="?", const="-", metavar="FILE",
+        help="evaluate '<operation> <a> <b>' lines from FILE (or stdin when omitted) and exit",
+    )
+    parser.add_argument(
+        "--workers", type=int, metavar="N",
+        help="with --stream FILE, evaluate the file in N worker processes",
+    )
+    parser.add_argument(
+        "--backend", choices=sorted(numeric_backend.BACKENDS),
+        help="numeric backend for the REPL session (default: NUMERIC_BACKEND)",
+    )
+    parser.add_argument(
+        "--serve", nargs="?", const="", metavar="HOST:PORT",
+        help="serve JSON-lines calculation requests over TCP (default SERVER_HOST:SERVER_PORT)",
+    )
+    parser.add_argument(
+        "--daemon", nargs="?", const="", metavar="SOCKET",
+        help="run the resident daemon on a Unix socket (default DAEMON_SOCKET or a per-user path)",
+    )
+    parser.add_argument(
+        "--startup-profile", nargs="?", const="-", metavar="JSON",
+        help="report per-import and per-plugin startup cost (as JSON when a path is given) and exit",
+    )
+    args = parser.parse_args(argv)
+
+    if args.startup_profile is not None:
+        import startup_profile  # pylint: disable=import-outside-toplevel
+        startup_profile.finish(args.startup_profile)
+        return None
+
+    if args.workers is not None:
+        if args.stream in (None, "-"):
+            parser.error("--workers requires --stream FILE")
+        import parallel  # pylint: disable=import-outside-toplevel
+        parallel.parallel_file(args.stream, args.workers)
+        return None
+
+    if args.stream is not None:
+        stream.stream_file(args.stream)
+        return None
+
+    if args.backend:
+        CalculatorREPL.backend = numeric_backend.get_backend(args.backend)
+
+    configure_metrics()
+
+    if args.calculation:
+        if len(args.calculation) < 3:
+            parser.error("a one-shot calculation takes: OPERATION A B [C ...]")
+        return run_once(*args.calculation)
+
+    configure_plugin_reload()
+
+    # ✅ Server modes, persistent history and the spreadsheet import their modules only when used,
+    # so `import calculator` (and the one-shot path) does not pay for asyncio, sqlite3 or multiprocessing
+    try:
+        if args.daemon is not None:
+            import server  # pylint: disable=import-outside-toplevel
+            Operation.registry.load_all()  # ✅ Warm every plugin before the first request
+            server.serve(calculator=CalculatorREPL, path=args.daemon or daemon_client.socket_path())
+            return None
+
+        if args.serve is not None:
+            import server  # pylint: disable=import-outside-toplevel
+            host, _, port = args.serve.rpartition(":")
+            server.serve(host or None, int(port) if port else None, calculator=CalculatorREPL)
+            return None
+    except OSError as exc:  # e.g. address in use, or a daemon is already running
+        print(f"Error: {exc}", file=sys.stderr)
+        return 1
+
+    configure_history()
     CalculatorREPL.repl()
+    return None
+
+if __name__ == "__main__":
+    sys.exit(main())
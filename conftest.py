@@ -21,6 +21,11 @@ def reset_operation_registry():
     """Clear `Operation.registry` before each test."""
     Operation.registry.clear()
 
+@pytest.fixture
+def register_operations():
+    """Register the built-in operations in the (per-test cleared) registry."""
+    Operation.registry.update(operation_mapping)
+
 @pytest.fixture
 def operation_test_cases():
     """Static arithmetic operation test cases."""
@@ -0,0 +1,116 @@
+"""Daemon Client - forwards one-shot `calculator.py <operation> <a> <b> ...` calls to a resident daemon
+
+This module must stay import-light (standard library only, no app modules),
+because it runs before the calculator itself is loaded: when a daemon
+answers, the invocation never pays for dotenv, logging or plugin discovery.
+"""
+
+import json
+import os
+import re
+import socket
+import sys
+
+CONNECT_TIMEOUT = 0.5
+RESPONSE_TIMEOUT = 30.0
+
+# ✅ What argparse accepts as a negative number rather than an option (`-2`, `-.5`; not `-1e5` or `-inf`)
+_NEGATIVE_NUMBER = re.compile(r"^-\d+$|^-\d*\.\d+$")
+
+
+def default_socket_path():
+    """Per-user socket location: `$XDG_RUNTIME_DIR/calculator2.sock`, else one in `$TMPDIR` or `/tmp`."""
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return os.path.join(runtime_dir, "calculator2.sock")
+    # Not `tempfile.gettempdir()`: importing tempfile alone costs more than a forwarded calculation
+    return os.path.join(os.environ.get("TMPDIR") or "/tmp", f"calculator2-{os.getuid()}.sock")
+
+
+def socket_path():
+    """The daemon socket: `DAEMON_SOCKET` from the process environment, else the default."""
+    return os.environ.get("DAEMON_SOCKET") or default_socket_path()
+
+
+def request(message, path=None):
+    """
+    Sends one request to the daemon and returns its decoded response.
+
+    Returns:
+        dict | None: The response, or None when no daemon is listening
+        (missing or stale socket, refused connection).
+
+    Raises:
+        OSError: If the daemon accepted the request but did not answer it
+            (timed out after `RESPONSE_TIMEOUT` or dropped the connection).
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+        connection.settimeout(CONNECT_TIMEOUT)
+        try:
+            connection.connect(path or socket_path())
+        except OSError:
+            return None
+        connection.settimeout(RESPONSE_TIMEOUT)
+        connection.sendall(json.dumps(message).encode() + b"\n")
+        connection.shutdown(socket.SHUT_WR)
+        response = b""
+        while not response.endswith(b"\n"):
+            chunk = connection.recv(65536)
+            if not chunk:
+                raise ConnectionError("connection closed before a response")
+            response += chunk
+    return json.loads(response)
+
+
+def parse_one_shot(argv):
+    """
+    Splits `<operation> <a> <b> [<c> ...] [--backend NAME]` into `(operation, operands, backend)`.
+
+    Returns None for any other command line (another option, or too few
+    operands), which is left to the calculator's own argument parser.
+    """
+    operation, *rest = argv
+    operands, backend = [], None
+    while rest:
+        argument = rest.pop(0)
+        if argument == "--backend" and rest and backend is None:
+            backend = rest.pop(0)
+        elif argument.startswith("--backend=") and backend is None:
+            backend = argument.partition("=")[2]
+        elif argument.startswith("-") and not _NEGATIVE_NUMBER.match(argument):
+            return None
+        else:
+            operands.append(argument)
+    if operation.startswith("-") or len(operands) < 2:
+        return None
+    return operation, operands, backend
+
+
+def forward(operation, operands, path=None, out=None, err=None, backend=None):
+    """
+    Runs `operation a b [c ...]` on the daemon and prints the outcome like the in-process one-shot CLI.
+
+    Returns:
+        int | None: The exit status (0 for a result, 1 for an error), or None
+        when no daemon is listening and the caller should run in-process.
+        A daemon that accepted the call but never answered is an error, not
+        a reason to run the calculation a second time.
+    """
+    if len(operands) == 2:
+        message = {"id": 1, "method": "calculate", "operation": operation, "a": operands[0], "b": operands[1]}
+    else:
+        message = {"id": 1, "method": "reduce", "operation": operation, "operands": operands}
+    if backend is not None:
+        message["backend"] = backend
+    try:
+        response = request(message, path)
+    except OSError as exc:
+        print(f"Error: The calculation daemon did not answer ({exc}).", file=err or sys.stderr)
+        return 1
+    if response is None:
+        return None
+    if "error" in response:
+        print(response["error"], file=err or sys.stderr)
+        return 1
+    print(response["result"], file=out or sys.stdout)
+    return 0
@@ -0,0 +1,37 @@
+"""Calculation Errors - turns the exceptions a calculation can raise into error messages and metric kinds"""
+
+from decimal import InvalidOperation
+from metrics import ZERO_DIVISION, INVALID_INPUT, OVERFLOW, LIMIT_EXCEEDED
+
+DIVISION_BY_ZERO = "Error: Division by zero is not allowed."
+INVALID_NUMBER = "Error: Invalid number format! Ensure you're using numeric values."
+NUMERIC_OVERFLOW = "Error: Numeric overflow! The result is out of range."
+
+
+class LimitExceeded(RuntimeError):
+    """An isolated operation ran out of time or memory, or crashed its worker; the worker was replaced."""
+
+
+# ✅ Everything a calculation may raise for bad input or an out-of-range result (see `describe_error`)
+CALCULATION_ERRORS = (ArithmeticError, TypeError, ValueError, LimitExceeded)
+
+
+def describe_error(exc):
+    """
+    Returns `(message, kind)` for an exception in `CALCULATION_ERRORS`.
+
+    Every calculation path (REPL, batch, reduction, expression, stream and
+    server) reports errors through this one mapping, so they all word and
+    count a given failure the same way.
+    """
+    if isinstance(exc, ZeroDivisionError):
+        return DIVISION_BY_ZERO, ZERO_DIVISION
+    if isinstance(exc, (InvalidOperation, TypeError, ValueError)):
+        return INVALID_NUMBER, INVALID_INPUT
+    if isinstance(exc, OverflowError):  # e.g. float overflow or a too-large operand, with its own message
+        return f"Error: {exc}", OVERFLOW
+    if isinstance(exc, ArithmeticError):  # e.g. decimal.Overflow: the result exceeds the context's exponent range
+        return NUMERIC_OVERFLOW, OVERFLOW
+    if isinstance(exc, LimitExceeded):
+        return f"Error: {exc}", LIMIT_EXCEEDED
+    raise TypeError(f"Not a calculation error: {exc!r}")
@@ -0,0 +1,248 @@
+"""Expression Engine - parses infix expressions into cached, compiled evaluation plans"""
+
+import re
+from decimal import Decimal
+from functools import lru_cache
+from operation_base import Operation
+from result_cache import context_key
+
+# Infix operators and the registered operation each one dispatches to.
+OPERATORS = {"+": "add", "-": "subtract", "*": "multiply", "/": "divide"}
+
+_TOKEN_PATTERN = re.compile(
+    r"\s*(?:(?P<number>(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)|(?P<name>[A-Za-z_]\w*)|(?P<symbol>[-+*/()]))"
+)
+
+
+class Number:
+    """A literal (or constant-folded) value."""
+
+    __slots__ = ("value",)
+
+    def __init__(self, value):
+        self.value = value
+
+
+class Variable:
+    """A named input supplied at evaluation time."""
+
+    __slots__ = ("name",)
+
+    def __init__(self, name):
+        self.name = name
+
+
+class Negate:
+    """Unary minus."""
+
+    __slots__ = ("operand",)
+
+    def __init__(self, operand):
+        self.operand = operand
+
+
+class BinaryOp:
+    """An infix operator applied to two sub-expressions."""
+
+    __slots__ = ("operation", "left", "right")
+
+    def __init__(self, operation, left, right):
+        self.operation = operation
+        self.left = left
+        self.right = right
+
+
+def tokenize(text):
+    """Splits an expression into `(kind, value)` tokens, raising ValueError on unknown characters."""
+    tokens = []
+    position, end = 0, len(text.rstrip())
+    while position < end:
+        match = _TOKEN_PATTERN.match(text, position)
+        if not match:
+            raise ValueError(f"Invalid expression: unexpected character {text[position:].strip()[0]!r}")
+        tokens.append((match.lastgroup, match.group(match.lastgroup)))
+        position = match.end()
+    return tokens
+
+
+class _Parser:
+    """Recursive-descent parser for `+ - * /`, unary minus and parentheses."""
+
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.position = 0
+
+    def peek(self):
+        """Returns the current token value without consuming it."""
+        return self.tokens[self.position][1] if self.position < len(self.tokens) else None
+
+    def advance(self):
+        """Consumes and returns the current token."""
+        token = self.tokens[self.position]
+        self.position += 1
+        return token
+
+    def parse(self):
+        """Parses the whole token stream."""
+        if not self.tokens:
+            raise ValueError("Invalid expression: nothing to evaluate")
+        node = self.expression()
+        if self.position != len(self.tokens):
+            raise ValueError(f"Invalid expression: unexpected {self.peek()!r}")
+        return node
+
+    def expression(self):
+        """expression := term (('+' | '-') term)*"""
+        node = self.term()
+        while self.peek() in ("+", "-"):
+            node = BinaryOp(OPERATORS[self.advance()[1]], node, self.term())
+        return node
+
+    def term(self):
+        """term := factor (('*' | '/') factor)*"""
+        node = self.factor()
+        while self.peek() in ("*", "/"):
+            node = BinaryOp(OPERATORS[self.advance()[1]], node, self.factor())
+        return node
+
+    def factor(self):
+        """factor := ('+' | '-') factor | '(' expression ')' | number | name"""
+        if self.position >= len(self.tokens):
+            raise ValueError("Invalid expression: unexpected end of input")
+        kind, value = self.advance()
+        if value == "-":
+            return Negate(self.factor())
+        if value == "+":
+            return self.factor()
+        if value == "(":
+            node = self.expression()
+            if self.peek() != ")":
+                raise ValueError("Invalid expression: missing ')'")
+            self.advance()
+            return node
+        if kind == "number":
+            return Number(Decimal(value))
+        if kind == "name":
+            return Variable(value)
+        raise ValueError(f"Invalid expression: unexpected {value!r}")
+
+
+def parse(text):
+    """Parses an infix expression into an AST."""
+    return _Parser(tokenize(text)).parse()
+
+
+def fold_constants(node):
+    """
+    Evaluates every sub-expression that does not depend on a variable.
+
+    Sub-expressions that fail (e.g. division by a constant zero, or overflow) are left
+    unfolded so the error surfaces when the plan is evaluated.
+    """
+    if isinstance(node, Negate):
+        operand = fold_constants(node.operand)
+        return Number(-operand.value) if isinstance(operand, Number) else Negate(operand)
+    if isinstance(node, BinaryOp):
+        left, right = fold_constants(node.left), fold_constants(node.right)
+        if isinstance(left, Number) and isinstance(right, Number):
+            try:
+                return Number(Operation.get_operation(node.operation).execute(left.value, right.value))
+            except ArithmeticError:  # e.g. division by zero or overflow
+                pass
+        return BinaryOp(node.operation, left, right)
+    return node
+
+
+def _compile_node(node):
+    """Turns an AST node into a closure `(variables) -> Decimal`."""
+    if isinstance(node, Number):
+        value = node.value
+        return lambda variables: value
+    if isinstance(node, Variable):
+        name = node.name
+        def load(variables):
+            try:
+                return variables[name]
+            except KeyError:
+                raise NameError(f"Undefined variable '{name}'") from None
+        return load
+    if isinstance(node, Negate):
+        operand = _compile_node(node.operand)
+        return lambda variables: -operand(variables)
+    execute = Operation.get_operation(node.operation).execute
+    left, right = _compile_node(node.left), _compile_node(node.right)
+    return lambda variables: execute(left(variables), right(variables))
+
+
+def _variable_names(node, names):
+    """Collects variable names in order of first appearance."""
+    if isinstance(node, Variable):
+        if node.name not in names:
+            names.append(node.name)
+    elif isinstance(node, Negate):
+        _variable_names(node.operand, names)
+    elif isinstance(node, BinaryOp):
+        _variable_names(node.left, names)
+        _variable_names(node.right, names)
+    return names
+
+
+class Plan:
+    """A compiled expression, ready to evaluate against any set of variable values."""
+
+    __slots__ = ("text", "variables", "_evaluate")
+
+    def __init__(self, text, tree):
+        self.text = text
+        self.variables = tuple(_variable_names(tree, []))
+        self._evaluate = _compile_node(tree)
+
+    def evaluate(self, variables=None):
+        """
+        Evaluates the plan.
+
+        Args:
+            variables (dict | None): Values for the plan's variables (Decimal-compatible).
+
+        Returns:
+            Decimal: The result.
+
+        Raises:
+            NameError: If a variable has no value.
+            TypeError: If a value is not Decimal-compatible.
+            ZeroDivisionError: If the expression divides by zero.
+        """
+        values = {}
+        for name, value in (variables or {}).items():
+            values[name] = value if isinstance(value, Decimal) else Operation.validate_numbers(value, 0)[0]
+        return self._evaluate(values)
+
+
+@lru_cache(maxsize=1024)
+def _compile_in_context(text, context):  # pylint: disable=unused-argument  # `context` is part of the cache key
+    """Parses, constant-folds and compiles an expression under the active Decimal context."""
+    return Plan(text, fold_constants(parse(text)))
+
+
+def compile_expression(text):
+    """
+    Parses, constant-folds and compiles an expression, caching the plan by its text.
+
+    Constants are folded with the active Decimal context (precision, rounding,
+    exponent range), so plans are cached per context as well as per text.
+
+    Raises:
+        ValueError: If the expression is malformed.
+        KeyError: If an operator's operation is not registered.
+    """
+    return _compile_in_context(text, context_key())
+
+
+# ✅ Cache management stays on the public name (plugin reloads and tests clear it)
+compile_expression.cache_clear = _compile_in_context.cache_clear
+compile_expression.cache_info = _compile_in_context.cache_info
+
+
+def evaluate(text, variables=None):
+    """Evaluates an expression, reusing the cached plan for repeated expression text."""
+    return compile_expression(text).evaluate(variables)
@@ -1,25 +1,227 @@
 """Contains calculator operations for history."""
+import sys
+from collections import deque
+from app.config import Config
+
+
+class HistoryEntry:
+    """A single `operation a b = result` calculation, formatted only when displayed."""
+
+    __slots__ = ("operation", "a", "b", "result")
+
+    def __init__(self, operation, a, b, result):
+        self.operation = sys.intern(operation)
+        self.a = a
+        self.b = b
+        self.result = result
+
+    def __str__(self):
+        return f"{self.operation} {self.a} {self.b} = {self.result}"
+
+    def to_row(self):
+        """Returns the entry as `(operation, a, b, result)` strings for persistent stores."""
+        return self.operation, str(self.a), str(self.b), str(self.result)
+
+
+class ExpressionEntry:
+    """A single evaluated expression with the variable values it was evaluated with."""
+
+    __slots__ = ("expression", "variables", "result")
+
+    def __init__(self, expression, variables, result):
+        self.expression = sys.intern(expression)
+        self.variables = tuple(variables.items()) if variables else ()
+        self.result = result
+
+    def bindings(self):
+        """Returns the variable values as `name=value, ...` text."""
+        return ", ".join(f"{name}={value}" for name, value in self.variables)
+
+    def __str__(self):
+        if self.variables:
+            return f"{self.expression} with {self.bindings()} = {self.result}"
+        return f"{self.expression} = {self.result}"
+
+    def to_row(self):
+        """Returns the entry as `(expression, bindings, None, result)` strings for persistent stores."""
+        return self.expression, self.bindings(), None, str(self.result)
+
+
+class ReductionEntry:
+    """A single variadic calculation (`add 1 2 3 ...`), keeping only a summary of long operand lists."""
+
+    __slots__ = ("operation", "count", "head", "tail", "result")
+
+    SHOWN = 4  # operands shown before eliding the middle of a long list
+
+    def __init__(self, operation, operands, result):
+        self.operation = sys.intern(operation)
+        self.count = len(operands)
+        if self.count > self.SHOWN:
+            self.head, self.tail = tuple(operands[:self.SHOWN - 1]), operands[-1]
+        else:
+            self.head, self.tail = tuple(operands), None
+        self.result = result
+
+    def describe(self):
+        """Returns the calculation as `operation a b c ...` text (long lists elided)."""
+        operands = " ".join(map(str, self.head))
+        if self.tail is not None:
+            operands += f" ... {self.tail} ({self.count} operands)"
+        return f"{self.operation} {operands}"
+
+    def __str__(self):
+        return f"{self.describe()} = {self.result}"
+
+    def to_row(self):
+        """Returns the entry as `(text, "", None, result)` strings; stores keep it like an expression."""
+        return self.describe(), "", None, str(self.result)
+
+
+def entry_from_row(operation, a, b, result):
+    """Rebuilds a history entry from a persisted `(operation, a, b, result)` row."""
+    if b is not None:
+        return HistoryEntry(operation, a, b, result)
+    variables = dict(binding.split("=", 1) for binding in a.split(", ")) if a else None
+    return ExpressionEntry(operation, variables, result)
+
+
 class History:
-    """Maintains the history of calculations performed."""
+    """
+    Maintains the history of calculations performed.
+
+    Entries are kept as compact records in a ring buffer of `capacity` entries;
+    once full, the oldest entries are dropped. An optional persistent store
+    (see `attach_store`) receives every new entry as well.
+    """
 
-    _history = []
+    _history = deque(maxlen=Config.HISTORY_CAPACITY or None)
+    _store = None
+
+    @classmethod
+    def attach_store(cls, store):
+        """
+        Persists new entries to `store` and preloads its most recent entries.
+
+        A store provides `append(entry)`, `extend(entries)` and `recent(n)`.
+        Clearing history only clears the in-memory session view; persisted
+        records are kept.
+        """
+        cls._store = store
+        cls._history.clear()
+        cls._history.extend(store.recent(cls._history.maxlen))
+
+    @classmethod
+    def detach_store(cls):
+        """Stops persisting entries and returns the previously attached store (or None)."""
+        store, cls._store = cls._store, None
+        return store
+
+    @classmethod
+    def set_capacity(cls, capacity):
+        """Changes how many entries are kept (None or 0 for unbounded), keeping the newest ones."""
+        cls._history = deque(cls._history, maxlen=capacity or None)
+
+    @classmethod
+    def capacity(cls):
+        """Returns the maximum number of entries kept (None when unbounded)."""
+        return cls._history.maxlen
 
     @classmethod
     def add_entry(cls, operation, a, b, result):
         """Adds a calculation entry to history."""
-        cls._history.append(f"{operation} {a} {b} = {result}")
+        entry = HistoryEntry(operation, a, b, result)
+        cls._history.append(entry)
+        if cls._store is not None:
+            cls._store.append(entry)
+
+    @classmethod
+    def add_entries(cls, entries):
+        """Adds many `(operation, a, b, result)` entries to history in one update."""
+        records = [HistoryEntry(operation, a, b, result) for operation, a, b, result in entries]
+        cls._history.extend(records)
+        if cls._store is not None:
+            cls._store.extend(records)
+
+    @classmethod
+    def add_expression(cls, expression, variables, result):
+        """Adds an evaluated expression (and any variable values) as a single history entry."""
+        entry = ExpressionEntry(expression, variables, result)
+        cls._history.append(entry)
+        if cls._store is not None:
+            cls._store.append(entry)
+
+    @classmethod
+    def add_reduction(cls, operation, operands, result):
+        """Adds a variadic calculation over `operands` as a single history entry."""
+        entry = ReductionEntry(operation, operands, result)
+        cls._history.append(entry)
+        if cls._store is not None:
+            cls._store.append(entry)
+
+    @classmethod
+    def get_entries(cls):
+        """Returns the stored history records, oldest first."""
+        return list(cls._history)
 
     @classmethod
     def get_history(cls):
         """Returns the calculation history as a string."""
-        return "\n".join(cls._history) if cls._history else "No calculations yet."
+        return "\n".join(map(str, cls._history)) if cls._history else "No calculations yet."
 
     @classmethod
     def get_last_entry(cls):
         """Returns the last calculation performed."""
-        return cls._history[-1] if cls._history else "No history available."
+        return str(cls._history[-1]) if cls._history else "No history available."
 
     @classmethod
     def clear_history(cls):
         """Clears all stored history."""
         cls._history.clear()
+
+
+class SessionHistory:
+    """
+    Private in-memory history for one client session, with the same interface as `History`.
+
+    Pass one as `history=` to `CalculatorREPL.run_operation`, `run_batch` or
+    `evaluate_expression` to keep a session's calculations out of the shared
+    history (and its persistent store).
+    """
+
+    __slots__ = ("_history",)
+
+    def __init__(self, capacity=Config.HISTORY_CAPACITY):
+        self._history = deque(maxlen=capacity or None)
+
+    def add_entry(self, operation, a, b, result):
+        """Adds a calculation entry to this session's history."""
+        self._history.append(HistoryEntry(operation, a, b, result))
+
+    def add_entries(self, entries):
+        """Adds many `(operation, a, b, result)` entries in one update."""
+        self._history.extend(HistoryEntry(operation, a, b, result) for operation, a, b, result in entries)
+
+    def add_expression(self, expression, variables, result):
+        """Adds an evaluated expression as a single entry."""
+        self._history.append(ExpressionEntry(expression, variables, result))
+
+    def add_reduction(self, operation, operands, result):
+        """Adds a variadic calculation as a single entry."""
+        self._history.append(ReductionEntry(operation, operands, result))
+
+    def get_entries(self):
+        """Returns the session's history records, oldest first."""
+        return list(self._history)
+
+    def get_history(self):
+        """Returns the session's history as a string."""
+        return "\n".join(map(str, self._history)) if self._history else "No calculations yet."
+
+    def get_last_entry(self):
+        """Returns the session's last calculation."""
+        return str(self._history[-1]) if self._history else "No history available."
+
+    def clear_history(self):
+        """Clears this session's history."""
+        self._history.clear()
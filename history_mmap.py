@@ -0,0 +1,151 @@
+"""Memory-Mapped History Log - append-only binary audit log with a sidecar offset index"""
+
+import mmap
+import os
+import struct
+import threading
+import time
+from history import entry_from_row
+
+# Record header: timestamp, kind (0 = calculation, 1 = expression), then the
+# byte lengths of the operation, a, b and result fields that follow it.
+_HEADER = struct.Struct("<dBIIII")
+_OFFSET = struct.Struct("<Q")
+_CALCULATION, _EXPRESSION = 0, 1
+_INITIAL_SIZE = 1 << 20
+
+
+class MmapHistoryLog:
+    """
+    Append-only history log stored in a memory-mapped file.
+
+    Every record has a fixed binary layout (`_HEADER` followed by UTF-8
+    fields). The sidecar `<path>.idx` file holds one 8-byte offset per record,
+    so the log never has to be scanned: record *i* is one index seek plus one
+    header read. Reopening a log maps it without reading it into memory.
+
+    Each `append`/`extend` hands its records and index offsets to the OS
+    before returning, so they survive the process crashing; surviving an OS
+    crash or power loss additionally needs `flush` (which `close` calls).
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.index_path = f"{path}.idx"
+        self._lock = threading.Lock()
+
+        self._index = open(self.index_path, "a+b")  # pylint: disable=consider-using-with
+        index_size = os.fstat(self._index.fileno()).st_size
+        if index_size % _OFFSET.size:  # drop a partially written offset
+            index_size -= index_size % _OFFSET.size
+            self._index.truncate(index_size)
+        self._count = index_size // _OFFSET.size
+
+        self._file = open(path, "a+b")  # pylint: disable=consider-using-with
+        size = os.fstat(self._file.fileno()).st_size
+        if size < _INITIAL_SIZE:
+            self._file.truncate(_INITIAL_SIZE)
+            size = _INITIAL_SIZE
+        self._map = mmap.mmap(self._file.fileno(), size)
+        self._end = self._record_end(self._count - 1) if self._count else 0
+
+    def __len__(self):
+        return self._count
+
+    def _offset(self, position):
+        """Reads the log offset of record `position` from the index."""
+        self._index.seek(position * _OFFSET.size)
+        return _OFFSET.unpack(self._index.read(_OFFSET.size))[0]
+
+    def _record_end(self, position):
+        """Returns the log offset just past record `position`."""
+        offset = self._offset(position)
+        _, _, *lengths = _HEADER.unpack_from(self._map, offset)
+        return offset + _HEADER.size + sum(lengths)
+
+    def _ensure_capacity(self, needed):
+        """Grows the log file (doubling) and remaps it when a record would not fit."""
+        size = len(self._map)
+        if self._end + needed <= size:
+            return
+        while self._end + needed > size:
+            size *= 2
+        self._map.close()
+        self._file.truncate(size)
+        self._map = mmap.mmap(self._file.fileno(), size)
+
+    def _write(self, created_at, entry):
+        """Appends one record; the caller holds the lock."""
+        operation, a, b, result = entry.to_row()
+        kind = _EXPRESSION if b is None else _CALCULATION
+        fields = [operation.encode(), a.encode(), (b or "").encode(), result.encode()]
+        header = _HEADER.pack(created_at, kind, *map(len, fields))
+        record = header + b"".join(fields)
+
+        self._ensure_capacity(len(record))
+        self._map[self._end:self._end + len(record)] = record
+        self._index.write(_OFFSET.pack(self._end))
+        self._end += len(record)
+        self._count += 1
+
+    def append(self, entry):
+        """Appends one history entry."""
+        with self._lock:
+            self._write(time.time(), entry)
+            self._index.flush()
+
+    def extend(self, entries):
+        """Appends many history entries."""
+        now = time.time()
+        with self._lock:
+            for entry in entries:
+                self._write(now, entry)
+            self._index.flush()  # ✅ One write per batch; the records themselves are already in the mapping
+
+    def read(self, position):
+        """
+        Returns record `position` as `(created_at, entry)`; negative positions count from the end.
+
+        Raises:
+            IndexError: If there is no such record.
+        """
+        with self._lock:
+            if position < 0:
+                position += self._count
+            if not 0 <= position < self._count:
+                raise IndexError("history log index out of range")
+            offset = self._offset(position)
+            created_at, kind, *lengths = _HEADER.unpack_from(self._map, offset)
+            fields = []
+            start = offset + _HEADER.size
+            for length in lengths:  # ✅ Under the lock: an append may remap the file
+                fields.append(self._map[start:start + length].decode())
+                start += length
+        if kind == _EXPRESSION:
+            fields[2] = None
+        return created_at, entry_from_row(*fields)
+
+    def last(self):
+        """Returns the newest entry, or None when the log is empty."""
+        return self.read(-1)[1] if self._count else None
+
+    def recent(self, limit=None):
+        """Returns the newest `limit` entries (all when None), oldest first."""
+        start = 0 if limit is None else max(0, self._count - limit)
+        return [self.read(position)[1] for position in range(start, self._count)]
+
+    def flush(self):
+        """Forces the log and its index to disk."""
+        with self._lock:
+            self._map.flush()
+            self._index.flush()
+            os.fsync(self._index.fileno())
+
+    def close(self):
+        """Flushes and closes the log."""
+        if self._map.closed:
+            return
+        self.flush()
+        self._map.close()
+        self._file.close()
+        self._index.close()
@@ -0,0 +1,182 @@
+"""SQLite History Store - persists calculation history through a background batched writer"""
+
+import queue
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from history import entry_from_row
+from log_config import logger
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS history (
+    id INTEGER PRIMARY KEY,
+    created_at REAL NOT NULL,
+    operation TEXT NOT NULL,
+    a TEXT,
+    b TEXT,
+    result TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_history_operation_time ON history (operation, created_at);
+CREATE INDEX IF NOT EXISTS idx_history_time ON history (created_at);
+"""
+
+_STOP = object()
+
+
+def path_from_url(database_url):
+    """Extracts the file path from a `sqlite:///path` URL (`sqlite:////abs/path` for absolute paths)."""
+    prefix = "sqlite:///"
+    if not database_url.startswith(prefix):
+        raise ValueError(f"Unsupported DATABASE_URL '{database_url}': expected {prefix}<path>")
+    return database_url[len(prefix):]
+
+
+def _timestamp(value):
+    """Accepts epoch seconds or a datetime."""
+    return value.timestamp() if isinstance(value, datetime) else value
+
+
+class SQLiteHistoryStore:
+    """
+    Persistent history store backed by SQLite in WAL mode.
+
+    `append`/`extend` only enqueue entries; a background thread drains the
+    queue and inserts them in batched transactions, so the calculation hot
+    path never waits on disk. Reads flush pending writes first.
+    """
+
+    def __init__(self, path, batch_size=500, flush_interval=0.2):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue = queue.Queue()
+
+        with sqlite3.connect(path) as connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.executescript(_SCHEMA)
+        connection.close()
+
+        self._reader = sqlite3.connect(path, check_same_thread=False)
+        self._reader_lock = threading.Lock()
+        self._writer = threading.Thread(target=self._write_loop, name="history-writer", daemon=True)
+        self._writer.start()
+
+    @classmethod
+    def from_url(cls, database_url, **kwargs):
+        """Opens the store named by a `sqlite:///...` DATABASE_URL."""
+        return cls(path_from_url(database_url), **kwargs)
+
+    def append(self, entry):
+        """Queues one history entry for persistence."""
+        self._queue.put((time.time(), entry))
+
+    def extend(self, entries):
+        """Queues many history entries for persistence."""
+        now = time.time()
+        put = self._queue.put
+        for entry in entries:
+            put((now, entry))
+
+    def _write_loop(self):
+        """Drains the queue into batched transactions until stopped."""
+        connection = sqlite3.connect(self.path)
+        connection.execute("PRAGMA synchronous=NORMAL")
+        running = True
+        while running:
+            try:
+                batch = [self._queue.get(timeout=self.flush_interval)]
+            except queue.Empty:
+                continue
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            rows = []
+            try:
+                for item in batch:
+                    if item is _STOP:
+                        running = False
+                        continue
+                    created_at, entry = item
+                    try:
+                        rows.append((created_at, *entry.to_row()))
+                    except Exception as e:  # pylint: disable=broad-except
+                        logger.error("Skipping history entry that cannot be persisted (%r): %s", entry, e)
+                with connection:
+                    connection.executemany(
+                        "INSERT INTO history (created_at, operation, a, b, result) VALUES (?, ?, ?, ?, ?)", rows
+                    )
+            except Exception as e:  # pylint: disable=broad-except  # ✅ The writer must outlive any bad batch
+                logger.error("Failed to persist %d history entries: %s", len(rows), e)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+        connection.close()
+
+    def flush(self):
+        """Blocks until every queued entry has been written (returns at once if the writer has stopped)."""
+        if not self._writer.is_alive():
+            logger.error("History writer is not running; %d entries were not persisted", self._queue.qsize())
+            return
+        self._queue.join()
+
+    def _select(self, sql, params):
+        """Runs a read query after flushing pending writes."""
+        self.flush()
+        with self._reader_lock:
+            return self._reader.execute(sql, params).fetchall()
+
+    def recent(self, limit=None):
+        """Returns the newest `limit` entries (all when None), oldest first."""
+        rows = self._select(
+            "SELECT operation, a, b, result FROM "
+            "(SELECT id, operation, a, b, result FROM history ORDER BY id DESC LIMIT ?) ORDER BY id",
+            (-1 if limit is None else limit,),
+        )
+        return [entry_from_row(*row) for row in rows]
+
+    def query(self, operation=None, start=None, end=None, limit=None):
+        """
+        Returns persisted rows filtered by operation and/or time range, oldest first.
+
+        Args:
+            operation (str | None): Exact operation name.
+            start (float | datetime | None): Inclusive lower bound on the entry time.
+            end (float | datetime | None): Exclusive upper bound on the entry time.
+            limit (int | None): Maximum number of rows.
+
+        Returns:
+            list[tuple]: `(created_at, operation, a, b, result)` rows.
+        """
+        clauses, params = [], []
+        if operation is not None:
+            clauses.append("operation = ?")
+            params.append(operation)
+        if start is not None:
+            clauses.append("created_at >= ?")
+            params.append(_timestamp(start))
+        if end is not None:
+            clauses.append("created_at < ?")
+            params.append(_timestamp(end))
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        params.append(-1 if limit is None else limit)
+        return self._select(
+            f"SELECT created_at, operation, a, b, result FROM history{where} ORDER BY created_at, id LIMIT ?",
+            params,
+        )
+
+    def clear(self):
+        """Deletes every persisted entry."""
+        self._select("DELETE FROM history", ())
+        with self._reader_lock:
+            self._reader.commit()
+
+    def close(self):
+        """Writes any pending entries and stops the background writer."""
+        if self._writer.is_alive():
+            self._queue.put(_STOP)
+            self._writer.join()
+        self._reader.close()
@@ -0,0 +1,252 @@
+"""Plugin Isolation - runs selected plugins in a warm pool of worker processes with time and memory limits"""
+
+import atexit
+import importlib
+import multiprocessing
+import os
+import queue
+import sys
+import threading
+from app.config import Config
+from errors import LimitExceeded  # ✅ Re-exported: defined with the other calculation errors
+from log_config import logger
+
+try:
+    import resource
+except ImportError:  # not available on Windows: workers run without a memory limit
+    resource = None
+
+
+class IsolatedOperation:
+    """
+    Registry stand-in for an operation whose plugin runs only in worker processes.
+
+    It offers the calls the calculator makes on operation classes (`execute`,
+    `reduce` and the class attributes read by the dispatch paths), forwarding
+    each call to the pool. The plugin module is never imported in this process.
+    """
+
+    kernel = None
+    array_kernel = None
+    cacheable = False  # an untrusted plugin is not assumed to be pure
+    variadic = True  # the worker's own `reduce` rejects operands the plugin does not accept
+
+    commutative = associative = False
+
+    def __init__(self, name, module_name, pool=None):
+        self.name = name
+        self.module_name = module_name
+        self.pool = pool
+
+    def capabilities(self):
+        """Nothing is assumed about an untrusted plugin."""
+        from operation_base import Capabilities  # pylint: disable=import-outside-toplevel
+        return Capabilities(pure=False, commutative=False, associative=False, vectorized=False)
+
+    def execute(self, a, b):
+        """Runs the operation in a worker."""
+        return (self.pool or get_pool()).call("execute", self, (a, b))
+
+    def reduce(self, operands):
+        """Runs a variadic reduction in a worker."""
+        return (self.pool or get_pool()).call("reduce", self, (list(operands),))
+
+    def __repr__(self):
+        return f"IsolatedOperation({self.name!r}, {self.module_name!r})"
+
+
+def _limit_memory(megabytes):
+    """Caps this process's address space at its current size plus `megabytes` (Linux/Unix only)."""
+    if resource is None or not megabytes:
+        return
+    try:
+        with open("/proc/self/statm", encoding="ascii") as statm:
+            current = int(statm.read().split()[0]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        current = 0
+    limit = current + megabytes * 1024 * 1024
+    resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+
+def _worker_main(connection, memory_mb, path):
+    """Worker process loop: imports isolated plugins on demand and answers `(method, name, module, args)` requests."""
+    sys.path[:] = path
+    from operation_base import Operation  # pylint: disable=import-outside-toplevel
+
+    for name, operation in list(dict.items(Operation.registry)):  # swap the stand-ins for lazy real entries
+        if isinstance(operation, IsolatedOperation):
+            dict.__delitem__(Operation.registry, name)
+            Operation.registry.add_lazy(name, operation.module_name)
+    _limit_memory(memory_mb)
+    connection.send("ready")
+
+    while True:
+        try:
+            method, name, module_name, args = connection.recv()
+        except (EOFError, OSError):
+            return
+        try:
+            importlib.import_module(module_name)
+            operation = Operation.registry[name]
+            reply = True, (operation.execute(*args) if method == "execute" else operation.reduce(*args))
+        except MemoryError:
+            connection.send((False, LimitExceeded(f"Operation '{name}' exceeded the {memory_mb} MB memory limit")))
+            return  # leave with a clean heap; the pool starts a replacement
+        except Exception as exc:  # pylint: disable=broad-except
+            reply = False, exc
+        try:
+            connection.send(reply)
+        except Exception as exc:  # pylint: disable=broad-except
+            connection.send((False, TypeError(f"Operation '{name}' returned an unsendable result: {exc}")))
+
+
+class _Worker:
+    """One worker process and the parent's end of its pipe."""
+
+    STARTUP_TIMEOUT = 60.0
+
+    def __init__(self, context, memory_mb, generation=0):
+        self.generation = generation
+        self.connection, child = context.Pipe()
+        self.process = context.Process(target=_worker_main, args=(child, memory_mb, list(sys.path)), daemon=True,
+                                       name="calculator-isolated")
+        self.process.start()
+        child.close()
+        self.ready = False
+
+    def wait_ready(self):
+        """Waits for the worker to finish starting, so startup never counts against a call's timeout."""
+        if not self.ready:
+            if not self.connection.poll(self.STARTUP_TIMEOUT):
+                raise EOFError("worker did not start")
+            self.connection.recv()
+            self.ready = True
+
+    def stop(self, kill=False):
+        """Ends the process: at once with `kill`, otherwise by closing its pipe."""
+        if kill:
+            self.process.kill()
+        self.connection.close()
+        self.process.join(None if kill else 1)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+
+
+class IsolationPool:
+    """
+    A warm pool of worker processes for isolated plugins.
+
+    Each call takes an idle worker, so concurrent callers (server threads)
+    run in parallel up to `workers`. A call that runs past `timeout` seconds
+    has its worker killed, one that exhausts `memory_mb` has it exit, and one
+    that crashes it is detected at once; each case raises `LimitExceeded` and
+    a fresh worker takes the old one's place, so a bad call costs at most its
+    own limit and never blocks the other workers.
+    """
+
+    def __init__(self, workers=None, timeout=None, memory_mb=None, start_method=None):
+        self.workers = workers or Config.ISOLATION_WORKERS
+        self.timeout = Config.ISOLATION_TIMEOUT if timeout is None else timeout
+        self.memory_mb = Config.ISOLATION_MEMORY_MB if memory_mb is None else memory_mb
+        methods = multiprocessing.get_all_start_methods()
+        self._context = multiprocessing.get_context(start_method or ("forkserver" if "forkserver" in methods
+                                                                     else "spawn"))
+        self._idle = queue.Queue()
+        self._all = []
+        self._lock = threading.Lock()
+        self._closed = False
+        self._generation = 0
+
+    def start(self):
+        """Starts every worker now (otherwise they start on the first call); returns the pool."""
+        with self._lock:
+            while len(self._all) < self.workers:
+                self._add_worker()
+        return self
+
+    def _add_worker(self):
+        worker = _Worker(self._context, self.memory_mb, self._generation)
+        self._all.append(worker)
+        self._idle.put(worker)
+        return worker
+
+    def _replace(self, worker, kill):
+        """Stops a worker and returns a new one in its place."""
+        worker.stop(kill=kill)
+        with self._lock:
+            self._all.remove(worker)
+            replacement = _Worker(self._context, self.memory_mb, self._generation)
+            self._all.append(replacement)
+        return replacement
+
+    def call(self, method, operation, args):
+        """
+        Runs `method` ("execute" or "reduce") of an `IsolatedOperation` in a worker.
+
+        Raises:
+            LimitExceeded: If the call timed out, ran out of memory or crashed its worker.
+            Exception: Whatever the operation itself raised (e.g. ZeroDivisionError).
+        """
+        if self._closed:
+            raise RuntimeError("The isolation pool is closed.")
+        if len(self._all) < self.workers:
+            self.start()
+        name = operation.name
+        worker = self._idle.get()
+        try:
+            if worker.generation != self._generation:
+                worker = self._replace(worker, kill=False)
+            worker.wait_ready()
+            worker.connection.send((method, name, operation.module_name, args))
+            if not worker.connection.poll(self.timeout):
+                worker = self._replace(worker, kill=True)
+                raise self._exceeded(f"Operation '{name}' timed out after {self.timeout:g}s")
+            ok, value = worker.connection.recv()
+            if not ok and isinstance(value, LimitExceeded):  # the worker exits after a MemoryError
+                worker = self._replace(worker, kill=False)
+                raise self._exceeded(str(value))
+        except (EOFError, OSError):
+            worker = self._replace(worker, kill=True)
+            raise self._exceeded(f"Operation '{name}' crashed its worker process") from None
+        finally:
+            self._idle.put(worker)
+        if ok:
+            return value
+        raise value
+
+    def recycle(self):
+        """
+        Retires every worker, e.g. after an isolated plugin changed on disk.
+
+        Each worker is replaced the next time it is taken, so calls already
+        running finish on the version of the plugin they started with.
+        """
+        self._generation += 1
+
+    @staticmethod
+    def _exceeded(message):
+        logger.warning("%s; the worker was restarted", message)
+        return LimitExceeded(message)
+
+    def close(self):
+        """Stops all workers (idempotent)."""
+        with self._lock:
+            self._closed, workers, self._all = True, self._all, []
+        for worker in workers:
+            worker.stop()
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    """Returns the shared pool, creating it on first use (workers are stopped at exit)."""
+    global _pool  # pylint: disable=global-statement
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = IsolationPool()
+                atexit.register(_pool.close)
+    return _pool
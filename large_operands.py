@@ -0,0 +1,136 @@
+"""Large Operands - fast, correctly rounded multiply and divide for operands far longer than the context precision"""
+
+import threading
+from decimal import (Clamped, Context, Decimal, Inexact, MAX_EMAX, MIN_EMIN, Overflow, ROUND_DOWN, ROUND_UP,
+                     Rounded, Subnormal, Underflow, getcontext)
+from app.config import Config
+
+# Extra digits kept beyond the context precision when shortening operands.
+GUARD_DIGITS = 10
+
+_INFINITY = Decimal("Infinity")
+_EXCEPTIONAL = (Overflow, Underflow, Subnormal, Clamped)
+_BASE_SIZE = Decimal(0).__sizeof__()
+_BYTES_PER_DIGIT = (Decimal("9" * 1900).__sizeof__() - _BASE_SIZE) / 1900
+_local = threading.local()
+
+
+def size_limit(digits):
+    """
+    Returns the `__sizeof__` above which a Decimal has roughly more than `digits` digits.
+
+    Callers compare operand sizes against it, which costs the same for ten
+    digits as for a million (the digits are never scanned).
+    """
+    return _BASE_SIZE + int(digits * _BYTES_PER_DIGIT)
+
+
+SIZE_LIMIT = size_limit(Config.LARGE_OPERAND_DIGITS)
+# Plain division already runs in time linear in the operand length, so it only pays off for longer operands.
+DIVIDE_SIZE_LIMIT = size_limit(10 * Config.LARGE_OPERAND_DIGITS)
+
+
+def _scratch(prec, rounding):
+    """Returns this thread's reusable context with unbounded exponents and no traps, flags cleared."""
+    contexts = _local.__dict__.setdefault("contexts", {})
+    context = contexts.get((prec, rounding))
+    if context is None:
+        context = contexts[prec, rounding] = Context(prec=prec, rounding=rounding, Emax=MAX_EMAX, Emin=MIN_EMIN,
+                                                     traps=[])
+    else:
+        context.clear_flags()
+    return context
+
+
+def _bracket(value, prec):
+    """Returns `(toward_zero, away_from_zero)` bounds of `value` with `prec` digits; both equal when it fits."""
+    context = _scratch(prec, ROUND_DOWN)
+    low = context.plus(value)
+    if not context.flags[Inexact]:
+        return low, low
+    return low, context.next_toward(low, _INFINITY.copy_sign(low))
+
+
+def _round_bounds(low, high, context):
+    """
+    Rounds both bounds of the true result in `context`.
+
+    Every rounding mode is monotonic, so when both bounds round to the same
+    number the true result rounds to it too. Returns None when they differ or
+    when rounding would overflow, underflow or clamp (left to the exact path,
+    which signals those conditions itself).
+    """
+    scratch = context.copy()
+    scratch.clear_flags()
+    scratch.clear_traps()
+    result = scratch.plus(low)
+    if result.compare_total(scratch.plus(high)) or any(scratch.flags[signal] for signal in _EXCEPTIONAL):
+        return None
+    return result
+
+
+def _rounded(context, result):
+    """
+    Raises the flags the plain operation would have raised, then returns its result.
+
+    `Rounded` always matches. `Inexact` is raised even in the rare case where
+    the long operands' product happens to round without loss.
+    """
+    if result is not None:
+        context.flags[Inexact] = context.flags[Rounded] = True
+    return result
+
+
+def _usable(a, b, context):
+    """The shortcuts need finite, nonzero Decimal operands and a context that does not trap on rounding."""
+    return (a.__class__ is Decimal is b.__class__ and a.is_finite() and b.is_finite() and a and b
+            and not context.traps[Inexact] and not context.traps[Rounded])
+
+
+def multiply(a, b):
+    """
+    Returns `a * b` rounded to the current context, or None if the shortcut does not apply.
+
+    Decimal multiplication computes the full product of both coefficients and
+    only then rounds it. Here each operand is cut to `prec + GUARD_DIGITS`
+    digits in both directions, the two short products bracket the true one,
+    and the result is used only when both brackets round to the same value, so
+    it is identical to `a * b` (value, digits and exponent). Otherwise, as when
+    neither operand was long, None tells the caller to multiply normally.
+    """
+    context = getcontext()
+    if not _usable(a, b, context):
+        return None
+    prec = context.prec + GUARD_DIGITS
+    a_low, a_high = _bracket(a, prec)
+    b_low, b_high = _bracket(b, prec)
+    if a_low == a_high and b_low == b_high:
+        return None
+    exact = _scratch(2 * prec, ROUND_DOWN)  # both products fit in 2 * prec digits
+    return _rounded(context, _round_bounds(exact.multiply(a_low, b_low), exact.multiply(a_high, b_high), context))
+
+
+def divide(a, b):
+    """
+    Returns `a / b` rounded to the current context, or None if the shortcut does not apply.
+
+    Same bracketing as `multiply`: the shortest dividend over the longest
+    divisor (rounded down) and the reverse (rounded up) enclose the quotient.
+    A result ending in zero that lies inside the bracket might be an exact
+    quotient, which Decimal writes with fewer digits, so that (rare) case also
+    falls back to plain division.
+    """
+    context = getcontext()
+    if not _usable(a, b, context):
+        return None
+    prec = context.prec + GUARD_DIGITS
+    a_low, a_high = _bracket(a, prec)
+    b_low, b_high = _bracket(b, prec)
+    if a_low == a_high and b_low == b_high:
+        return None
+    low = _scratch(2 * prec, ROUND_DOWN).divide(a_low, b_high)
+    high = _scratch(2 * prec, ROUND_UP).divide(a_high, b_low)
+    quotient = _round_bounds(low, high, context)
+    if quotient is not None and quotient.as_tuple().digits[-1] == 0 and low.copy_abs() <= quotient.copy_abs() <= high.copy_abs():
+        return None
+    return _rounded(context, quotient)
@@ -1,26 +1,104 @@
-"""Logging configuration for the calculator application."""
+"""Logging configuration for the calculator application.
 
+Log calls only enqueue records; a `QueueListener` thread formats them and
+writes them to the console and a size-rotated log file, so callers never
+block on formatting or I/O. The level comes from `LOG_LEVEL`, and records
+below it are dropped before any work is done (an unknown level falls back
+to INFO with a warning). Worker processes switch to direct handlers with
+`use_direct_handlers`.
+"""
+
+import atexit
 import logging
+import logging.handlers
+import queue
 import sys
+from app.env import LOG_LEVEL, LOG_FILE, LOG_MAX_BYTES, LOG_BACKUP_COUNT
+
+
+def resolve_level(name):
+    """Returns the numeric level for a name such as `DEBUG` or `20`, or None if it is not a logging level."""
+    name = str(name).strip().upper()
+    if name.isdigit():
+        return int(name)
+    level = logging.getLevelName(name)
+    return level if isinstance(level, int) else None
+
 
 # ✅ Create logger instance
 logger = logging.getLogger(__name__)
-logger.setLevel(logging.DEBUG)  # Capture DEBUG, INFO, WARNING, and ERROR logs
+_level = resolve_level(LOG_LEVEL)
+logger.setLevel(logging.INFO if _level is None else _level)  # Disabled levels are rejected before a record is even created
 
 # ✅ Format log messages
 formatter = logging.Formatter("%(asctime)s - %(levelname)s - %(message)s")
 
-# 🔹 Console Handler (prints logs to terminal)
-console_handler = logging.StreamHandler(sys.stdout)
+# 🔹 Console Handler (prints logs to terminal; stderr keeps stdout clean for piped results)
+console_handler = logging.StreamHandler(sys.stderr)
 console_handler.setFormatter(formatter)
-console_handler.setLevel(logging.DEBUG)  # Show logs in console
 
-# 🔹 File Handler (saves logs to `app.log`)
-file_handler = logging.FileHandler("app.log")
+# 🔹 File Handler (saves logs to `app.log`, rotated by size)
+file_handler = logging.handlers.RotatingFileHandler(
+    LOG_FILE, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT, delay=True
+)
 file_handler.setFormatter(formatter)
-file_handler.setLevel(logging.DEBUG)  # Log everything to file
 
-# ✅ Attach handlers to the logger (avoid duplicates)
-if not logger.hasHandlers():
-    logger.addHandler(console_handler)
-    logger.addHandler(file_handler)
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """Queue handler that leaves all formatting to the listener thread."""
+
+    def prepare(self, record):
+        """Enqueues the record untouched (it never leaves this process)."""
+        return record
+
+
+# 🔹 Queue Handler + Listener (the writer thread owns the real handlers)
+log_queue = queue.SimpleQueue()
+queue_handler = DeferredQueueHandler(log_queue)
+listener = logging.handlers.QueueListener(log_queue, console_handler, file_handler, respect_handler_level=True)
+_listener_running = False
+
+
+def start_logging():
+    """Starts the writer thread (idempotent)."""
+    global _listener_running  # pylint: disable=global-statement
+    if not _listener_running:
+        listener.start()
+        _listener_running = True
+
+
+def shutdown_logging():
+    """
+    Writes out every queued record and stops the writer thread (idempotent).
+
+    Registered with `atexit` after `logging` itself, so it runs before
+    `logging.shutdown` flushes and closes the handlers.
+    """
+    global _listener_running  # pylint: disable=global-statement
+    if _listener_running:
+        listener.stop()
+        _listener_running = False
+
+
+def use_direct_handlers():
+    """
+    Writes this process's records straight to the console and file handlers, with no queue.
+
+    Called in worker processes: a forked worker inherits the queue handler
+    but not the listener thread, so its records would never be written.
+    """
+    shutdown_logging()
+    logger.removeHandler(queue_handler)
+    for handler in (console_handler, file_handler):
+        if handler not in logger.handlers:
+            logger.addHandler(handler)
+
+
+# ✅ Attach the queue handler to the logger (avoid duplicates)
+if not logger.handlers:
+    logger.addHandler(queue_handler)
+    start_logging()
+    atexit.register(shutdown_logging)
+
+if _level is None:
+    logger.warning("Invalid LOG_LEVEL '%s'; using INFO", LOG_LEVEL)
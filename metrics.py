@@ -0,0 +1,254 @@
+"""Metrics - per-operation call counters, error counts and latency histograms, with an OpenMetrics exporter"""
+
+import os
+import threading
+from app.config import Config
+from log_config import logger
+
+# Error kinds counted per operation (unknown operations are counted separately, see `Metrics`).
+NOT_FOUND = "not_found"
+ZERO_DIVISION = "zero_division"
+INVALID_INPUT = "invalid_input"
+OVERFLOW = "overflow"
+LIMIT_EXCEEDED = "limit_exceeded"  # isolated plugin timed out, ran out of memory or crashed
+
+# Histogram resolution: 2**_SUB_BITS sub-buckets per power of two, i.e. within 12.5%.
+_SUB_BITS = 3
+_SUB_BUCKETS = 1 << _SUB_BITS
+_LINEAR_LIMIT = _SUB_BUCKETS << 1
+
+# Cumulative bucket bounds written to the OpenMetrics file, in seconds.
+EXPORT_BOUNDS = (1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4,
+                 1e-3, 2.5e-3, 5e-3, 1e-2, 2.5e-2, 5e-2, 0.1, 0.25, 0.5, 1.0)
+
+
+def _bucket_index(value):
+    """Maps a non-negative integer to its log-linear bucket."""
+    if value < _LINEAR_LIMIT:
+        return value
+    shift = value.bit_length() - (_SUB_BITS + 1)
+    return (shift + 1) * _SUB_BUCKETS + (value >> shift) - _SUB_BUCKETS
+
+
+def _bucket_bounds(index):
+    """Returns the `[lower, upper)` integer range covered by a bucket."""
+    if index < _LINEAR_LIMIT:
+        return index, index + 1
+    shift, mantissa = index // _SUB_BUCKETS - 1, index % _SUB_BUCKETS + _SUB_BUCKETS
+    return mantissa << shift, (mantissa + 1) << shift
+
+
+class LatencyHistogram:
+    """
+    HDR-style latency histogram over nanoseconds.
+
+    Buckets are linear below 16 ns and log-linear above (8 per power of two),
+    so every recorded value is known to within 12.5% while the whole range
+    from nanoseconds to minutes fits in a few hundred counters.
+    """
+
+    __slots__ = ("counts", "count", "total", "min", "max")
+
+    def __init__(self):
+        self.counts = []
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = 0
+
+    def record(self, nanoseconds):
+        """Adds one observation."""
+        index = _bucket_index(nanoseconds)
+        counts = self.counts
+        if index >= len(counts):
+            counts.extend([0] * (index + 1 - len(counts)))
+        counts[index] += 1
+        self.count += 1
+        self.total += nanoseconds
+        if self.min is None or nanoseconds < self.min:
+            self.min = nanoseconds
+        if nanoseconds > self.max:
+            self.max = nanoseconds
+
+    def percentile(self, percent):
+        """Returns the value at `percent` (0-100) in nanoseconds, or None when empty."""
+        if not self.count:
+            return None
+        rank = max(1, -(-self.count * percent // 100))  # ceil without floats
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank:
+                lower, upper = _bucket_bounds(index)
+                return min(max((lower + upper - 1) // 2, self.min), self.max)
+        return self.max
+
+    def mean(self):
+        """Returns the mean in nanoseconds, or None when empty."""
+        return self.total / self.count if self.count else None
+
+    def cumulative(self, bounds_ns):
+        """Returns the number of observations at or below each bound (by bucket upper edge)."""
+        totals, seen, index = [], 0, 0
+        for bound in bounds_ns:
+            while index < len(self.counts) and _bucket_bounds(index)[1] - 1 <= bound:
+                seen += self.counts[index]
+                index += 1
+            totals.append(seen)
+        return totals
+
+
+class OperationStats:
+    """Counters and latency for one operation."""
+
+    __slots__ = ("calls", "errors", "latency")
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = {}
+        self.latency = LatencyHistogram()
+
+
+class Metrics:
+    """
+    Process-wide operation metrics.
+
+    Instrumented code checks `Metrics.enabled` before reading the clock, so
+    when metrics are off (the default, see `METRICS_ENABLED`) the only cost
+    is that one attribute test. Latency is recorded for successful calls;
+    every call counts toward `calls`, and failures are also counted by kind.
+    Lookups of unknown operations are counted once overall, not per name,
+    so arbitrary input cannot create unbounded series.
+    """
+
+    enabled = Config.METRICS_ENABLED
+    unknown_operations = 0
+    _operations = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def enable(cls, enabled=True):
+        """Turns collection on or off (collected data is kept)."""
+        cls.enabled = enabled
+
+    @classmethod
+    def observe(cls, operation, nanoseconds, error=None):
+        """Records one call of `operation` that took `nanoseconds` and failed with `error` (or succeeded)."""
+        with cls._lock:
+            if error == NOT_FOUND:
+                cls.unknown_operations += 1
+                return
+            stats = cls._operations.get(operation)
+            if stats is None:
+                stats = cls._operations[operation] = OperationStats()
+            stats.calls += 1
+            if error is None:
+                stats.latency.record(nanoseconds)
+            else:
+                stats.errors[error] = stats.errors.get(error, 0) + 1
+
+    @classmethod
+    def operations(cls):
+        """Returns `{operation: OperationStats}` (live objects; read-only use)."""
+        return dict(cls._operations)
+
+    @classmethod
+    def reset(cls):
+        """Discards everything collected so far."""
+        with cls._lock:
+            cls._operations.clear()
+            cls.unknown_operations = 0
+
+    @classmethod
+    def format_stats(cls):
+        """Returns the REPL `stats` table: calls, errors and latency percentiles per operation."""
+        if not cls.enabled and not cls._operations:
+            return "Metrics are disabled (set METRICS_ENABLED=true)."
+        if not cls._operations and not cls.unknown_operations:
+            return "No operations recorded yet."
+
+        def micros(value):
+            return "-" if value is None else f"{value / 1000:.1f}"
+
+        lines = [f"{'operation':<12} {'calls':>8} {'errors':>7} {'p50 µs':>8} {'p90 µs':>8} "
+                 f"{'p99 µs':>8} {'max µs':>8}  error kinds"]
+        with cls._lock:
+            for name, stats in sorted(cls._operations.items()):
+                latency = stats.latency
+                kinds = ", ".join(f"{kind}={count}" for kind, count in sorted(stats.errors.items()))
+                lines.append(f"{name:<12} {stats.calls:>8} {sum(stats.errors.values()):>7} "
+                             f"{micros(latency.percentile(50)):>8} {micros(latency.percentile(90)):>8} "
+                             f"{micros(latency.percentile(99)):>8} {micros(latency.max or None):>8}  {kinds}")
+            unknown = cls.unknown_operations
+        lines.append(f"Unknown operation lookups: {unknown}")
+        return "\n".join(lines)
+
+    @classmethod
+    def to_openmetrics(cls):
+        """Returns all metrics in the OpenMetrics text format."""
+        bounds_ns = [round(bound * 1e9) for bound in EXPORT_BOUNDS]
+        calls = ["# TYPE calculator_operation_calls counter",
+                 "# HELP calculator_operation_calls Operation calls, successful or not."]
+        errors = ["# TYPE calculator_operation_errors counter",
+                  "# HELP calculator_operation_errors Failed operation calls by error kind."]
+        latency = ["# TYPE calculator_operation_latency_seconds histogram",
+                   "# UNIT calculator_operation_latency_seconds seconds",
+                   "# HELP calculator_operation_latency_seconds Latency of successful operation calls."]
+        with cls._lock:
+            for name, stats in sorted(cls._operations.items()):
+                label = f'operation="{name}"'
+                calls.append(f"calculator_operation_calls_total{{{label}}} {stats.calls}")
+                for kind, count in sorted(stats.errors.items()):
+                    errors.append(f'calculator_operation_errors_total{{{label},kind="{kind}"}} {count}')
+                histogram = stats.latency
+                for bound, count in zip(EXPORT_BOUNDS, histogram.cumulative(bounds_ns)):
+                    latency.append(f'calculator_operation_latency_seconds_bucket{{{label},le="{bound:g}"}} {count}')
+                latency.append(f'calculator_operation_latency_seconds_bucket{{{label},le="+Inf"}} {histogram.count}')
+                latency.append(f"calculator_operation_latency_seconds_count{{{label}}} {histogram.count}")
+                latency.append(f"calculator_operation_latency_seconds_sum{{{label}}} {histogram.total / 1e9:.9f}")
+            unknown = ["# TYPE calculator_unknown_operations counter",
+                       "# HELP calculator_unknown_operations Lookups of operations that do not exist.",
+                       f"calculator_unknown_operations_total {cls.unknown_operations}"]
+        return "\n".join(calls + errors + latency + unknown + ["# EOF"]) + "\n"
+
+
+def write_openmetrics(path):
+    """Atomically writes the current metrics to `path` (readers never see a partial file)."""
+    with open(f"{path}.tmp", "w", encoding="utf-8") as target:
+        target.write(Metrics.to_openmetrics())
+    os.replace(f"{path}.tmp", path)
+
+
+class MetricsExporter:
+    """Background thread that rewrites an OpenMetrics text file every `interval` seconds."""
+
+    def __init__(self, path, interval=15.0):
+        self.path = path
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="metrics-exporter", daemon=True)
+
+    def start(self):
+        """Starts exporting; returns the exporter."""
+        self._thread.start()
+        return self
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.export()
+
+    def export(self):
+        """Writes the file now, logging (not raising) I/O errors."""
+        try:
+            write_openmetrics(self.path)
+        except OSError as e:
+            logger.error("Failed to export metrics to %s: %s", self.path, e)
+
+    def stop(self):
+        """Stops the thread and writes a final snapshot (idempotent)."""
+        if self._stop.is_set():
+            return
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join()
+        self.export()
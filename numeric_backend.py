@@ -0,0 +1,306 @@
+"""Numeric Backends - choose the number type calculations run on (Decimal, float, Fraction, fixed-point)"""
+
+import functools
+from decimal import Decimal, InvalidOperation, ROUND_HALF_EVEN
+from fractions import Fraction
+from app.config import Config
+
+_INT64_MIN, _INT64_MAX = -(1 << 63), (1 << 63) - 1
+
+
+def _divide_half_even(numerator, denominator):
+    """Integer division rounded half-to-even (the Decimal default), for either sign."""
+    quotient, remainder = divmod(numerator, denominator)
+    twice = 2 * remainder
+    if denominator < 0:
+        twice, denominator = -twice, -denominator
+    if twice > denominator or (twice == denominator and quotient % 2):
+        quotient += 1
+    return quotient
+
+
+@functools.total_ordering
+class FixedPoint:
+    """
+    Fixed-scale number stored as a signed 64-bit count of `10 ** -scale` units.
+
+    With `scale=2` a value is a whole number of cents. Addition and subtraction
+    are exact integer operations; products and quotients are rounded
+    half-to-even back to the scale. Results outside the int64 range raise
+    `OverflowError` instead of silently growing.
+    """
+
+    __slots__ = ("units", "scale")
+
+    def __init__(self, units, scale=2):
+        if not _INT64_MIN <= units <= _INT64_MAX:
+            raise OverflowError(f"Fixed-point value out of int64 range at scale {scale}")
+        self.units = units
+        self.scale = scale
+
+    @classmethod
+    def from_value(cls, value, scale=2):
+        """Converts a number or numeric string, rounding half-to-even to `scale` places."""
+        if isinstance(value, FixedPoint):
+            if value.scale == scale:
+                return value
+            value = value.to_decimal()
+        try:
+            exact = value if isinstance(value, Decimal) else Decimal(str(value))
+            units = exact.scaleb(scale).to_integral_value(ROUND_HALF_EVEN)
+            return cls(int(units), scale)
+        except InvalidOperation as exc:
+            raise ValueError(f"Invalid number '{value}'") from exc
+
+    def to_decimal(self):
+        """Returns the exact value as a Decimal."""
+        return Decimal(self.units).scaleb(-self.scale)
+
+    def _coerce(self, other):
+        """Returns the other operand's units at this scale, or None if it is not supported."""
+        if isinstance(other, FixedPoint):
+            if other.scale != self.scale:
+                raise ValueError(f"Cannot combine fixed-point scales {self.scale} and {other.scale}")
+            return other.units
+        if isinstance(other, int):
+            return other * 10 ** self.scale
+        return None
+
+    def __add__(self, other):
+        units = self._coerce(other)
+        return NotImplemented if units is None else FixedPoint(self.units + units, self.scale)
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        units = self._coerce(other)
+        return NotImplemented if units is None else FixedPoint(self.units - units, self.scale)
+
+    def __rsub__(self, other):
+        units = self._coerce(other)
+        return NotImplemented if units is None else FixedPoint(units - self.units, self.scale)
+
+    def __mul__(self, other):
+        units = self._coerce(other)
+        if units is None:
+            return NotImplemented
+        return FixedPoint(_divide_half_even(self.units * units, 10 ** self.scale), self.scale)
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, other):
+        units = self._coerce(other)
+        if units is None:
+            return NotImplemented
+        if units == 0:
+            raise ZeroDivisionError("Fixed-point division by zero")
+        return FixedPoint(_divide_half_even(self.units * 10 ** self.scale, units), self.scale)
+
+    def __rtruediv__(self, other):
+        units = self._coerce(other)
+        if units is None:
+            return NotImplemented
+        return FixedPoint(units, self.scale) / self
+
+    def __neg__(self):
+        return FixedPoint(-self.units, self.scale)
+
+    def __abs__(self):
+        return FixedPoint(abs(self.units), self.scale)
+
+    def __eq__(self, other):
+        if isinstance(other, FixedPoint):
+            return self.to_decimal() == other.to_decimal()
+        units = self._coerce(other)
+        return NotImplemented if units is None else self.units == units
+
+    def __lt__(self, other):
+        if isinstance(other, FixedPoint):
+            return self.to_decimal() < other.to_decimal()
+        units = self._coerce(other)
+        return NotImplemented if units is None else self.units < units
+
+    def __hash__(self):
+        return hash(self.to_decimal())
+
+    def __str__(self):
+        return str(self.to_decimal())
+
+    def __repr__(self):
+        return f"FixedPoint('{self}')"
+
+
+class NumericBackend:
+    """
+    A number type that calculations run on.
+
+    Operations are not rewritten per backend: an operation with a scalar
+    `kernel` (see `Operation.bind`) runs it directly on the backend's numbers,
+    and any other operation runs its Decimal `execute` with the operands
+    converted to Decimal and back.
+    """
+
+    name = None
+    type = None
+
+    def convert(self, value):
+        """Converts a number or numeric string to this backend's type (ValueError if invalid)."""
+        raise NotImplementedError
+
+    def to_decimal(self, value):
+        """Converts one of this backend's numbers to Decimal."""
+        return Decimal(str(value))
+
+    def execute(self, operation_class, a, b):
+        """Runs an operation on two operands that are already of this backend's type."""
+        kernel = operation_class.kernel
+        if kernel is not None:
+            return kernel(a, b)
+        return self.convert(operation_class.execute(self.to_decimal(a), self.to_decimal(b)))
+
+    def execute_batch(self, operation_class, a_values, b_values):
+        """
+        Runs one operation over whole operand lists in a single vectorized call.
+
+        Returns:
+            tuple | None: `(a_values, b_values, results)` converted to this backend's
+            type, or None when the batch should run row by row instead.
+        """
+        return None
+
+    def reduce(self, operation_class, operands):
+        """Runs a variadic operation over operands that are already of this backend's type."""
+        if operation_class.kernel is not None:
+            return operation_class.reduce(operands)
+        return self.convert(operation_class.reduce([self.to_decimal(operand) for operand in operands]))
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}()"
+
+
+class DecimalBackend(NumericBackend):
+    """Exact Decimal arithmetic through each operation's validated `execute` (the default)."""
+
+    name = "decimal"
+    type = Decimal
+
+    def convert(self, value):
+        if value.__class__ is Decimal:
+            return value
+        try:
+            return Decimal(str(value)) if isinstance(value, (float, FixedPoint)) else Decimal(value)
+        except (InvalidOperation, TypeError) as exc:
+            raise ValueError(f"Invalid number '{value}'") from exc
+
+    def to_decimal(self, value):
+        return value
+
+    def execute(self, operation_class, a, b):
+        return operation_class.execute(a, b)
+
+    def reduce(self, operation_class, operands):
+        return operation_class.reduce(operands)
+
+
+class FloatBackend(NumericBackend):
+    """Native binary floating point: fastest, but inexact (e.g. `0.1 + 0.2`)."""
+
+    name = "float"
+    type = float
+
+    # Shorter batches run row by row, where NumPy's fixed cost per call would dominate.
+    VECTOR_MIN_BATCH = 256
+
+    def execute_batch(self, operation_class, a_values, b_values):
+        """
+        Runs an operation's `array_kernel` once over the whole batch (same IEEE results as its scalar `kernel`).
+
+        Declines short batches, batches of different lengths, operands that do
+        not convert, and any batch with a non-finite result (e.g. a division by
+        zero), so those keep the row-by-row errors. NumPy is optional.
+        """
+        count = len(a_values)
+        if count < self.VECTOR_MIN_BATCH or len(b_values) != count:
+            return None
+        try:
+            import numpy as np  # pylint: disable=import-outside-toplevel
+        except ImportError:
+            return None
+        try:
+            a = np.fromiter(a_values, np.float64, count)
+            b = np.fromiter(b_values, np.float64, count)
+        except (TypeError, ValueError):
+            return None
+        with np.errstate(all="ignore"):
+            results = operation_class.array_kernel(a, b)
+        if results.shape != a.shape or not np.isfinite(results).all():
+            return None
+        return a.tolist(), b.tolist(), results.tolist()
+
+    def convert(self, value):
+        if value.__class__ is float:
+            return value
+        try:
+            return float(value)
+        except TypeError as exc:
+            raise ValueError(f"Invalid number '{value}'") from exc
+
+
+class FractionBackend(NumericBackend):
+    """Exact rational arithmetic; `1 / 3` stays exactly one third."""
+
+    name = "fraction"
+    type = Fraction
+
+    def convert(self, value):
+        if value.__class__ is Fraction:
+            return value
+        try:
+            return Fraction(str(value)) if isinstance(value, (float, FixedPoint)) else Fraction(value)
+        except TypeError as exc:
+            raise ValueError(f"Invalid number '{value}'") from exc
+
+    def to_decimal(self, value):
+        return Decimal(value.numerator) / Decimal(value.denominator)
+
+
+class FixedPointBackend(NumericBackend):
+    """Scaled int64 arithmetic for currency-style amounts (see `FixedPoint`)."""
+
+    name = "fixed"
+    type = FixedPoint
+
+    def __init__(self, scale=2):
+        self.scale = scale
+
+    def convert(self, value):
+        if value.__class__ is FixedPoint and value.scale == self.scale:
+            return value
+        return FixedPoint.from_value(value, self.scale)
+
+    def to_decimal(self, value):
+        return value.to_decimal()
+
+    def __repr__(self):
+        return f"FixedPointBackend(scale={self.scale})"
+
+
+BACKENDS = {
+    backend.name: backend
+    for backend in (DecimalBackend(), FloatBackend(), FractionBackend(), FixedPointBackend(Config.FIXED_POINT_SCALE))
+}
+
+
+def get_backend(backend):
+    """
+    Returns a backend instance from a name (`decimal`, `float`, `fraction`, `fixed`) or an instance.
+
+    Raises:
+        ValueError: If the name is unknown.
+    """
+    if isinstance(backend, NumericBackend):
+        return backend
+    try:
+        return BACKENDS[backend.lower()]
+    except KeyError:
+        raise ValueError(f"Unknown numeric backend '{backend}'") from None
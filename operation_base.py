@@ -1,12 +1,242 @@
 """Base class for Plugin System"""
+import threading
 from abc import ABC, abstractmethod
-from decimal import Decimal
-from typing import Type
+from contextlib import contextmanager
+from decimal import Decimal, MAX_EMAX, MAX_PREC, MIN_EMIN, localcontext
+from typing import NamedTuple, Type
+
+_staging = threading.local()
+
+def require_numpy():
+    """Imports NumPy on first use, since array mode is an optional feature."""
+    try:
+        import numpy  # pylint: disable=import-outside-toplevel
+    except ImportError as exc:
+        raise ImportError("Array mode requires NumPy. Install it with `pip install numpy`.") from exc
+    return numpy
+
+def tree_reduce(function, values):
+    """
+    Folds `values` with a binary `function` pairwise, as a balanced tree.
+
+    Operands keep their left-to-right order, so any associative function gives
+    the same result as a left fold, but with operands of similar size at each
+    level (which keeps big-number products fast and float error growth low).
+
+    Raises:
+        ValueError: If there are no values.
+    """
+    values = list(values)
+    if not values:
+        raise ValueError("At least one operand is required.")
+    while len(values) > 1:
+        paired = [function(values[i], values[i + 1]) for i in range(0, len(values) - 1, 2)]
+        if len(values) % 2:
+            paired.append(values[-1])
+        values = paired
+    return values[0]
+
+def exact_decimal_reduce(function, values, rounded=True):
+    """Tree-reduces Decimals with no intermediate rounding, then rounds once to the active context (unless not `rounded`)."""
+    with localcontext() as ctx:
+        ctx.prec, ctx.Emax, ctx.Emin = MAX_PREC, MAX_EMAX, MIN_EMIN
+        result = tree_reduce(function, values)
+    return +result if rounded else result
+
+class Capabilities(NamedTuple):
+    """
+    What the dispatcher may assume about an operation (see `Operation.capabilities`).
+
+    - pure: the same operands and context always give the same result, so results may be memoized.
+    - commutative: `execute(a, b)` equals `execute(b, a)` exactly, so both share one cache entry.
+    - associative: regrouping operands leaves an exact reduction unchanged, so it may be split into chunks.
+    - vectorized: `array_kernel` matches `kernel` on float arrays, so float batches may run as one NumPy call.
+    """
+
+    pure: bool
+    commutative: bool
+    associative: bool
+    vectorized: bool
+
+    def __str__(self):
+        return ", ".join(name for name, value in zip(self._fields, self) if value) or "none"
+
+class LazyRegistry(dict):
+    """
+    Operation registry that imports plugin modules on first use.
+
+    Discovery records `name -> module` pairs with `add_lazy`; looking a name up
+    (`registry[name]`, `get`, `in`) imports its module, whose `Operation`
+    subclasses then register themselves as usual. Listing names never imports.
+
+    Mutations and the name snapshots used for iteration hold an internal lock,
+    so plugins may be loaded, reloaded or swapped while other threads look
+    operations up or list them. Lookups of imported names stay plain dict reads.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._pending = {}
+        self._lock = threading.RLock()  # re-entrant: a plugin import registers its operations
+
+    def add_lazy(self, name, module_name):
+        """Records that `module_name` provides operation `name`, without importing it."""
+        with self._lock:
+            if not dict.__contains__(self, name):
+                self._pending[name] = module_name
+
+    def discard_pending(self, name):
+        """Forgets a lazy entry (e.g. because its class is being registered directly)."""
+        with self._lock:
+            self._pending.pop(name, None)
+
+    def is_loaded(self, name):
+        """Whether `name` is registered and already imported."""
+        return dict.__contains__(self, name)
+
+    def _load(self, module_name):
+        """
+        Imports a plugin module once, then drops every lazy entry that pointed to it.
+
+        The lock is not held during the import: its names stay pending until
+        the import finishes, so a concurrent lookup imports too and simply
+        waits on Python's per-module import lock.
+        """
+        import plugin_loader  # pylint: disable=import-outside-toplevel
+        try:
+            plugin_loader.load_plugin(module_name)
+        finally:
+            with self._lock:
+                for name in [name for name, module in self._pending.items() if module == module_name]:
+                    del self._pending[name]
+
+    def __missing__(self, name):
+        with self._lock:
+            if dict.__contains__(self, name):  # registered by a concurrent import since the lookup missed
+                return dict.__getitem__(self, name)
+            module_name = self._pending.get(name)
+        if module_name is None:
+            raise KeyError(name)
+        self._load(module_name)
+        return dict.__getitem__(self, name)
+
+    def __setitem__(self, name, operation_class):
+        with self._lock:
+            self._pending.pop(name, None)
+            dict.__setitem__(self, name, operation_class)
+
+    def __contains__(self, name):
+        with self._lock:
+            return dict.__contains__(self, name) or name in self._pending
+
+    def get(self, name, default=None):
+        try:
+            return self[name]
+        except KeyError:
+            return default
+
+    def provider(self, name):
+        """Returns the module that provides `name` (imported or pending), without importing it; None if unknown."""
+        with self._lock:
+            if dict.__contains__(self, name):
+                operation = dict.__getitem__(self, name)
+                return getattr(operation, "module_name", None) or operation.__module__
+            return self._pending.get(name)
+
+    def provided_by(self, module_name):
+        """Returns every name (imported or pending) that `module_name` provides."""
+        with self._lock:
+            return [name for name in self if self.provider(name) == module_name]
+
+    def swap(self, entries, removed=()):
+        """
+        Replaces several entries at once, e.g. every operation of a reloaded plugin.
+
+        The new entries go in with a single `dict.update`, so a concurrent
+        lookup sees either the old or the new class for each name, never a
+        missing one; names in `removed` are dropped afterwards.
+        """
+        with self._lock:
+            for name in entries:
+                self._pending.pop(name, None)
+            dict.update(self, entries)
+            for name in removed:
+                self._pending.pop(name, None)
+                dict.pop(self, name, None)
+
+    def capabilities(self):
+        """Returns `{name: Capabilities}` for every operation (imports pending plugins)."""
+        return {name: operation.capabilities() for name, operation in sorted(self.items())}
+
+    def load_all(self):
+        """Imports every pending plugin module."""
+        with self._lock:
+            module_names = set(self._pending.values())
+        for module_name in module_names:
+            self._load(module_name)
+
+    def keys(self):
+        return list(self)
+
+    def values(self):
+        self.load_all()
+        with self._lock:
+            return list(dict.values(self))
+
+    def items(self):
+        self.load_all()
+        with self._lock:
+            return list(dict.items(self))
+
+    def __iter__(self):
+        with self._lock:
+            return iter([*dict.keys(self), *self._pending])
+
+    def __len__(self):
+        with self._lock:
+            return dict.__len__(self) + len(self._pending)
+
+    def clear(self):
+        with self._lock:
+            dict.clear(self)
+            self._pending.clear()
+
+
+@contextmanager
+def staged_registrations():
+    """
+    Collects the operations registered by this thread into a dict instead of the registry.
+
+    Used to import a new version of a plugin side by side with the live one;
+    the caller decides whether (and when) to swap the collected classes in.
+    """
+    _staging.operations = {}
+    try:
+        yield _staging.operations
+    finally:
+        del _staging.operations
+
 
 class Operation(ABC):
     """Abstract base class for calculator operations."""
 
-    registry = {}
+    registry = LazyRegistry()
+
+    # Set to False in plugins whose results must never be memoized (e.g. impure operations).
+    cacheable = True
+
+    # Vectorized NumPy kernel `(a, b) -> array`; None means no array fast path.
+    array_kernel = None
+
+    # Unchecked scalar kernel `(a, b) -> Decimal` for trusted Decimal operands; None means use `execute`.
+    kernel = None
+
+    # True for associative operations that accept any number of operands (see `reduce`).
+    variadic = False
+
+    # Capability flags read by the dispatcher (see `capabilities`); only declare what holds exactly for Decimal.
+    commutative = False
+    associative = False
 
     def __init_subclass__(cls, **kwargs):
         """Automatically registers subclasses in the operation registry."""
@@ -22,6 +252,70 @@ class Operation(ABC):
     def execute(cls, a, b) -> Decimal:
         """Abstract method that must be implemented by subclasses."""
 
+    @classmethod
+    def capabilities(cls) -> Capabilities:
+        """
+        Describes what the dispatcher may assume about this operation.
+
+        Derived from the class attributes: `cacheable` (pure), `commutative`,
+        `associative` (which also needs `variadic`) and `array_kernel` (vectorized,
+        which also needs a scalar `kernel` for the rows it cannot handle).
+        """
+        return Capabilities(pure=cls.cacheable, commutative=cls.commutative,
+                            associative=cls.associative and cls.variadic,
+                            vectorized=cls.array_kernel is not None and cls.kernel is not None)
+
+    @classmethod
+    def reduce(cls, operands):
+        """
+        Applies a variadic operation to a whole list of operands.
+
+        Operands are combined by tree reduction. All-Decimal inputs are
+        accumulated exactly and rounded once at the end.
+
+        Raises:
+            TypeError: If the operation is not variadic.
+            ValueError: If there are no operands.
+        """
+        if not cls.variadic:
+            raise TypeError(f"Operation '{cls.__name__.lower()}' takes exactly two operands.")
+        operands, function = list(operands), cls.kernel or cls.execute
+        if all(operand.__class__ is Decimal for operand in operands):
+            return exact_decimal_reduce(function, operands)
+        return tree_reduce(function, operands)
+
+    @classmethod
+    def execute_array(cls, a, b, exact=False):
+        """
+        Executes the operation element-wise over NumPy arrays (or scalars that broadcast).
+
+        Float and integer arrays run through `array_kernel` as one vectorized call.
+        Object arrays (e.g. of `Decimal`), operations without a kernel, and calls
+        with `exact=True` fall back to `execute` on each element as `Decimal`.
+        Division by zero yields NaN for that element instead of raising.
+
+        Args:
+            a: First operand array.
+            b: Second operand array.
+            exact (bool): Force the exact Decimal path.
+
+        Returns:
+            numpy.ndarray: The element-wise results.
+        """
+        np = require_numpy()
+        a, b = np.asarray(a), np.asarray(b)
+        if exact or cls.array_kernel is None or a.dtype == object or b.dtype == object:
+            return np.frompyfunc(cls._execute_exact, 2, 1)(a, b)
+        return cls.array_kernel(a, b)
+
+    @classmethod
+    def _execute_exact(cls, a, b):
+        """Runs the scalar Decimal path for one element pair."""
+        try:
+            return cls.execute(Decimal(str(a)), Decimal(str(b)))
+        except ZeroDivisionError:
+            return Decimal("NaN")
+
     @classmethod
     def validate_numbers(cls, a, b):
         """Ensures input values are Decimal-compatible using EAFP."""
@@ -30,6 +324,22 @@ class Operation(ABC):
         except Exception as exc:
             raise TypeError(f"Invalid type: {type(a).__name__} or {type(b).__name__}") from exc
 
+    @classmethod
+    def bind(cls, name: str):
+        """
+        Resolves an operation once and returns its raw callable for trusted inputs.
+
+        The callable is the operation's `kernel` (or `execute` when it has none)
+        and does no name normalization, type checking or conversion per call:
+        callers must pass canonical (lowercase) names and `Decimal` operands.
+        Division by zero still raises `ZeroDivisionError`.
+
+        Raises:
+            KeyError: If no operation is registered under `name`.
+        """
+        operation_class = cls.registry[name]
+        return operation_class.kernel or operation_class.execute
+
     @classmethod
     def get_operation(cls, name: str) -> Type["Operation"]:
         """Retrieve a registered operation class by name using EAFP."""
@@ -42,10 +352,18 @@ class Operation(ABC):
     def register_operation(cls, name: str, operation_class: Type["Operation"]):
         """Registers an operation, preventing duplicates using EAFP."""
         name = name.lower()
+        staged = getattr(_staging, "operations", None)
+        if staged is not None:
+            if name in staged:
+                raise ValueError(f"Operation '{name}' is already registered.")
+            staged[name] = operation_class
+            return
+        if isinstance(cls.registry, LazyRegistry):
+            cls.registry.discard_pending(name)  # a direct import supersedes a lazy entry
         if name in cls.registry:
             raise ValueError(f"Operation '{name}' is already registered.")
         cls.registry[name] = operation_class
 
-# ✅ Load plugins AFTER defining `Operation` to prevent circular imports
-from plugin_loader import load_plugins
-load_plugins()
+# ✅ Discover plugins AFTER defining `Operation` to prevent circular imports (modules load on first use)
+from plugin_loader import discover_plugins
+discover_plugins()
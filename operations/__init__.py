@@ -1,16 +1,38 @@
-"""Operations Package: Dynamically registers all available operations."""
+"""Operations Package: Dynamically registers all available operations.
 
-from .add import Add
-from .subtract import Subtract
-from .multiply import Multiply
-from .divide import Divide
+Plugin modules are imported lazily, on first attribute access, so importing
+one operation (or discovering the package) does not import all of them.
+"""
 
-# ✅ Create operation mapping dynamically
-operation_mapping = {
-    "add": Add,
-    "subtract": Subtract,
-    "multiply": Multiply,
-    "divide": Divide
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:  # ✅ Static names for linters and IDEs; at runtime `__getattr__` imports on demand
+    from .add import Add
+    from .subtract import Subtract
+    from .multiply import Multiply
+    from .divide import Divide
+    from .operation_mapping import operation_mapping
+
+# ✅ Exported names and the submodule that defines each
+_EXPORTS = {
+    "Add": "add",
+    "Subtract": "subtract",
+    "Multiply": "multiply",
+    "Divide": "divide",
+    "operation_mapping": "operation_mapping",
 }
 
+def __getattr__(name):
+    """Imports the submodule providing `name` on first access (PEP 562)."""
+    try:
+        module_name = _EXPORTS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    return getattr(importlib.import_module(f".{module_name}", __name__), name)
+
+def __dir__():
+    """Lists the lazy exports alongside the names already bound (PEP 562)."""
+    return sorted(set(globals()) | set(_EXPORTS))
+
 __all__ = ["operation_mapping", "Add", "Subtract", "Multiply", "Divide"]
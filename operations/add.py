@@ -1,16 +1,32 @@
 """Addition Plugin Operation"""
 from decimal import Decimal
+import math
+import operator
 from operation_base import Operation
 
 class Add(Operation):
     """Performs addition of two numbers."""
 
+    array_kernel = staticmethod(operator.add)
+    kernel = staticmethod(operator.add)
+    variadic = True
+    commutative = True
+    associative = True
+
     @staticmethod
     def execute(a: Decimal, b: Decimal) -> Decimal:
         """Returns the sum of two numbers."""
         Add.validate_numbers(a, b)
         return a + b
 
+    @classmethod
+    def reduce(cls, operands):
+        """Sums any number of operands; floats use `math.fsum`, so they are also summed without error buildup."""
+        operands = list(operands)
+        if operands and all(operand.__class__ is float for operand in operands):
+            return math.fsum(operands)
+        return super().reduce(operands)
+
     @classmethod
     def validate_numbers(cls, a, b) -> None:
         """
@@ -1,10 +1,15 @@
 """Division Plugin Operation"""
 from decimal import Decimal
-from operation_base import Operation
+import operator
+import large_operands
+from large_operands import DIVIDE_SIZE_LIMIT
+from operation_base import Operation, require_numpy
 
 class Divide(Operation):
     """Performs division of two numbers."""
 
+    kernel = staticmethod(operator.truediv)  # Decimal raises ZeroDivisionError on its own
+
     @staticmethod
     def execute(a: Decimal, b: Decimal) -> Decimal:
         """
@@ -21,8 +26,21 @@ class Divide(Operation):
             ZeroDivisionError: If b is zero.
         """
         Divide.validate_numbers(a, b)
+        if a.__sizeof__() > DIVIDE_SIZE_LIMIT or b.__sizeof__() > DIVIDE_SIZE_LIMIT:
+            quotient = large_operands.divide(a, b)  # ✅ Very long operands: same result, far less work
+            if quotient is not None:
+                return quotient
         return a / b
 
+    @staticmethod
+    def array_kernel(a, b):
+        """Divides arrays element-wise, masking zero divisors to NaN instead of raising."""
+        np = require_numpy()
+        a, b = np.broadcast_arrays(a, b)
+        out = np.full(a.shape, np.nan, dtype=np.result_type(a.dtype, b.dtype, np.float64))
+        np.divide(a, b, out=out, where=b != 0)
+        return out
+
     @classmethod
     def validate_numbers(cls, a, b) -> None:
         """
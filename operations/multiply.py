@@ -1,19 +1,34 @@
 """Multiplication Plugin Operation"""
 from decimal import Decimal
+import operator
+import large_operands
+from large_operands import SIZE_LIMIT
 from operation_base import Operation
 
 class Multiply(Operation):
     """Performs multiplication of two numbers."""
 
+    array_kernel = staticmethod(operator.mul)
+    kernel = staticmethod(operator.mul)
+    variadic = True
+    commutative = True
+    associative = True
+
     @staticmethod
     def execute(a, b):
-        """Returns the product of two numbers."""
+        """Returns the product of two numbers (very long operands take `large_operands.multiply`)."""
         a, b = Multiply.validate_numbers(a, b)
+        if a.__sizeof__() > SIZE_LIMIT or b.__sizeof__() > SIZE_LIMIT:
+            product = large_operands.multiply(a, b)
+            if product is not None:
+                return product
         return a * b
 
     @classmethod
     def validate_numbers(cls, a, b):
         """Ensures input values are Decimal-compatible and returns them."""
+        if a.__class__ is Decimal and b.__class__ is Decimal:
+            return a, b  # ✅ Already Decimal: nothing to convert
         try:
             return Decimal(a), Decimal(b)  # ✅ Convert and return the values
         except Exception as exc:
@@ -1,10 +1,14 @@
 """Subtraction Plugin Operation"""
 from decimal import Decimal
+import operator
 from operation_base import Operation
 
 class Subtract(Operation):
     """Performs subtraction of two numbers."""
 
+    array_kernel = staticmethod(operator.sub)
+    kernel = staticmethod(operator.sub)
+
     @staticmethod
     def execute(a: Decimal, b: Decimal) -> Decimal:
         """Returns the difference of two numbers."""
@@ -0,0 +1,194 @@
+"""Parallel Pipe Mode - evaluates a large calculation file across worker processes"""
+
+import atexit
+import io
+import multiprocessing
+import os
+import sys
+import threading
+import time
+import log_config
+import plugin_loader
+import stream
+from operation_base import Operation, exact_decimal_reduce
+
+
+def shard_ranges(path, shards):
+    """
+    Splits a file into at most `shards` byte ranges that start and end on line boundaries.
+
+    Args:
+        path (str): File to split.
+        shards (int): Desired number of ranges.
+
+    Returns:
+        list[tuple[int, int]]: `(start, end)` byte offsets covering the whole file in order.
+    """
+    size = os.path.getsize(path)
+    if size == 0:
+        return []
+
+    step = max(1, size // max(1, shards))
+    ranges = []
+    with open(path, "rb") as source:
+        start = 0
+        while start < size:
+            source.seek(min(start + step, size))
+            source.readline()  # advance to the start of the next line
+            end = min(source.tell(), size)
+            ranges.append((start, end))
+            start = end
+    return ranges
+
+
+def _init_worker():
+    """Sets up logging and preloads the plugin registry once per worker process."""
+    log_config.use_direct_handlers()
+    plugin_loader.load_plugins()
+
+
+def _context():
+    """
+    Returns the start method for worker processes: `forkserver` where available, else `spawn`.
+
+    Never `fork`: the calculator runs threads (the log writer, server and
+    history threads), and forking a process that holds locks in them can
+    leave the child deadlocked.
+    """
+    return multiprocessing.get_context("forkserver" if "forkserver" in multiprocessing.get_all_start_methods()
+                                       else "spawn")
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    """Returns the shared reduction pool (one worker per CPU), creating it on first use (stopped at exit)."""
+    global _pool  # pylint: disable=global-statement
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = _context().Pool(os.cpu_count() or 1, initializer=_init_worker)
+                atexit.register(reset_pool)
+    return _pool
+
+
+def reset_pool():
+    """
+    Retires the shared pool, e.g. after a plugin changed on disk; the next reduction starts a fresh one.
+
+    Reductions already running in it finish first.
+    """
+    global _pool  # pylint: disable=global-statement
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.close()
+        atexit.unregister(reset_pool)
+
+
+def _evaluate_shard(shard):
+    """
+    Evaluates one byte range of a calculation file.
+
+    Returns:
+        tuple: `(output_text, errors, evaluated, line_count)` where `errors` holds
+        `(shard_line_number, message)` pairs.
+    """
+    path, start, end = shard
+    with open(path, "rb") as source:
+        source.seek(start)
+        chunk = source.read(end - start)
+
+    line_count = chunk.count(b"\n") + (0 if chunk.endswith(b"\n") else 1)
+    results, errors = [], []
+    lines = io.StringIO(chunk.decode("utf-8"))
+    for line_number, result, error in stream.evaluate_lines(stream.parse_lines(lines)):
+        if error is None:
+            results.append(f"{result}\n")
+        else:
+            errors.append((line_number, error))
+    return "".join(results), errors, len(results) + len(errors), line_count
+
+
+def _reduce_chunk(task):
+    """Reduces one contiguous chunk of operands exactly (unrounded) in a worker process."""
+    operation_name, operands = task
+    operation_class = Operation.registry[operation_name]
+    return exact_decimal_reduce(operation_class.kernel or operation_class.execute, operands, rounded=False)
+
+
+def parallel_reduce(operation_name, operands, workers=None):
+    """
+    Reduces Decimal operands with an associative operation across worker processes.
+
+    The operands are split into one contiguous chunk per worker; each chunk is
+    reduced exactly and the partial results are combined exactly, then rounded
+    once, so the result equals the serial `Operation.reduce` (operand order is
+    kept, so commutativity is not required). Chunks run in the shared,
+    long-lived pool (see `get_pool`), so a reduction never pays for starting
+    processes after the first.
+
+    Args:
+        operation_name (str): A registered operation whose capabilities include `associative`.
+        operands (list[Decimal]): The operands.
+        workers (int | None): Number of chunks (defaults to the CPU count).
+
+    Returns:
+        Decimal: The result, rounded to the active context.
+    """
+    operation_class = Operation.registry[operation_name]
+    workers = max(1, min(workers or os.cpu_count() or 1, len(operands)))
+    step = -(-len(operands) // workers)
+    tasks = [(operation_name, operands[start:start + step]) for start in range(0, len(operands), step)]
+    partials = get_pool().map(_reduce_chunk, tasks)
+    return exact_decimal_reduce(operation_class.kernel or operation_class.execute, partials)
+
+
+def run_parallel(path, workers=None, out=None, err=None, shards_per_worker=4):
+    """
+    Evaluates a calculation file in parallel and writes results in original line order.
+
+    The file is split into byte-range shards; each shard is evaluated in a
+    worker process with the plugin registry preloaded, and shard results are
+    merged back in order as soon as each becomes available.
+
+    Args:
+        path (str): Calculation file with `<operation> <a> <b>` lines.
+        workers (int | None): Worker processes (defaults to the CPU count).
+        out: Text stream for results (defaults to `sys.stdout`).
+        err: Text stream for error reports (defaults to `sys.stderr`).
+        shards_per_worker (int): Shards per worker; more shards smooth out uneven lines.
+
+    Returns:
+        stream.StreamStats: Evaluated line and error counts plus elapsed time.
+    """
+    out = out or sys.stdout
+    err = err or sys.stderr
+    workers = workers or os.cpu_count() or 1
+    stats = stream.StreamStats()
+    start = time.perf_counter()
+
+    shards = [(path, begin, end) for begin, end in shard_ranges(path, workers * shards_per_worker)]
+    line_offset = 0
+    with _context().Pool(workers, initializer=_init_worker) as pool:
+        for text, errors, evaluated, line_count in pool.imap(_evaluate_shard, shards):
+            out.write(text)
+            for line_number, error in errors:
+                err.write(f"Line {line_offset + line_number}: {error}\n")
+            stats.lines += evaluated
+            stats.errors += len(errors)
+            line_offset += line_count
+    out.flush()
+
+    stats.seconds = time.perf_counter() - start
+    return stats
+
+
+def parallel_file(path, workers=None, out=None, err=None):
+    """Runs `run_parallel` over a file path and reports throughput."""
+    err = err or sys.stderr
+    stats = run_parallel(path, workers, out, err)
+    err.write(f"{stats}\n")
+    return stats
@@ -1,29 +1,266 @@
 """Plugin Loader Module - Dynamically loads operation plugins"""
 
+import ast
+import builtins
 import importlib
+import json
 import logging
+import os
 import pkgutil
+import sys
+import threading
+from app.config import Config
 from log_config import logger
 
 # ✅ Store loaded plugins to prevent duplicate imports
 _loaded_plugins = set()
 
-def load_plugins():
-    """Dynamically loads all operation plugins from the 'operations' package."""
-    import operations  # ✅ Prevents circular imports
+# ✅ Reloads run one at a time
+_reload_lock = threading.Lock()
 
-    package = operations
-    for _, module_name, _ in pkgutil.iter_modules(package.__path__, package.__name__ + "."):
-        if module_name in _loaded_plugins:
-            logger.debug("Skipping already loaded plugin: %s", module_name)
+# Discovery cache written next to each plugin directory's bytecode cache.
+MANIFEST_NAME = "plugin_manifest.json"
+MANIFEST_VERSION = 2
+PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+
+def plugin_directories(directories=None):
+    """
+    Resolves the configured plugin directories.
+
+    Args:
+        directories (str | list[str] | None): Directories, or an `os.pathsep`-separated
+            string of them; defaults to `PLUGIN_DIRECTORY`. Relative paths are
+            resolved against the project root.
+
+    Returns:
+        list[str]: Absolute directory paths.
+    """
+    if directories is None:
+        directories = Config.PLUGIN_DIRECTORY
+    if isinstance(directories, str):
+        directories = [directory for directory in directories.split(os.pathsep) if directory]
+    return [os.path.normpath(os.path.join(PROJECT_ROOT, directory)) for directory in directories]
+
+def plugin_locations(directories=None):
+    """
+    Makes each plugin directory importable and returns `(directory, module_prefix)` pairs.
+
+    A directory with an `__init__.py` is imported as a package (its parent goes
+    on `sys.path`); a plain directory is put on `sys.path` itself.
+    """
+    locations = []
+    for directory in plugin_directories(directories):
+        if os.path.isfile(os.path.join(directory, "__init__.py")):
+            import_root, prefix = os.path.dirname(directory), os.path.basename(directory) + "."
+        else:
+            import_root, prefix = directory, ""
+        if import_root not in sys.path:
+            sys.path.append(import_root)
+        locations.append((directory, prefix))
+    return locations
+
+def isolated_modules(setting=None):
+    """Returns the plugin module names (without package prefix) listed in `ISOLATED_PLUGINS`."""
+    setting = Config.ISOLATED_PLUGINS if setting is None else setting
+    return {name.strip() for name in setting.split(",") if name.strip()}
+
+def register_isolated(module_name, names):
+    """Registers stand-ins that run a plugin's operations in the isolation pool, without importing it."""
+    import isolation  # pylint: disable=import-outside-toplevel
+    from operation_base import Operation  # ✅ Prevents circular imports
+
+    for name in names:
+        Operation.registry[name] = isolation.IsolatedOperation(name, module_name)
+    logger.info("Isolated plugin %s: %s", module_name, ", ".join(names) or "no operations")
+
+def load_plugins(directories=None):
+    """Dynamically imports every operation plugin in the configured plugin directories."""
+    isolated = isolated_modules()
+    for directory, prefix in plugin_locations(directories):
+        for _, module_name, _ in pkgutil.iter_modules([directory], prefix):
+            if module_name in _loaded_plugins:
+                logger.debug("Skipping already loaded plugin: %s", module_name)
+                continue
+            if module_name[len(prefix):] in isolated:
+                register_isolated(module_name, scan_directory(directory).get(module_name[len(prefix):]) or [])
+                continue
+
+            try:
+                importlib.import_module(module_name)
+                _loaded_plugins.add(module_name)
+                logger.info("Successfully loaded plugin: %s", module_name)
+            except ImportError as e:
+                logger.error("Failed to import %s: %s", module_name, e)
+
+def declared_operations(source_path):
+    """
+    Returns the operation names a plugin module declares, by parsing (not importing) its source.
+
+    A class counts as an operation when it derives from `Operation` (under any
+    alias, or as `module.Operation`) or from another operation class declared
+    in the same module. When a class derives from something else the module
+    imports (e.g. `from operations.add import Add; class CheckedAdd(Add)`),
+    parsing cannot tell, and None is returned: the module has to be imported
+    to find its operations.
+    """
+    with open(source_path, encoding="utf-8") as source:
+        tree = ast.parse(source.read(), filename=source_path)
+
+    operation_classes = {"Operation"}
+    imported, star_import = set(), False  # names bound by imports (other than `Operation` itself)
+    for node in ast.walk(tree):
+        if isinstance(node, ast.ImportFrom):
+            for alias in node.names:
+                if alias.name == "*":
+                    star_import = True
+                elif node.module == "operation_base" and not node.level and alias.name == "Operation":
+                    operation_classes.add(alias.asname or alias.name)
+                elif node.module != "operation_base" or node.level:
+                    imported.add(alias.asname or alias.name)
+        elif isinstance(node, ast.Import):
+            imported.update((alias.asname or alias.name).partition(".")[0] for alias in node.names)
+
+    local_classes = {node.name for node in ast.walk(tree) if isinstance(node, ast.ClassDef)}
+    names = []
+    for node in ast.walk(tree):
+        if not isinstance(node, ast.ClassDef):
+            continue
+        is_operation = False
+        for base in node.bases:
+            if isinstance(base, ast.Name) and base.id in operation_classes:
+                is_operation = True
+            elif isinstance(base, ast.Attribute) and base.attr == "Operation":
+                is_operation = True
+            elif (isinstance(base, ast.Name) and base.id not in imported
+                  and (base.id in local_classes or (not star_import and hasattr(builtins, base.id)))):
+                continue  # a plain local or builtin base, e.g. a helper mixin or `object`
+            else:
+                return None  # ✅ An imported, aliased or computed base may be an operation class
+        if is_operation:
+            operation_classes.add(node.name)
+            names.append(node.name.lower())
+    return names
+
+def _manifest_path(directory):
+    """Location of a plugin directory's discovery cache."""
+    return os.path.join(directory, "__pycache__", MANIFEST_NAME)
+
+def _read_manifest(directory):
+    """Loads a directory's discovery cache, or an empty one if it is missing or stale."""
+    try:
+        with open(_manifest_path(directory), encoding="utf-8") as source:
+            manifest = json.load(source)
+        if manifest.get("version") == MANIFEST_VERSION:
+            return manifest
+    except (OSError, ValueError):
+        pass
+    return {"version": MANIFEST_VERSION, "directory_mtime_ns": None, "modules": {}}
+
+def _write_manifest(directory, manifest):
+    """Atomically replaces a directory's discovery cache (best effort)."""
+    path = _manifest_path(directory)
+    try:
+        with open(f"{path}.tmp", "w", encoding="utf-8") as target:
+            json.dump(manifest, target)
+        os.replace(f"{path}.tmp", path)
+    except OSError as e:
+        logger.debug("Could not write plugin manifest %s: %s", path, e)
+
+def _list_plugin_sources(directory):
+    """Returns `{module_name: source_path}` for plugin modules and packages in a directory."""
+    sources = {}
+    for entry in os.scandir(directory):
+        if entry.is_file() and entry.name.endswith(".py") and entry.name != "__init__.py":
+            sources[entry.name[:-3]] = entry.name
+        elif entry.is_dir() and os.path.isfile(os.path.join(entry.path, "__init__.py")):
+            sources[entry.name] = os.path.join(entry.name, "__init__.py")
+    return sources
+
+def scan_directory(directory):
+    """
+    Returns `{module_name: [operation names]}` for a plugin directory, using its discovery cache.
+
+    When the directory itself is unchanged the listing is skipped entirely and
+    only the known files are stat'ed; just the files whose mtime or size
+    changed are parsed again. The cache is rewritten only when something changed.
+    """
+    manifest = _read_manifest(directory)
+    cached = manifest["modules"]
+    try:  # create the cache folder first so it does not itself change the directory mtime
+        os.makedirs(os.path.dirname(_manifest_path(directory)), exist_ok=True)
+    except OSError:
+        pass
+    directory_mtime_ns = os.stat(directory).st_mtime_ns
+
+    if directory_mtime_ns == manifest["directory_mtime_ns"]:
+        sources = {module: entry["source"] for module, entry in cached.items()}
+    else:
+        sources = _list_plugin_sources(directory)
+
+    modules, changed = {}, directory_mtime_ns != manifest["directory_mtime_ns"]
+    for module, source in sources.items():
+        path = os.path.join(directory, source)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            changed = True
+            continue
+
+        entry = cached.get(module)
+        if entry and entry["source"] == source and entry["mtime_ns"] == stat.st_mtime_ns and entry["size"] == stat.st_size:
+            modules[module] = entry
             continue
 
         try:
-            importlib.import_module(module_name)
-            _loaded_plugins.add(module_name)
-            logger.info("Successfully loaded plugin: %s", module_name)
-        except ImportError as e:
-            logger.error("Failed to import %s: %s", module_name, e)
+            operations = declared_operations(path)
+        except (OSError, SyntaxError, UnicodeDecodeError) as e:
+            logger.error("Failed to inspect %s: %s", path, e)
+            operations = []
+        modules[module] = {"source": source, "mtime_ns": stat.st_mtime_ns, "size": stat.st_size,
+                           "operations": operations}
+        changed = True
+
+    if changed:
+        _write_manifest(directory, {"version": MANIFEST_VERSION, "directory_mtime_ns": directory_mtime_ns,
+                                    "modules": modules})
+    return {module: entry["operations"] for module, entry in modules.items()}
+
+def discover_plugins(directories=None):
+    """
+    Records every operation in the configured plugin directories without importing them.
+
+    Each operation is registered lazily in `Operation.registry`; its module is
+    imported the first time the operation is looked up. Modules whose
+    operations cannot be found by parsing (see `declared_operations`) are
+    imported right away instead.
+    """
+    from operation_base import Operation  # ✅ Prevents circular imports
+
+    isolated = isolated_modules()
+    for directory, prefix in plugin_locations(directories):
+        if not os.path.isdir(directory):
+            logger.error("Plugin directory not found: %s", directory)
+            continue
+
+        for module, names in sorted(scan_directory(directory).items()):
+            module_name = prefix + module
+            if module_name in _loaded_plugins:
+                continue
+            if module in isolated:
+                if names is None:
+                    logger.error("Cannot find the operations of isolated plugin %s without importing it", module_name)
+                register_isolated(module_name, names or [])
+                continue
+            if names is None:
+                logger.debug("Plugin %s derives from imported classes; importing it now", module_name)
+                try:
+                    load_plugin(module_name)
+                except ImportError:
+                    pass  # already logged
+                continue
+            for name in names:
+                Operation.registry.add_lazy(name, module_name)
+            logger.debug("Discovered plugin %s: %s", module_name, ", ".join(names) or "no operations")
 
 def load_plugin(plugin_name):
     """Loads a plugin by name and raises ImportError if it fails."""
@@ -32,6 +269,7 @@ def load_plugin(plugin_name):
 
         # Call import_module to dynamically import the plugin
         module = importlib.import_module(plugin_name)
+        _loaded_plugins.add(plugin_name)
 
         logger.info("Successfully loaded plugin: %s", plugin_name)
         return module
@@ -40,6 +278,165 @@ def load_plugin(plugin_name):
         logger.error("Failed to load plugin: %s - %s", plugin_name, e)
         raise
 
+def reload_plugin(module_name):
+    """
+    Imports the current source of an already imported plugin and swaps in its operations.
+
+    The new version runs as a fresh module object whose operations are
+    collected aside (see `staged_registrations`); only when the whole module
+    imported cleanly are they swapped into the registry in one update, and
+    operations it no longer declares are dropped. Calls already running keep
+    the class and module globals they started with, so they finish on the old
+    version. If the import fails, the old version stays in place.
+
+    Returns:
+        list[str]: The operation names the module now provides.
+
+    Raises:
+        ImportError: If the new version fails to import or declares an operation another plugin provides.
+    """
+    import importlib.util  # pylint: disable=import-outside-toplevel
+    import expression  # pylint: disable=import-outside-toplevel
+    from operation_base import Operation, staged_registrations  # ✅ Prevents circular imports
+
+    with _reload_lock:
+        try:
+            spec = importlib.util.find_spec(module_name)
+            if spec is None:
+                raise ImportError(f"No module named '{module_name}'")
+            module = importlib.util.module_from_spec(spec)
+            # Compiled from source, since a bytecode cache written in the same second could look current.
+            code = compile(spec.loader.get_source(module_name), spec.origin, "exec")
+            with staged_registrations() as operations:
+                exec(code, module.__dict__)  # pylint: disable=exec-used
+        except Exception as e:  # pylint: disable=broad-except
+            logger.error("Failed to reload plugin %s (keeping the loaded version): %s", module_name, e)
+            raise ImportError(f"Failed to reload plugin {module_name}: {e}") from e
+
+        registry = Operation.registry
+        for name in operations:
+            provider = registry.provider(name)
+            if provider not in (None, module_name):
+                logger.error("Failed to reload plugin %s: operation '%s' is provided by %s", module_name, name, provider)
+                raise ImportError(f"Operation '{name}' is already provided by {provider}")
+
+        sys.modules[module_name] = module
+        registry.swap(operations, [name for name in registry.provided_by(module_name) if name not in operations])
+        _loaded_plugins.add(module_name)
+    expression.compile_expression.cache_clear()  # ✅ Cached plans hold the old classes' methods
+    logger.info("Reloaded plugin %s: %s", module_name, ", ".join(operations) or "no operations")
+    return list(operations)
+
+def update_plugin(module_name, names):
+    """
+    Brings the registry up to date with a plugin module that changed on disk.
+
+    Args:
+        module_name (str): The module (with its package prefix, if any).
+        names (list[str] | None): The operations its source now declares, or None if it was deleted.
+
+    Imported modules are reloaded with `reload_plugin`; modules not imported
+    yet only have their lazy entries updated; isolated modules get new
+    stand-ins and their workers are retired. Any change also retires the
+    parallel reduction pool, whose workers loaded the plugins at startup.
+    """
+    from operation_base import Operation  # ✅ Prevents circular imports
+
+    registry = Operation.registry
+    if names is None:
+        registry.swap({}, registry.provided_by(module_name))
+        sys.modules.pop(module_name, None)
+        _loaded_plugins.discard(module_name)
+        logger.info("Removed plugin %s", module_name)
+    elif module_name.rpartition(".")[2] in isolated_modules():
+        import isolation  # pylint: disable=import-outside-toplevel
+        registry.swap({name: isolation.IsolatedOperation(name, module_name) for name in names},
+                      [name for name in registry.provided_by(module_name) if name not in names])
+        isolation.get_pool().recycle()
+        logger.info("Isolated plugin %s changed: %s", module_name, ", ".join(names) or "no operations")
+    elif module_name in _loaded_plugins:
+        reload_plugin(module_name)
+    else:
+        registry.swap({}, [name for name in registry.provided_by(module_name) if name not in names])
+        for name in names:
+            registry.add_lazy(name, module_name)
+    if "parallel" in sys.modules:
+        sys.modules["parallel"].reset_pool()  # ✅ Reduction workers imported the plugins at startup
+
+class PluginWatcher:
+    """
+    Background thread that hot-reloads plugins changed on disk.
+
+    Every `interval` seconds it stats the plugin sources (a single-file plugin
+    or a package's `__init__.py`); a changed mtime or size, a new file or a
+    deleted one is applied with `update_plugin`, so nothing else is
+    re-imported and warm caches and history survive.
+    """
+
+    def __init__(self, directories=None, interval=1.0):
+        self.directories = directories
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="plugin-watcher", daemon=True)
+        self._seen = self._snapshot()
+
+    def _snapshot(self):
+        """Returns `{(directory, prefix): {module: (mtime_ns, size)}}` for every plugin source."""
+        snapshot = {}
+        for directory, prefix in plugin_locations(self.directories):
+            stats = snapshot[directory, prefix] = {}
+            if not os.path.isdir(directory):
+                continue
+            for module, source in _list_plugin_sources(directory).items():
+                try:
+                    stat = os.stat(os.path.join(directory, source))
+                except OSError:
+                    continue
+                stats[module] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+
+    def start(self):
+        """Starts watching; returns the watcher."""
+        self._thread.start()
+        return self
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.check()
+
+    def check(self):
+        """
+        Applies every change since the last check now.
+
+        Returns:
+            list[str]: The modules that changed, were added or were deleted.
+        """
+        snapshot, changed = self._snapshot(), []
+        for (directory, prefix), stats in snapshot.items():
+            seen = self._seen.get((directory, prefix), {})
+            modules = sorted(module for module in stats.keys() | seen.keys() if stats.get(module) != seen.get(module))
+            declared = scan_directory(directory) if any(module in stats for module in modules) else {}
+            for module in modules:
+                try:
+                    if module not in stats:
+                        update_plugin(prefix + module, None)
+                    elif declared.get(module, []) is None and module not in isolated_modules():
+                        # ✅ Operations only known after importing: (re)import it right away
+                        (reload_plugin if prefix + module in _loaded_plugins else load_plugin)(prefix + module)
+                    else:
+                        update_plugin(prefix + module, declared.get(module) or [])
+                except ImportError:
+                    continue  # already logged; retried when the file changes again
+                changed.append(prefix + module)
+        self._seen = snapshot
+        return changed
+
+    def stop(self):
+        """Stops the thread (idempotent)."""
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join()
+
 def main():
     """Only load plugins once to avoid duplicate logs."""
     if not _loaded_plugins:  # ✅ Ensures it only runs once
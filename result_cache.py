@@ -0,0 +1,105 @@
+"""Result Cache - bounded LRU memoization of calculation results"""
+
+import sys
+import threading
+from collections import OrderedDict
+from decimal import Decimal, getcontext
+
+# Approximate per-entry bookkeeping cost (OrderedDict node + key tuple) in bytes.
+_ENTRY_OVERHEAD = 200
+
+
+def context_key():
+    """Returns a hashable snapshot of the active Decimal context settings."""
+    ctx = getcontext()
+    return (ctx.prec, ctx.rounding, ctx.Emin, ctx.Emax, ctx.capitals, ctx.clamp,
+            tuple(ctx.traps.values()))
+
+
+class ResultCache:
+    """
+    LRU cache of `(operation, a, b, Decimal context) -> result`.
+
+    Entries are evicted least-recently-used first whenever either the entry
+    limit or the estimated memory limit is exceeded. Only `Decimal` operands
+    are cached, keyed by their exact text so `2` and `2.0` stay distinct, and
+    operations that set `cacheable = False` always run. For commutative
+    operations the operands are put in a canonical order, so `add 2 3` and
+    `add 3 2` share one entry.
+    """
+
+    def __init__(self, max_entries=1024, max_bytes=8 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.memory_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self):
+        """Whether the cache stores anything at all."""
+        return self.max_entries > 0 and self.max_bytes > 0
+
+    def execute(self, operation_class, a, b):
+        """
+        Returns the cached result for `operation_class.execute(a, b)`, computing it on a miss.
+
+        Exceptions raised by the operation propagate and are never cached.
+        """
+        if not (self.enabled and operation_class.cacheable
+                and a.__class__ is Decimal and b.__class__ is Decimal):
+            return operation_class.execute(a, b)
+
+        x, y = str(a), str(b)
+        if operation_class.commutative and y < x:
+            x, y = y, x
+        key = (operation_class, x, y, context_key())
+        with self._lock:
+            try:
+                result = self._entries[key][0]
+            except KeyError:
+                self.misses += 1
+            else:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return result
+
+        result = operation_class.execute(a, b)
+        size = sys.getsizeof(key[1]) + sys.getsizeof(key[2]) + sys.getsizeof(result) + _ENTRY_OVERHEAD
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = (result, size)
+                self.memory_bytes += size
+                self._evict()
+        return result
+
+    def _evict(self):
+        """Drops least-recently-used entries until both limits are respected."""
+        while self._entries and (len(self._entries) > self.max_entries or self.memory_bytes > self.max_bytes):
+            _, (_, size) = self._entries.popitem(last=False)
+            self.memory_bytes -= size
+            self.evictions += 1
+
+    def clear(self):
+        """Removes all entries and resets the statistics."""
+        with self._lock:
+            self._entries.clear()
+            self.memory_bytes = self.hits = self.misses = self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def hit_rate(self):
+        """Fraction of cacheable lookups served from the cache."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self):
+        """Returns a human-readable summary of cache effectiveness."""
+        return (f"Cache: {self.hits} hits, {self.misses} misses ({self.hit_rate:.1%} hit rate), "
+                f"{self.evictions} evictions, {len(self)}/{self.max_entries} entries, "
+                f"{self.memory_bytes / 1024:.1f}/{self.max_bytes / 1024:.0f} KiB used")
@@ -0,0 +1,347 @@
+"""Calculation Server - asyncio JSON-lines service over local TCP
+
+Each request is one JSON object on its own line; each response is one JSON
+object on its own line, in request order, echoing the request's `id`:
+
+    {"id": 1, "method": "calculate", "operation": "add", "a": "2", "b": "3"}
+    {"id": 1, "result": "5"}
+
+Methods: `calculate` (operation, a, b, optional backend), `batch` (operation
+name or list of names, a list, b list, optional backend), `reduce` (variadic
+operation, operands list, optional backend), `eval` (expression, optional
+variables), `history` and `clear`. Numbers may be JSON numbers or
+strings; results are strings so no precision is lost. Errors come back as
+`{"id": ..., "error": "..."}`.
+"""
+
+import asyncio
+import json
+import os
+import signal
+import socket
+import stat
+import sys
+from decimal import Decimal
+from app.config import Config
+from errors import CALCULATION_ERRORS, INVALID_NUMBER, describe_error
+from history import SessionHistory
+import numeric_backend
+from log_config import logger
+
+BUSY_ERROR = "Server busy, retry later."
+INTERNAL_ERROR = "Error: The request could not be processed."
+
+_TYPE_NAMES = {str: "a string", list: "a list", dict: "an object", int: "a number", Decimal: "a number"}
+
+
+def _field(request, name, types, optional=False):
+    """
+    Returns a request field after checking its JSON type.
+
+    Raises:
+        KeyError: If a required field is missing.
+        TypeError: If the field has the wrong type (`null` is allowed for optional fields).
+    """
+    value = request.get(name) if optional else request[name]
+    if value is None and optional:
+        return None
+    if not isinstance(value, types) or isinstance(value, bool):
+        names = dict.fromkeys(_TYPE_NAMES[kind] for kind in (types if isinstance(types, tuple) else (types,)))
+        expected = " or ".join(names)
+        raise TypeError(f"Field '{name}' must be {expected}.")
+    return value
+
+
+def _number(request, name):
+    """Returns a numeric field: a JSON number or a numeric string."""
+    return _field(request, name, (int, Decimal, str))
+
+
+def _outcome(result):
+    """Wraps a calculator result as a response body (error messages are plain strings, numbers exact text)."""
+    if isinstance(result, str):
+        return {"error": result}
+    return {"result": str(result)}
+
+
+def _remove_stale_socket(path):
+    """
+    Removes a socket file left behind by a daemon that is no longer running.
+
+    Raises:
+        OSError: If a daemon is still listening there, or the path is not a socket.
+    """
+    try:
+        mode = os.stat(path).st_mode
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(mode):
+        raise OSError(f"{path} exists and is not a socket")
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+        try:
+            probe.connect(path)
+        except ConnectionRefusedError:
+            os.unlink(path)
+            return
+    raise OSError(f"A calculation daemon is already listening on {path}")
+
+
+class CalculationServer:
+    """
+    Serves calculator requests to many clients from one event loop.
+
+    * Pipelining: a client may send any number of requests without waiting;
+      responses are written in request order. At most `pipeline_depth`
+      requests per connection are read ahead, after which the server stops
+      reading that socket (TCP backpressure).
+    * Concurrency: at most `max_concurrency` requests execute at once, each
+      in a worker thread so calculations never stall the event loop.
+    * Admission control: once `max_pending` requests are admitted across all
+      connections, new ones are answered immediately with a busy error
+      instead of being queued without bound.
+    * Sessions: every connection has its own `SessionHistory`.
+
+    Given a `path`, the server listens on that Unix domain socket (owner-only)
+    instead of TCP; this is how the resident daemon runs.
+    """
+
+    def __init__(self, host=None, port=None, max_concurrency=None, max_pending=None, pipeline_depth=None,
+                 calculator=None, path=None):
+        if calculator is None:
+            from calculator import CalculatorREPL as calculator  # pylint: disable=import-outside-toplevel
+        self.calculator = calculator
+        self.host = host or Config.SERVER_HOST
+        self.port = Config.SERVER_PORT if port is None else port
+        self.max_concurrency = max_concurrency or Config.SERVER_MAX_CONCURRENCY
+        self.max_pending = max_pending or Config.SERVER_MAX_PENDING
+        self.pipeline_depth = pipeline_depth or Config.SERVER_PIPELINE_DEPTH
+        self.path = path
+        self.pending = 0
+        self.rejected = 0
+        self._semaphore = None
+        self._server = None
+        self._connections = {}
+        self._methods = {
+            "calculate": self._calculate,
+            "batch": self._batch,
+            "reduce": self._reduce,
+            "eval": self._eval,
+            "history": self._history,
+            "clear": self._clear,
+        }
+
+    async def start(self):
+        """Starts listening and returns the bound `(host, port)`, or the socket path for a Unix socket."""
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        if self.path:
+            _remove_stale_socket(self.path)
+            previous_umask = os.umask(0o177)  # create the socket owner-only, with no window
+            try:
+                self._server = await asyncio.start_unix_server(self._handle_connection, self.path)
+            finally:
+                os.umask(previous_umask)
+            logger.info("Calculation daemon listening on %s", self.path)
+            return self.path
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.host, self.port = self._server.sockets[0].getsockname()[:2]
+        logger.info("Calculation server listening on %s:%s", self.host, self.port)
+        return self.host, self.port
+
+    async def serve_forever(self):
+        """Starts the server (if needed) and serves until cancelled."""
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self):
+        """Stops accepting connections, disconnects clients and waits for their handlers to finish."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            if self.path and os.path.exists(self.path):
+                os.unlink(self.path)
+        for writer in self._connections.values():
+            writer.close()
+        await asyncio.gather(*self._connections, return_exceptions=True)
+
+    async def _handle_connection(self, reader, writer):
+        """Reads pipelined requests and writes their responses in order."""
+        session = SessionHistory()
+        responses = asyncio.Queue(maxsize=self.pipeline_depth)
+        write_task = asyncio.create_task(self._write_responses(responses, writer))
+        self._connections[asyncio.current_task()] = writer
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if line.strip():
+                    await responses.put(self._admit(line, session))
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            await responses.put(None)
+            await write_task
+            del self._connections[asyncio.current_task()]
+
+    async def _write_responses(self, responses, writer):
+        """Writes each response as soon as it and everything before it are done."""
+        try:
+            while (response := await responses.get()) is not None:
+                if not isinstance(response, dict):
+                    response = await response
+                writer.write(json.dumps(response, default=str).encode() + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            while await responses.get() is not None:  # drain so the reader can finish
+                pass
+        finally:
+            writer.close()
+
+    def _admit(self, line, session):
+        """Returns an immediate response, or a task computing one if the request is admitted."""
+        try:
+            request = json.loads(line, parse_float=Decimal)
+            if not isinstance(request, dict):
+                raise ValueError("request must be an object")
+        except ValueError:
+            return {"id": None, "error": "Invalid JSON request."}
+
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            return {"id": request.get("id"), "error": BUSY_ERROR}
+        self.pending += 1
+        return asyncio.create_task(self._respond(request, session))
+
+    async def _respond(self, request, session):
+        """Executes one admitted request within the concurrency limit."""
+        try:
+            async with self._semaphore:
+                method = self._methods.get(request.get("method"))
+                if method is None:
+                    body = {"error": f"Unknown method '{request.get('method')}'."}
+                else:
+                    body = await method(request, session)
+        except KeyError as exc:
+            body = {"error": f"Missing field '{exc.args[0]}'."}
+        except (TypeError, ValueError) as exc:
+            body = {"error": f"Error: {exc}"}
+        except CALCULATION_ERRORS as exc:  # e.g. decimal.Overflow; one bad request must not end the connection
+            body = {"error": describe_error(exc)[0]}
+        except Exception:  # pylint: disable=broad-except  # ✅ Never lose the pipelined responses behind it
+            logger.exception("Request %r failed", request.get("id"))
+            body = {"error": INTERNAL_ERROR}
+        finally:
+            self.pending -= 1
+        return {"id": request.get("id"), **body}
+
+    async def _calculate(self, request, session):
+        operation = _field(request, "operation", str)
+        backend = numeric_backend.get_backend(_field(request, "backend", str, optional=True)
+                                              or self.calculator.backend)
+        try:
+            a, b = backend.convert(_number(request, "a")), backend.convert(_number(request, "b"))
+        except ValueError:
+            return {"error": INVALID_NUMBER}
+        return _outcome(await asyncio.to_thread(self.calculator.run_operation, operation, a, b,
+                                                backend=backend, history=session))
+
+    async def _batch(self, request, session):
+        operation = _field(request, "operation", (str, list))
+        if isinstance(operation, list) and not all(isinstance(name, str) for name in operation):
+            raise TypeError("Field 'operation' must be a string or a list of strings.")
+        results = await asyncio.to_thread(
+            self.calculator.run_batch, operation, _field(request, "a", list), _field(request, "b", list),
+            backend=_field(request, "backend", str, optional=True), history=session,
+        )
+        return {"results": [_outcome(result) for result in results]}
+
+    async def _reduce(self, request, session):
+        return _outcome(await asyncio.to_thread(
+            self.calculator.run_reduction, _field(request, "operation", str), _field(request, "operands", list),
+            backend=_field(request, "backend", str, optional=True), history=session,
+        ))
+
+    async def _eval(self, request, session):
+        return _outcome(await asyncio.to_thread(
+            self.calculator.evaluate_expression, _field(request, "expression", str),
+            _field(request, "variables", dict, optional=True), history=session,
+        ))
+
+    async def _history(self, request, session):  # pylint: disable=unused-argument
+        return {"result": [str(entry) for entry in session.get_entries()]}
+
+    async def _clear(self, request, session):  # pylint: disable=unused-argument
+        session.clear_history()
+        return {"result": "History cleared."}
+
+
+class CalculationClient:
+    """Minimal asyncio client for `CalculationServer` (used by tests and embedding code)."""
+
+    def __init__(self, reader, writer):
+        self._reader = reader
+        self._writer = writer
+        self._next_id = 0
+
+    @classmethod
+    async def connect(cls, host, port):
+        """Opens a connection to a running server."""
+        reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer)
+
+    def send(self, method, **params):
+        """Queues one request without waiting for its response; returns its id."""
+        self._next_id += 1
+        request = {"id": self._next_id, "method": method, **params}
+        self._writer.write(json.dumps(request, default=str).encode() + b"\n")
+        return self._next_id
+
+    async def receive(self):
+        """Reads the next response."""
+        line = await self._reader.readline()
+        if not line:
+            raise ConnectionError("Server closed the connection")
+        return json.loads(line)
+
+    async def call(self, method, **params):
+        """Sends one request and waits for its response."""
+        self.send(method, **params)
+        await self._writer.drain()
+        return await self.receive()
+
+    async def pipeline(self, requests):
+        """Sends `(method, params)` requests back to back, then reads all responses in order."""
+        for method, params in requests:
+            self.send(method, **params)
+        await self._writer.drain()
+        return [await self.receive() for _ in requests]
+
+    async def close(self):
+        """Closes the connection."""
+        self._writer.close()
+        await self._writer.wait_closed()
+
+
+def serve(host=None, port=None, calculator=None, path=None):
+    """Runs the server (on a Unix socket when `path` is given) in the foreground until interrupted."""
+    server = CalculationServer(host, port, calculator=calculator, path=path)
+
+    async def run():
+        address = await server.start()
+        if not path:
+            address = "{}:{}".format(*address)
+        print(f"Serving calculations on {address} (JSON lines, Ctrl+C to stop)", file=sys.stderr)
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
+        try:
+            await server.serve_forever()
+        except asyncio.CancelledError:
+            pass  # SIGTERM: shut down like Ctrl+C
+        finally:
+            await server.close()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
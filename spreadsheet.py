@@ -0,0 +1,231 @@
+"""Spreadsheet - named cells and formulas over registered operations, recomputed incrementally"""
+
+import heapq
+import re
+from decimal import Decimal, InvalidOperation
+from errors import CALCULATION_ERRORS, describe_error
+import expression
+from operation_base import Operation
+
+_NAME_PATTERN = re.compile(r"[A-Za-z_]\w*\Z")
+
+
+def _same(old, new):
+    """True when a recomputed value is indistinguishable from the stored one (digits and exponent included)."""
+    if old.__class__ is Decimal and new.__class__ is Decimal:
+        return old.compare_total(new) == 0
+    return old == new
+
+
+class Cell:
+    """
+    One named value: a number, `operation arg arg ...` or an infix expression.
+
+    `dependencies` are the names the formula reads; `value` is the last result
+    (Decimal) or the error message it produced (str). `level` ranks the cell
+    above everything it depends on.
+    """
+
+    __slots__ = ("name", "formula", "dependencies", "compute", "value", "level")
+
+    def __init__(self, name, formula, dependencies, compute):
+        self.name = name
+        self.formula = formula
+        self.dependencies = dependencies
+        self.compute = compute
+        self.value = None
+        self.level = 0
+
+    def __str__(self):
+        if self.dependencies or self.formula != str(self.value):
+            return f"{self.name} = {self.formula} -> {self.value}"
+        return f"{self.name} = {self.value}"
+
+
+def _term(token):
+    """Returns `(is_name, value)` for a formula argument, or None if it is neither a cell name nor a number."""
+    if _NAME_PATTERN.match(token):
+        return True, token
+    try:
+        return False, Decimal(token)
+    except InvalidOperation:
+        return None
+
+
+def _operation_formula(operation_name, terms):
+    """Compiles `operation arg arg ...` from `(is_name, value)` terms."""
+    if operation_name not in Operation.registry:
+        raise ValueError(f"Operation '{operation_name}' not found.")
+    dependencies = tuple(dict.fromkeys(value for is_name, value in terms if is_name))
+
+    def compute(values):
+        operation_class = Operation.registry[operation_name]  # resolved per run, so reloaded plugins apply
+        operands = [values[value] if is_name else value for is_name, value in terms]
+        if len(operands) == 2:
+            return operation_class.execute(*operands)
+        return operation_class.reduce(operands)
+
+    return dependencies, compute
+
+
+def compile_formula(text):
+    """
+    Compiles the right-hand side of `name = ...`: a number, `operation arg arg ...` or an infix expression.
+
+    Returns:
+        tuple: `(dependencies, compute)`, where `compute(values)` maps the
+        dependencies' values (a dict by name) to the result.
+
+    Raises:
+        ValueError: If the formula is malformed or names an unknown operation.
+        KeyError: If an infix operator's operation is not registered.
+    """
+    tokens = text.split()
+    terms = [_term(token) for token in tokens]
+    if len(tokens) == 1 and terms[0] is not None and not terms[0][0]:
+        constant = terms[0][1]
+        return (), lambda values: constant
+    if len(tokens) >= 3 and terms[0] is not None and terms[0][0] and None not in terms:
+        return _operation_formula(tokens[0], terms[1:])
+    plan = expression.compile_expression(text)
+    return plan.variables, lambda values: plan.evaluate({name: values[name] for name in plan.variables})
+
+
+class Sheet:
+    """
+    A dependency graph of named cells.
+
+    Every cell has a `level` above all of its dependencies. Assigning a cell
+    recomputes its dependents in level order, and only those with an input
+    whose value actually changed, so untouched parts of a large model are
+    served from their stored values and an update costs time proportional to
+    what it changes, not to the size of the sheet.
+    """
+
+    def __init__(self):
+        self._cells = {}
+        self._dependents = {}  # name -> {dependent: None}, an ordered set (names may not be defined yet)
+
+    def __contains__(self, name):
+        return name in self._cells
+
+    def __len__(self):
+        return len(self._cells)
+
+    def value(self, name):
+        """Returns a cell's current value (Decimal) or error message (str); KeyError if undefined."""
+        return self._cells[name].value
+
+    def cells(self):
+        """Returns all cells in definition order."""
+        return list(self._cells.values())
+
+    def assign(self, name, formula):
+        """
+        Defines or redefines `name` and recomputes everything that depends on it.
+
+        Args:
+            name (str): The cell name (an identifier).
+            formula (str): A number, `operation arg arg ...` or an infix expression over cell names.
+
+        Returns:
+            list[Cell]: The assigned cell followed by every cell recomputed, in update order.
+
+        Raises:
+            ValueError: If the name or formula is invalid, or the formula would create a circular reference.
+        """
+        if not _NAME_PATTERN.match(name):
+            raise ValueError(f"Invalid cell name '{name}'")
+        try:
+            dependencies, compute = compile_formula(formula)
+        except KeyError as exc:
+            raise ValueError(str(exc.args[0])) from None
+        if dependencies and self._reaches(name, dependencies):
+            raise ValueError(f"Circular reference: '{name}' would depend on itself")
+
+        cell = Cell(name, formula, dependencies, compute)
+        cell.level = 1 + max((self._cells[dependency].level for dependency in dependencies
+                              if dependency in self._cells), default=-1)
+        cell.value = self._evaluate(cell)
+        previous = self._cells.get(name)
+        if previous is not None:
+            for dependency in previous.dependencies:
+                self._dependents[dependency].pop(name, None)
+        for dependency in dependencies:
+            self._dependents.setdefault(dependency, {})[name] = None
+        self._cells[name] = cell
+        self._raise_levels(name)
+
+        if previous is not None and _same(previous.value, cell.value):
+            return [cell]
+        return [cell] + self._propagate(name)
+
+    def delete(self, name):
+        """Removes a cell; cells that used it now report it as undefined. Returns the recomputed cells."""
+        cell = self._cells.pop(name)
+        for dependency in cell.dependencies:
+            self._dependents[dependency].pop(name, None)
+        return self._propagate(name)
+
+    def _reaches(self, name, targets):
+        """Whether any of `targets` is `name` or depends on it, directly or indirectly."""
+        targets, stack, seen = set(targets), [name], {name}
+        while stack:
+            node = stack.pop()
+            if node in targets:
+                return True
+            for dependent in self._dependents.get(node, ()):
+                if dependent not in seen:
+                    seen.add(dependent)
+                    stack.append(dependent)
+        return False
+
+    def _raise_levels(self, name):
+        """Restores `dependent.level > cell.level` below `name`, touching only cells that violate it."""
+        stack = [self._cells[name]]
+        while stack:
+            cell = stack.pop()
+            for dependent in self._dependents.get(cell.name, ()):
+                dependent = self._cells.get(dependent)
+                if dependent is not None and dependent.level <= cell.level:
+                    dependent.level = cell.level + 1
+                    stack.append(dependent)
+
+    def _propagate(self, name):
+        """Recomputes, in level order, the dependents of a changed `name` that have a changed input."""
+        queue, queued, recomputed = [], set(), []
+
+        def enqueue(changed):
+            for dependent in self._dependents.get(changed, ()):
+                cell = self._cells.get(dependent)
+                if cell is not None and dependent not in queued:
+                    queued.add(dependent)
+                    heapq.heappush(queue, (cell.level, dependent))
+
+        enqueue(name)
+        while queue:
+            cell = self._cells[heapq.heappop(queue)[1]]
+            old, cell.value = cell.value, self._evaluate(cell)
+            recomputed.append(cell)
+            if not _same(old, cell.value):
+                enqueue(cell.name)
+        return recomputed
+
+    def _evaluate(self, cell):
+        """Computes a formula cell from its dependencies' stored values, returning errors as messages."""
+        values = {}
+        for dependency in cell.dependencies:
+            source = self._cells.get(dependency)
+            if source is None:
+                return f"Error: Undefined variable '{dependency}'"
+            if source.value.__class__ is str:
+                return f"Error: '{dependency}' has no value ({source.value})"
+            values[dependency] = source.value
+        try:
+            return cell.compute(values)
+        except KeyError as exc:
+            return f"Operation '{exc.args[0]}' not found."
+        except (TypeError, ValueError) as exc:  # e.g. a binary operation given three operands
+            return f"Error: {exc}"
+        except CALCULATION_ERRORS as exc:
+            return describe_error(exc)[0]
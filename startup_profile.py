@@ -0,0 +1,262 @@
+"""Startup Profiler - per-import and per-plugin timing/allocation report for cold starts"""
+
+import json
+import sys
+import time
+import tracemalloc
+
+
+class ImportRecord:
+    """Timing and allocation figures for one executed module."""
+
+    __slots__ = ("name", "kind", "inclusive", "self_time", "allocated", "self_allocated", "loads")
+
+    def __init__(self, name, kind="import"):
+        self.name = name
+        self.kind = kind
+        self.inclusive = 0.0
+        self.self_time = 0.0
+        self.allocated = 0
+        self.self_allocated = 0
+        self.loads = 0
+
+    def as_dict(self):
+        """Returns the record as JSON-friendly data (times in milliseconds)."""
+        return {
+            "name": self.name,
+            "kind": self.kind,
+            "self_ms": round(self.self_time * 1000, 3),
+            "inclusive_ms": round(self.inclusive * 1000, 3),
+            "self_allocated_bytes": self.self_allocated,
+            "allocated_bytes": self.allocated,
+            "loads": self.loads,
+        }
+
+
+class _ProfilingLoader:
+    """Wraps a module loader and reports each `exec_module` to the profiler."""
+
+    def __init__(self, loader, profiler):
+        self._loader = loader
+        self._profiler = profiler
+
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+    def create_module(self, spec):
+        """Delegates module creation to the wrapped loader."""
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        """Executes the module while timing it."""
+        spec = getattr(module, "__spec__", None)  # e.g. `_decimal` names itself `decimal`
+        with self._profiler.measure(spec.name if spec else module.__name__):
+            self._loader.exec_module(module)
+
+
+class StartupProfiler:
+    """
+    Meta-path hook that times every module executed after `install()`.
+
+    Self time/allocations exclude nested imports; inclusive figures include
+    them. Allocations come from `tracemalloc`, whose overhead is included in
+    the reported times, so compare profiles with each other rather than with
+    unprofiled runs.
+    """
+
+    def __init__(self):
+        self.records = {}
+        self.calls = {}
+        self._stack = []
+        self.started = time.perf_counter()
+        self.finished = None
+
+    # -- meta path finder protocol -------------------------------------------------
+    def find_spec(self, fullname, path=None, target=None):
+        """Finds the spec with the remaining finders and wraps its loader."""
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                    spec.loader = _ProfilingLoader(spec.loader, self)
+                return spec
+        return None
+
+    def invalidate_caches(self):
+        """Nothing cached here; required by the finder protocol."""
+
+    # -- measurement ---------------------------------------------------------------
+    def measure(self, name, kind="import"):
+        """Context manager that records one load of `name`."""
+        return _Measurement(self, name, kind)
+
+    def wrap(self, module, function_name):
+        """Counts and times calls to `module.function_name` (used for plugin loader entry points)."""
+        function = getattr(module, function_name)
+        qualified = f"{module.__name__}.{function_name}"
+
+        def counted(*args, **kwargs):
+            self.calls[qualified] = self.calls.get(qualified, 0) + 1
+            with self.measure(qualified, "call"):
+                return function(*args, **kwargs)
+
+        counted.__wrapped__ = function
+        setattr(module, function_name, counted)
+
+    def _enter(self, name, kind):
+        record = self.records.get(name)
+        if record is None:
+            record = self.records[name] = ImportRecord(name, kind)
+        self._stack.append([record, time.perf_counter(), tracemalloc.get_traced_memory()[0], 0.0, 0])
+
+    def _exit(self):
+        record, start, start_memory, child_time, child_memory = self._stack.pop()
+        elapsed = time.perf_counter() - start
+        allocated = max(0, tracemalloc.get_traced_memory()[0] - start_memory)
+        record.loads += 1
+        record.inclusive += elapsed
+        record.self_time += elapsed - child_time
+        record.allocated += allocated
+        record.self_allocated += max(0, allocated - child_memory)
+        if self._stack:
+            self._stack[-1][3] += elapsed
+            self._stack[-1][4] += allocated
+        if record.name == "plugin_loader" and record.loads == 1:
+            self._instrument_plugin_loader()
+
+    def _instrument_plugin_loader(self):
+        """Wraps plugin loader entry points as soon as the module exists, before anyone imports names from it."""
+        module = sys.modules.get("plugin_loader")
+        if module is None:
+            return
+        for function_name in ("load_plugins", "discover_plugins", "load_plugin"):
+            self.wrap(module, function_name)
+
+    # -- reporting -----------------------------------------------------------------
+    def duplicates(self):
+        """Returns human-readable descriptions of repeated loads."""
+        found = [f"module {record.name} executed {record.loads} times"
+                 for record in self.records.values() if record.kind != "call" and record.loads > 1]
+        for qualified in ("plugin_loader.load_plugins", "plugin_loader.discover_plugins"):
+            if self.calls.get(qualified, 0) > 1:
+                found.append(f"{qualified}() called {self.calls[qualified]} times")
+        return found
+
+    def report(self):
+        """Returns the profile as JSON-friendly data, records sorted by self time."""
+        total = (self.finished or time.perf_counter()) - self.started
+        records = sorted(self.records.values(), key=lambda record: record.self_time, reverse=True)
+        return {
+            "total_ms": round(total * 1000, 3),
+            "records": [record.as_dict() for record in records],
+            "calls": dict(self.calls),
+            "duplicates": self.duplicates(),
+        }
+
+    def format_report(self, limit=25):
+        """Returns the profile as a sorted text table."""
+        report = self.report()
+        lines = [f"Startup profile: {report['total_ms']:.1f} ms total",
+                 f"{'self ms':>9} {'incl ms':>9} {'self KiB':>9} {'loads':>5}  {'kind':<7} name"]
+        for record in report["records"][:limit]:
+            lines.append(f"{record['self_ms']:>9.2f} {record['inclusive_ms']:>9.2f} "
+                         f"{record['self_allocated_bytes'] / 1024:>9.1f} {record['loads']:>5}  "
+                         f"{record['kind']:<7} {record['name']}")
+        if len(report["records"]) > limit:
+            lines.append(f"... {len(report['records']) - limit} more (use JSON output for the full list)")
+        lines.append("Duplicate loads: " + ("; ".join(report["duplicates"]) or "none"))
+        return "\n".join(lines)
+
+
+class _Measurement:
+    """Context manager pairing `_enter`/`_exit` on a profiler."""
+
+    __slots__ = ("profiler", "name", "kind")
+
+    def __init__(self, profiler, name, kind):
+        self.profiler = profiler
+        self.name = name
+        self.kind = kind
+
+    def __enter__(self):
+        self.profiler._enter(self.name, self.kind)  # pylint: disable=protected-access
+
+    def __exit__(self, *exc_info):
+        self.profiler._exit()  # pylint: disable=protected-access
+        return False
+
+
+_active = None
+
+
+def install():
+    """Starts profiling subsequent imports (idempotent) and returns the profiler."""
+    global _active  # pylint: disable=global-statement
+    if _active is None:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        _active = StartupProfiler()
+        sys.meta_path.insert(0, _active)
+        if "plugin_loader" in sys.modules:
+            _active._instrument_plugin_loader()  # pylint: disable=protected-access
+    return _active
+
+
+def uninstall():
+    """Stops profiling and returns the profiler (or None if it was not installed)."""
+    global _active  # pylint: disable=global-statement
+    profiler, _active = _active, None
+    if profiler is not None:
+        sys.meta_path.remove(profiler)
+        profiler.finished = time.perf_counter()
+        tracemalloc.stop()
+    return profiler
+
+
+def profile_plugins(profiler):
+    """Imports every discovered plugin not loaded yet and marks plugin modules in the report."""
+    from operation_base import Operation  # pylint: disable=import-outside-toplevel
+    import plugin_loader  # pylint: disable=import-outside-toplevel
+
+    plugins = {}
+    for directory, prefix in plugin_loader.plugin_locations():
+        for module, names in plugin_loader.scan_directory(directory).items():
+            if names or names is None:  # None: operations only known after importing it
+                plugins[prefix + module] = names
+
+    for module_name, names in sorted(plugins.items()):
+        if module_name not in sys.modules:
+            try:
+                if names:
+                    Operation.registry.get(names[0])
+                else:
+                    plugin_loader.load_plugin(module_name)
+            except ImportError:
+                pass  # already logged by the plugin loader
+        if module_name in profiler.records:
+            profiler.records[module_name].kind = "plugin"
+
+
+def finish(output="-", stream=None):
+    """
+    Profiles plugin loading, stops the profiler and emits the report.
+
+    Args:
+        output (str): `-` prints a sorted text report; anything else is a JSON file path.
+        stream: Text stream for the text report (defaults to `sys.stdout`).
+
+    Returns:
+        dict: The report data.
+    """
+    profiler = install()
+    profile_plugins(profiler)
+    uninstall()
+    report = profiler.report()
+    if output == "-":
+        (stream or sys.stdout).write(profiler.format_report() + "\n")
+    else:
+        with open(output, "w", encoding="utf-8") as target:
+            json.dump(report, target, indent=2)
+    return report
@@ -0,0 +1,134 @@
+"""Streaming Pipe Mode - evaluates `<operation> <a> <b>` lines from a file or stdin"""
+
+import sys
+import time
+from decimal import Decimal
+from errors import CALCULATION_ERRORS, describe_error
+from metrics import Metrics, NOT_FOUND
+from operation_base import Operation
+
+
+class StreamStats:
+    """Summary of a finished stream run."""
+
+    __slots__ = ("lines", "errors", "seconds")
+
+    def __init__(self, lines=0, errors=0, seconds=0.0):
+        self.lines = lines
+        self.errors = errors
+        self.seconds = seconds
+
+    @property
+    def lines_per_second(self):
+        """Throughput of the run (0 when nothing was timed)."""
+        return self.lines / self.seconds if self.seconds else 0.0
+
+    def __str__(self):
+        return (f"Processed {self.lines} lines ({self.errors} errors) "
+                f"in {self.seconds:.3f}s ({self.lines_per_second:,.0f} lines/sec)")
+
+
+def parse_lines(lines, first_line=1):
+    """
+    Splits raw lines into `(line_number, parts)` pairs.
+
+    Blank lines and lines starting with `#` are skipped but keep their line numbers.
+    """
+    for line_number, line in enumerate(lines, first_line):
+        parts = line.split()
+        if parts and not parts[0].startswith("#"):
+            yield line_number, parts
+
+
+def evaluate_lines(parsed):
+    """
+    Evaluates parsed lines, yielding `(line_number, result, error)` triples.
+
+    Exactly one of `result` and `error` is set. Operations are resolved once
+    per distinct name, and results are not recorded in `History` so memory
+    stays constant regardless of input size. Each evaluated line is counted
+    in `Metrics` like a REPL calculation.
+    """
+    resolved = {}
+    metrics_enabled = Metrics.enabled
+    for line_number, parts in parsed:
+        if len(parts) != 3:
+            yield line_number, None, "Error: Invalid format! Use: <operation> <number1> <number2>"
+            continue
+
+        operation_name, a, b = parts
+        try:
+            operation_class = resolved[operation_name]
+        except KeyError:
+            operation_class = Operation.registry.get(operation_name.lower())
+            resolved[operation_name] = operation_class
+
+        if operation_class is None:
+            if metrics_enabled:
+                Metrics.observe(operation_name.lower(), 0, NOT_FOUND)
+            yield line_number, None, f"Operation '{operation_name}' not found."
+            continue
+
+        started = time.perf_counter_ns() if metrics_enabled else 0
+        result = error = kind = None
+        try:
+            result = operation_class.execute(Decimal(a), Decimal(b))
+        except CALCULATION_ERRORS as exc:  # e.g. an isolated plugin's timeout: report it, keep streaming
+            error, kind = describe_error(exc)
+        if started:
+            Metrics.observe(operation_name.lower(), time.perf_counter_ns() - started, kind)
+        yield line_number, result, error
+
+
+def run_stream(lines, out=None, err=None, first_line=1, buffer_lines=4096):
+    """
+    Evaluates every line in `lines` and writes one result per valid line to `out`.
+
+    Errors are reported to `err` as `Line <n>: <message>` without stopping the stream.
+    Output is written in blocks of `buffer_lines` results.
+
+    Args:
+        lines (Iterable[str]): Input lines (a file object, `sys.stdin`, a list...).
+        out: Text stream for results (defaults to `sys.stdout`).
+        err: Text stream for error reports (defaults to `sys.stderr`).
+        first_line (int): Line number of the first input line.
+        buffer_lines (int): Number of results to buffer before each write.
+
+    Returns:
+        StreamStats: Evaluated line and error counts plus elapsed time.
+    """
+    out = out or sys.stdout
+    err = err or sys.stderr
+    stats = StreamStats()
+    buffer = []
+    start = time.perf_counter()
+
+    for line_number, result, error in evaluate_lines(parse_lines(lines, first_line)):
+        stats.lines += 1
+        if error is None:
+            buffer.append(f"{result}\n")
+            if len(buffer) >= buffer_lines:
+                out.write("".join(buffer))
+                buffer.clear()
+        else:
+            stats.errors += 1
+            err.write(f"Line {line_number}: {error}\n")
+
+    if buffer:
+        out.write("".join(buffer))
+    out.flush()
+
+    stats.seconds = time.perf_counter() - start
+    return stats
+
+
+def stream_file(path, out=None, err=None):
+    """Runs `run_stream` over a file path, or stdin when `path` is `-`, and reports throughput."""
+    err = err or sys.stderr
+    if path == "-":
+        stats = run_stream(sys.stdin, out, err)
+    else:
+        with open(path, encoding="utf-8") as source:
+            stats = run_stream(source, out, err)
+    err.write(f"{stats}\n")
+    return stats
@@ -0,0 +1,61 @@
+"""Tests for the benchmark suite's result handling (`benchmarks/suite.py`)."""
+
+import json
+from unittest.mock import patch
+import pytest
+from benchmarks import suite
+
+
+pytestmark = pytest.mark.usefixtures("register_operations")
+
+
+def test_compare_flags_only_slowdowns_past_threshold():
+    """Speedups and small slowdowns pass; results missing from the baseline are skipped."""
+    baseline = {"results": {"fast": 100.0, "slow": 100.0, "same": 100.0}}
+    current = {"results": {"fast": 50.0, "slow": 125.0, "same": 105.0, "new": 1.0}}
+    rows, regressions = suite.compare(current, baseline, threshold=0.10)
+    assert [row[0] for row in rows] == ["fast", "slow", "same"]
+    assert rows[1][3] == pytest.approx(0.25)
+    assert regressions == ["slow"]
+
+
+def test_run_produces_per_call_results():
+    """Each group reports nanoseconds per call under dotted names."""
+    results = suite.run(["operations", "repl"], scale=0.001)
+    assert results["version"] == suite.RESULTS_VERSION
+    assert set(results["results"]) == {
+        "operations.add.execute", "operations.divide.execute", "operations.multiply.execute",
+        "operations.subtract.execute", "repl.parse_calculation", "repl.parse_calculation.invalid",
+    }
+    assert all(value > 0 for value in results["results"].values())
+
+
+def test_plugin_startup_is_timed_in_fresh_interpreters():
+    """Cold and warm discovery are separate interpreters, so the warm one reads the manifest from disk."""
+    with patch.object(suite, "_plugin_startup", side_effect=[0.03, 0.02, 0.01]) as startup:
+        results = suite.bench_plugin_loading(scale=0.2)
+    assert [call.args[0] for call in startup.call_args_list] == ["load", "discover.cold", "discover.warm"]
+    assert results == {
+        "plugins.load_plugins": pytest.approx(3e7),
+        "plugins.discover_plugins.cold": pytest.approx(2e7),
+        "plugins.discover_plugins.warm": pytest.approx(1e7),
+    }
+    assert suite._plugin_startup("discover.warm") > 0  # pylint: disable=protected-access
+
+
+def test_main_saves_baseline_and_detects_regressions(tmp_path, monkeypatch, capsys):
+    """A saved baseline is compared on later runs; a regression makes the exit status 1."""
+    baseline = tmp_path / "baseline.json"
+    arguments = ["--group", "repl", "--scale", "0.001", "--baseline", str(baseline)]
+    assert suite.main(arguments + ["--save-baseline"]) == 0
+    saved = json.loads(baseline.read_text())
+
+    faster = {name: value / 10 for name, value in saved["results"].items()}
+    baseline.write_text(json.dumps({**saved, "results": faster}))
+    output = tmp_path / "results.json"
+    assert suite.main(arguments + ["--threshold", "0.5", "--output", str(output)]) == 1
+    assert "Regressions over 50%" in capsys.readouterr().out
+    assert set(json.loads(output.read_text())["results"]) == set(saved["results"])
+
+    monkeypatch.setattr(suite, "compare", lambda *args: ([], []))
+    assert suite.main(arguments) == 0
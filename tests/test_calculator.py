@@ -1,12 +1,22 @@
 """Tests for the Calculator REPL system."""
 
 from decimal import Decimal
+from fractions import Fraction
 import sys
 import subprocess
 import pytest
 from unittest.mock import patch
+import calculator
 from calculator import CalculatorREPL
+import expression
+from errors import LimitExceeded
 from history import History
+import numeric_backend
+from numeric_backend import FixedPoint
+import spreadsheet
+from operations.add import Add
+from operations.divide import Divide
+from operations.multiply import Multiply
 from operation_base import Operation
 
 
@@ -151,3 +161,235 @@ def test_main_entrypoint():
 
     assert "== Welcome to REPL Calculator ==" in stdout, "REPL did not start correctly!"
     assert process.returncode == 0, f"Calculator script exited with error: {stderr}"
+
+
+def test_run_batch_single_operation():
+    """Tests batch evaluation of one operation over many operand pairs."""
+    results = CalculatorREPL.run_batch("add", [Decimal("1"), Decimal("2")], [Decimal("3"), Decimal("4")])
+    assert results == [Decimal("4"), Decimal("6")]
+    assert History.get_history() == "add 1 3 = 4\nadd 2 4 = 6"
+
+
+def test_run_batch_mixed_operations_and_errors():
+    """Tests batch results stay in input order and errors are reported per item."""
+    results = CalculatorREPL.run_batch(
+        ["add", "divide", "unknown", "ADD", "add"],
+        [Decimal("1"), Decimal("5"), Decimal("1"), 2, "x"],
+        [Decimal("2"), Decimal("0"), Decimal("1"), "3", Decimal("1")],
+    )
+    assert results == [
+        Decimal("3"),
+        "Error: Division by zero is not allowed.",
+        "Operation 'unknown' not found.",
+        Decimal("5"),
+        "Error: Invalid number format! Ensure you're using numeric values.",
+    ]
+    assert History.get_history() == "add 1 2 = 3\nADD 2 3 = 5"
+
+
+def test_run_batch_overflow_is_a_row_error(monkeypatch):
+    """A row that overflows the Decimal context is reported in place; the other rows still run."""
+    monkeypatch.setitem(Operation.registry, "multiply", Multiply)
+    results = CalculatorREPL.run_batch("multiply", [Decimal("1e999999"), Decimal("2")], [Decimal("10"), Decimal("3")])
+    assert results == ["Error: Numeric overflow! The result is out of range.", Decimal("6")]
+    assert History.get_history() == "multiply 2 3 = 6"
+
+
+def test_run_batch_length_mismatch():
+    """Tests that sequences of different lengths are rejected."""
+    with pytest.raises(ValueError):
+        CalculatorREPL.run_batch(["add", "add"], [Decimal("1")], [Decimal("2")])
+    with pytest.raises(ValueError):
+        CalculatorREPL.run_batch("add", [1, 2, 3], [1])
+    with pytest.raises(ValueError):
+        CalculatorREPL.run_batch("add", [1.0] * 100, [1.0] * 99, backend="float")
+
+
+def test_evaluate_expression_records_single_entry():
+    """An expression produces one result and one history entry."""
+    expression.compile_expression.cache_clear()
+    assert CalculatorREPL.evaluate_expression("(a + 2) / b", {"a": Decimal("4"), "b": Decimal("3")}) == Decimal("2")
+    assert History.get_history() == "(a + 2) / b with a=4, b=3 = 2"
+
+
+@pytest.mark.parametrize("text, message", [
+    ("1 / 0", "Error: Division by zero is not allowed."),
+    ("2 * 3", "Operation 'multiply' not found in registry."),
+    ("1 +", "Error: Invalid expression: unexpected end of input"),
+    ("x + 1", "Error: Undefined variable 'x'"),
+])
+def test_evaluate_expression_errors(text, message):
+    """Expression errors are returned as messages, like `run_operation`."""
+    expression.compile_expression.cache_clear()
+    assert CalculatorREPL.evaluate_expression(text) == message
+    assert History.get_history() == "No calculations yet."
+
+
+def test_evaluate_expression_reports_isolation_limits(monkeypatch):
+    """A limit hit by an isolated operation inside an expression is an error message, not an exception."""
+    def stall(text, variables):
+        raise LimitExceeded("Operation 'stall' crashed its worker process")
+
+    monkeypatch.setattr(expression, "evaluate", stall)
+    assert CalculatorREPL.evaluate_expression("1 + 2") == "Error: Operation 'stall' crashed its worker process"
+
+
+def test_repl_eval_command():
+    """The `eval` command evaluates an infix expression."""
+    expression.compile_expression.cache_clear()
+    with patch("builtins.input", side_effect=["eval (1 + 2) / 3", "exit"]), patch("builtins.print") as mock_print:
+        CalculatorREPL.repl()
+
+    mock_print.assert_any_call("Result: 1")
+
+
+def test_repl_eval_overflow_keeps_the_session(monkeypatch):
+    """An expression that overflows the Decimal context is reported and the REPL carries on."""
+    expression.compile_expression.cache_clear()
+    monkeypatch.setitem(Operation.registry, "multiply", Multiply)
+    with patch("builtins.input", side_effect=["eval 1e999999 * 10", "eval 2 * 3", "exit"]), \
+            patch("builtins.print") as mock_print:
+        CalculatorREPL.repl()
+
+    mock_print.assert_any_call("Result: Error: Numeric overflow! The result is out of range.")
+    mock_print.assert_any_call("Result: 6")
+
+
+def test_run_operation_uses_result_cache():
+    """Repeated calculations are memoized but still recorded in history."""
+    CalculatorREPL.result_cache.clear()
+    CalculatorREPL.run_operation("divide", Decimal("1"), Decimal("4"))
+    CalculatorREPL.run_operation("divide", Decimal("1"), Decimal("4"))
+    assert CalculatorREPL.result_cache.hits == 1
+    assert History.get_history() == "divide 1 4 = 0.25\ndivide 1 4 = 0.25"
+
+
+def test_repl_cache_command():
+    """The 'cache' command prints cache statistics."""
+    CalculatorREPL.result_cache.clear()
+    with patch("builtins.input", side_effect=["cache", "exit"]), patch("builtins.print") as mock_print:
+        CalculatorREPL.repl()
+
+    printed_output = [call.args[0] for call in mock_print.call_args_list]
+    assert any(str(line).startswith("Cache: 0 hits") for line in printed_output)
+
+
+@pytest.mark.parametrize("backend, expected", [
+    ("float", 0.5),
+    ("fraction", Fraction(1, 2)),
+    ("fixed", FixedPoint(50, 2)),
+])
+def test_run_operation_per_call_backend(backend, expected):
+    """A per-call backend converts the operands and returns its own number type."""
+    assert CalculatorREPL.run_operation("divide", "1", "2", backend=backend) == expected
+    assert History.get_last_entry().endswith(f"= {expected}")
+
+
+def test_run_batch_with_backend():
+    """Batches honor the backend, including errors from fixed-point overflow."""
+    results = CalculatorREPL.run_batch("add", ["0.1", "1e17"], ["0.2", "1e17"], backend="fixed")
+    assert results[0] == FixedPoint(30, 2)
+    assert results[1].startswith("Error: Fixed-point value out of int64 range")
+
+
+def test_repl_backend_command(monkeypatch, capsys):
+    """`backend <name>` switches the session backend used to parse operands."""
+    monkeypatch.setattr(CalculatorREPL, "backend", CalculatorREPL.backend)
+    monkeypatch.setitem(Operation.registry, "divide", Divide)  # has a kernel, so 1/3 stays exact
+    with patch("builtins.input", side_effect=["backend fraction", "divide 1 3", "backend quad", "exit"]):
+        CalculatorREPL.repl()
+    output = capsys.readouterr().out
+    assert "Numeric backend: fraction" in output
+    assert "Result: 1/3" in output
+    assert "Unknown numeric backend 'quad'" in output
+
+
+def test_run_reduction_records_one_entry(monkeypatch):
+    """`add 1 2 3 ...` is one calculation: one result, one history entry."""
+    monkeypatch.setitem(Operation.registry, "add", Add)
+    monkeypatch.setitem(Operation.registry, "divide", Divide)
+    History.clear_history()
+    assert CalculatorREPL.run_reduction("add", ["0.1"] * 10) == Decimal("1.0")
+    assert History.get_history() == "add 0.1 0.1 0.1 ... 0.1 (10 operands) = 1.0"
+    assert CalculatorREPL.run_reduction("divide", ["1", "2", "3"]) == "Error: Operation 'divide' takes exactly two operands."
+    assert CalculatorREPL.run_reduction("add", ["1", "x", "3"]).startswith("Error: Invalid number format")
+    assert CalculatorREPL.run_reduction("power", ["1", "2", "3"]) == "Operation 'power' not found."
+
+
+def test_run_reduction_overflow_is_an_error(monkeypatch, capsys):
+    """A reduction (or one-shot run) whose rounded result overflows returns an error instead of raising."""
+    monkeypatch.setitem(Operation.registry, "add", Add)
+    monkeypatch.setitem(Operation.registry, "multiply", Multiply)
+    message = "Error: Numeric overflow! The result is out of range."
+    assert CalculatorREPL.run_reduction("add", ["1e1000000", "1e-1000000", "1"]) == message
+    assert CalculatorREPL.run_operation("multiply", Decimal("1e999999"), Decimal("10")) == message
+    assert calculator.run_once("add", "1e1000000", "1e-1000000", "1") == 1
+    assert capsys.readouterr().err == message + "\n"
+
+
+def test_repl_variadic_calculation(monkeypatch, capsys):
+    """The REPL accepts more than two operands for variadic operations."""
+    monkeypatch.setitem(Operation.registry, "add", Add)
+    with patch("builtins.input", side_effect=["add 1 2 3 4", "add 1", "exit"]):
+        CalculatorREPL.repl()
+    output = capsys.readouterr().out
+    assert "Result: 10" in output
+    assert "Error: Invalid format! Use: <operation> <number1> <number2>" in output
+
+
+def test_repl_cells(monkeypatch, capsys):
+    """`name = formula` defines cells; changing an input prints every recomputed cell."""
+    monkeypatch.setattr(CalculatorREPL, "sheet", spreadsheet.Sheet())
+    monkeypatch.setitem(Operation.registry, "add", Add)
+    lines = ["a = 2", "b = 3", "x = add a b", "a = 10", "y = add x", "cells", "del b", "exit"]
+    with patch("builtins.input", side_effect=lines):
+        CalculatorREPL.repl()
+    output = capsys.readouterr().out
+    assert "x = 5" in output
+    assert "a = 10\nx = 13" in output
+    assert "Error: Invalid expression" in output
+    assert "x = add a b -> 13" in output
+    assert "Deleted b.\nx = Error: Undefined variable 'b'" in output
+
+
+def test_run_reduction_parallel_for_associative_operations(monkeypatch):
+    """Past PARALLEL_REDUCE_MIN_OPERANDS, associative operations reduce in worker processes."""
+    monkeypatch.setitem(Operation.registry, "add", Add)
+    monkeypatch.setattr("calculator.Config.PARALLEL_REDUCE_MIN_OPERANDS", 3)
+    with patch("parallel.parallel_reduce", return_value=Decimal("6")) as parallel_reduce:
+        assert CalculatorREPL.run_reduction("add", ["1", "2", "3"]) == Decimal("6")
+        assert CalculatorREPL.run_reduction("add", ["1", "2"]) == Decimal("3")
+        assert CalculatorREPL.run_reduction("add", ["1", "2", "3"], backend="float") == 6.0
+    parallel_reduce.assert_called_once_with("add", [Decimal("1"), Decimal("2"), Decimal("3")])
+
+
+def test_run_batch_vectorized_matches_rows(monkeypatch):
+    """A long float batch runs as one array call with the same results and history as row by row."""
+    monkeypatch.setitem(Operation.registry, "divide", Divide)
+    a_values, b_values = [str(i / 7) for i in range(300)], [i % 13 + 0.5 for i in range(300)]
+    batches, original = [], numeric_backend.FloatBackend.execute_batch
+
+    def execute_batch(backend, operation_class, a, b):
+        batches.append(original(backend, operation_class, a, b))
+        return batches[-1]
+
+    with patch("numeric_backend.FloatBackend.execute_batch", execute_batch):
+        vectorized = CalculatorREPL.run_batch("divide", a_values, b_values, backend="float")
+    assert len(batches) == 1 and batches[0] is not None  # the array path actually ran
+    history = History.get_history()
+    History.clear_history()
+    with patch("numeric_backend.FloatBackend.execute_batch", return_value=None):
+        assert CalculatorREPL.run_batch("divide", a_values, b_values, backend="float") == vectorized
+    assert History.get_history() == history
+
+    b_values[5] = 0  # a zero divisor keeps the row-by-row error message
+    assert CalculatorREPL.run_batch("divide", a_values, b_values, backend="float")[5] == "Error: Division by zero is not allowed."
+
+def test_import_leaves_mode_specific_modules_unloaded():
+    """Importing the calculator does not import the server, parallel, persistent history or spreadsheet modules."""
+    lazy = ["server", "parallel", "history_sqlite", "history_mmap", "startup_profile", "spreadsheet"]
+    completed = subprocess.run(
+        [sys.executable, "-c", f"import sys, calculator; print([m for m in {lazy!r} if m in sys.modules])"],
+        capture_output=True, text=True, timeout=60, check=True,
+    )
+    assert completed.stdout.strip() == "[]"
@@ -0,0 +1,128 @@
+"""Tests for `daemon_client.py` and the one-shot CLI (daemon forwarding and in-process fallback)."""
+
+import asyncio
+import io
+import os
+import socket
+import subprocess
+import sys
+import threading
+import pytest
+import daemon_client
+from calculator import CalculatorREPL, main
+from server import CalculationServer
+
+
+pytestmark = pytest.mark.usefixtures("register_operations")
+
+
+@pytest.fixture
+def daemon(tmp_path):
+    """A calculation daemon on a Unix socket, served from a background event loop."""
+    path = str(tmp_path / "calc.sock")
+    server = CalculationServer(calculator=CalculatorREPL, path=path)
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    asyncio.run_coroutine_threadsafe(server.start(), loop).result(timeout=5)
+    yield path
+    asyncio.run_coroutine_threadsafe(server.close(), loop).result(timeout=5)
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(timeout=5)
+    loop.close()
+
+
+def test_forward_prints_daemon_result(daemon):
+    """A running daemon answers; results go to stdout and errors to stderr with status 1."""
+    out, err = io.StringIO(), io.StringIO()
+    assert daemon_client.forward("add", ["2", "3"], daemon, out, err) == 0
+    assert daemon_client.forward("divide", ["1", "0"], daemon, out, err) == 1
+    assert daemon_client.forward("power", ["2", "3"], daemon, out, err) == 1
+    assert out.getvalue() == "5\n"
+    assert err.getvalue() == "Error: Division by zero is not allowed.\nOperation 'power' not found.\n"
+
+
+def test_forward_without_daemon_returns_none(tmp_path):
+    """A missing or stale socket means 'run in-process'."""
+    assert daemon_client.forward("add", ["2", "3"], str(tmp_path / "missing.sock")) is None
+
+    stale = str(tmp_path / "stale.sock")
+    with socket.socket(socket.AF_UNIX) as listener:
+        listener.bind(stale)  # bound but never listening, like a crashed daemon's leftover
+    assert daemon_client.forward("add", ["2", "3"], stale) is None
+
+
+def test_daemon_socket_is_private_and_replaces_stale_file(tmp_path):
+    """The daemon's socket is owner-only; a stale socket file is replaced, a live daemon is not."""
+    path = str(tmp_path / "calc.sock")
+
+    async def scenario():
+        with socket.socket(socket.AF_UNIX) as leftover:
+            leftover.bind(path)
+        server = CalculationServer(calculator=CalculatorREPL, path=path)
+        await server.start()
+        mode = os.stat(path).st_mode & 0o777
+        with pytest.raises(OSError, match="already listening"):
+            await CalculationServer(calculator=CalculatorREPL, path=path).start()
+        await server.close()
+        return mode
+
+    assert asyncio.run(scenario()) == 0o600
+    assert not os.path.exists(path)
+
+
+def test_one_shot_runs_in_process(capsys):
+    """`main(["add", "2", "3"])` computes locally and uses the exit status for errors."""
+    assert main(["add", "2", "3"]) == 0
+    assert main(["divide", "1", "0"]) == 1
+    assert main(["add", "x", "3"]) == 1
+    captured = capsys.readouterr()
+    assert captured.out == "5\n"
+    assert "Division by zero" in captured.err and "Invalid number format" in captured.err
+
+
+def test_cli_forwards_to_daemon(daemon):
+    """End to end: the script answers through the daemon, negative operands included."""
+    environment = dict(os.environ, DAEMON_SOCKET=daemon)
+    completed = subprocess.run([sys.executable, "calculator.py", "add", "-2", "3.5"], env=environment,
+                               capture_output=True, text=True, timeout=30, check=False)
+    assert completed.returncode == 0
+    assert completed.stdout == "1.5\n"
+    assert "Calculator started" not in completed.stderr  # the app itself never loaded
+
+
+def test_parse_one_shot():
+    """Only pure operands (and --backend) are forwarded; any other option is left to the full CLI."""
+    assert daemon_client.parse_one_shot(["add", "-2", "3.5", "1"]) == ("add", ["-2", "3.5", "1"], None)
+    assert daemon_client.parse_one_shot(["divide", "1", "3", "--backend", "fraction"]) == \
+        ("divide", ["1", "3"], "fraction")
+    assert daemon_client.parse_one_shot(["divide", "--backend=float", "1", "3"]) == ("divide", ["1", "3"], "float")
+    assert daemon_client.parse_one_shot(["add", "1", "2", "--stream"]) is None
+    assert daemon_client.parse_one_shot(["add", "1", "--backend", "float"]) is None
+
+
+def test_cli_forwards_backend_to_daemon(daemon):
+    """`--backend` reaches the daemon instead of being sent as an operand."""
+    environment = dict(os.environ, DAEMON_SOCKET=daemon)
+    completed = subprocess.run([sys.executable, "calculator.py", "divide", "1", "3", "--backend", "fraction"],
+                               env=environment, capture_output=True, text=True, timeout=30, check=False)
+    assert completed.returncode == 0
+    assert completed.stdout == "1/3\n"
+
+
+def test_unanswered_request_is_an_error_not_a_fallback(tmp_path, monkeypatch):
+    """A daemon that accepts but never answers (or hangs up) fails the call; nothing re-runs in-process."""
+    path = str(tmp_path / "hung.sock")
+    monkeypatch.setattr(daemon_client, "RESPONSE_TIMEOUT", 0.2)
+    with socket.socket(socket.AF_UNIX) as listener:
+        listener.bind(path)
+        listener.listen()
+        err = io.StringIO()
+        assert daemon_client.forward("add", ["2", "3"], path, err=err) == 1
+        assert "did not answer (timed out)" in err.getvalue()
+
+        listener.accept()[0].close()  # the first, timed-out request
+        threading.Thread(target=lambda: listener.accept()[0].close(), daemon=True).start()
+        err = io.StringIO()
+        assert daemon_client.forward("add", ["2", "3"], path, err=err) == 1
+        assert "did not answer" in err.getvalue()  # closed before a response, or reset
@@ -0,0 +1,37 @@
+"""Tests for `errors.py` (one mapping from calculation exceptions to messages and metric kinds)."""
+
+from decimal import Context, Decimal, InvalidOperation, Overflow
+import pytest
+import errors
+from errors import LimitExceeded, describe_error
+from metrics import INVALID_INPUT, LIMIT_EXCEEDED, OVERFLOW, ZERO_DIVISION
+
+
+def decimal_overflow():
+    """A real `decimal.Overflow`, as raised by a result past the context's exponent range."""
+    try:
+        Context(Emax=10, traps=[Overflow]).multiply(Decimal("1e10"), Decimal("10"))
+    except Overflow as exc:
+        return exc
+    raise AssertionError("no overflow")
+
+
+@pytest.mark.parametrize("exc, expected", [
+    (ZeroDivisionError(), (errors.DIVISION_BY_ZERO, ZERO_DIVISION)),
+    (InvalidOperation(), (errors.INVALID_NUMBER, INVALID_INPUT)),
+    (TypeError("bad operand"), (errors.INVALID_NUMBER, INVALID_INPUT)),
+    (ValueError("bad number"), (errors.INVALID_NUMBER, INVALID_INPUT)),
+    (OverflowError("Operand too large"), ("Error: Operand too large", OVERFLOW)),
+    (decimal_overflow(), (errors.NUMERIC_OVERFLOW, OVERFLOW)),
+    (LimitExceeded("Operation 'x' timed out after 5s"), ("Error: Operation 'x' timed out after 5s", LIMIT_EXCEEDED)),
+])
+def test_describe_error(exc, expected):
+    """Each calculation error maps to one message and metric kind."""
+    assert isinstance(exc, errors.CALCULATION_ERRORS)
+    assert describe_error(exc) == expected
+
+
+def test_other_exceptions_are_rejected():
+    """Exceptions outside CALCULATION_ERRORS are programming errors, not messages."""
+    with pytest.raises(TypeError, match="Not a calculation error"):
+        describe_error(KeyError("x"))
@@ -0,0 +1,90 @@
+"""Tests for the infix expression engine."""
+
+from decimal import Decimal, localcontext
+import pytest
+import expression
+from operation_base import Operation
+
+
+pytestmark = pytest.mark.usefixtures("register_operations")
+
+
+@pytest.fixture(autouse=True)
+def clear_plan_cache():
+    """Start every test with an empty plan cache."""
+    expression.compile_expression.cache_clear()
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("1 + 2 * 3", Decimal("7")),
+    ("(1 + 2) * 3", Decimal("9")),
+    ("10 - 4 - 3", Decimal("3")),
+    ("8 / 4 / 2", Decimal("1")),
+    ("-2 * -(3 + 1)", Decimal("8")),
+    ("+1.5e1 / .5", Decimal("30")),
+])
+def test_evaluate_constant_expressions(text, expected):
+    """Operator precedence, associativity, unary signs and parentheses."""
+    assert expression.evaluate(text) == expected
+
+
+def test_constant_folding():
+    """Variable-free sub-expressions are folded at compile time."""
+    tree = expression.fold_constants(expression.parse("(2 + 3) * x"))
+    assert isinstance(tree, expression.BinaryOp)
+    assert isinstance(tree.left, expression.Number) and tree.left.value == Decimal("5")
+
+    # Division by a constant zero and overflow are left for evaluation time.
+    for text in ("1 / 0", "1e999999 * 10"):
+        tree = expression.fold_constants(expression.parse(text))
+        assert isinstance(tree, expression.BinaryOp)
+
+
+def test_plan_is_cached_and_reused_with_new_variables():
+    """Repeated expression text reuses one compiled plan."""
+    plan = expression.compile_expression("(a + b) * c / d")
+    assert plan.variables == ("a", "b", "c", "d")
+    assert expression.compile_expression("(a + b) * c / d") is plan
+
+    assert plan.evaluate({"a": 1, "b": 2, "c": 3, "d": 4}) == Decimal("2.25")
+    assert expression.evaluate("(a + b) * c / d", {"a": "2", "b": "2", "c": "5", "d": "2"}) == Decimal("10")
+    assert expression.compile_expression.cache_info().misses == 1
+
+
+def test_folded_constants_follow_the_decimal_context():
+    """A plan folded under one precision is not reused under another."""
+    assert expression.evaluate("1 / 3") == Decimal(1) / Decimal(3)
+    with localcontext() as context:
+        context.prec = 5
+        assert expression.evaluate("1 / 3") == Decimal("0.33333")
+    assert len(str(expression.evaluate("1 / 3"))) == 30
+    assert expression.compile_expression.cache_info().misses == 2
+
+
+def test_dispatches_to_registered_operations():
+    """Nodes run through the registered `Operation` classes."""
+    class AlwaysFortyTwo(Operation):
+        """Replacement add that always returns 42."""
+        @classmethod
+        def execute(cls, a, b):
+            return Decimal("42")
+
+    Operation.registry["add"] = AlwaysFortyTwo
+    assert expression.evaluate("x + 1", {"x": 1}) == Decimal("42")
+
+
+@pytest.mark.parametrize("text", ["", "1 +", "(1 + 2", "1 2", "1 $ 2", "()"])
+def test_invalid_expressions(text):
+    """Malformed expressions raise ValueError."""
+    with pytest.raises(ValueError, match="Invalid expression"):
+        expression.evaluate(text)
+
+
+def test_evaluation_errors():
+    """Missing variables, bad values and zero division surface at evaluation."""
+    with pytest.raises(NameError, match="Undefined variable 'y'"):
+        expression.evaluate("x + y", {"x": 1})
+    with pytest.raises(TypeError):
+        expression.evaluate("x + 1", {"x": "abc"})
+    with pytest.raises(ZeroDivisionError):
+        expression.evaluate("x / 0", {"x": 1})
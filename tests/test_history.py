@@ -47,3 +47,42 @@ def test_clear_history():
     History.add_entry("add", 1, 1, 2)
     History.clear_history()
     assert History.get_history() == "No calculations yet."
+
+
+def test_entries_are_compact_records():
+    """Entries are stored as slotted records with interned operation names."""
+    History.add_entry("add", 5, 3, 8)
+    History.add_entry("".join(["a", "dd"]), 1, 1, 2)
+    first, second = History.get_entries()
+    assert first.operation is second.operation
+    assert not hasattr(first, "__dict__")
+    assert str(first) == "add 5 3 = 8"
+
+
+def test_ring_buffer_capacity():
+    """Once full, the oldest entries are evicted."""
+    original = History.capacity()
+    try:
+        History.set_capacity(2)
+        History.add_entries([("add", 1, 1, 2), ("add", 2, 2, 4), ("add", 3, 3, 6)])
+        assert History.get_history() == "add 2 2 = 4\nadd 3 3 = 6"
+
+        History.set_capacity(1)
+        assert History.get_history() == "add 3 3 = 6"
+        assert History.capacity() == 1
+    finally:
+        History.set_capacity(original)
+
+
+def test_expression_entries():
+    """Expression entries are formatted with their variable values."""
+    History.add_expression("a + 1", {"a": 2}, 3)
+    History.add_expression("1 + 1", None, 2)
+    assert History.get_history() == "a + 1 with a=2 = 3\n1 + 1 = 2"
+
+
+def test_reduction_entries_elide_long_operand_lists():
+    """A variadic calculation is one entry; long operand lists keep only their ends."""
+    History.add_reduction("add", [1, 2, 3], 6)
+    History.add_reduction("add", list(range(1, 101)), 5050)
+    assert History.get_history() == "add 1 2 3 = 6\nadd 1 2 3 ... 100 (100 operands) = 5050"
@@ -0,0 +1,106 @@
+"""Tests for the memory-mapped append-only history log."""
+
+from unittest.mock import patch
+import pytest
+from calculator import configure_history
+from history import History, HistoryEntry, ExpressionEntry
+import history_mmap
+from history_mmap import MmapHistoryLog
+
+
+@pytest.fixture
+def log_path(tmp_path):
+    """Path of a fresh log file."""
+    return str(tmp_path / "audit.log")
+
+
+@pytest.fixture(autouse=True)
+def reset_history():
+    """Ensures history is cleared and detached after each test."""
+    yield
+    History.detach_store()
+    History.clear_history()
+
+
+def test_append_and_read(log_path):
+    """Records can be read back by position, including from the end."""
+    log = MmapHistoryLog(log_path)
+    log.append(HistoryEntry("add", 1, 2, 3))
+    log.append(ExpressionEntry("(a + 1) / 2", {"a": "3"}, 2))
+    log.extend([HistoryEntry("divide", 1, 4, "0.25")])
+
+    assert len(log) == 3
+    created_at, entry = log.read(0)
+    assert created_at > 0 and str(entry) == "add 1 2 = 3"
+    assert str(log.read(-2)[1]) == "(a + 1) / 2 with a=3 = 2"
+    assert str(log.last()) == "divide 1 4 = 0.25"
+    assert [str(e) for e in log.recent(2)] == ["(a + 1) / 2 with a=3 = 2", "divide 1 4 = 0.25"]
+    with pytest.raises(IndexError):
+        log.read(3)
+    log.close()
+    log.close()  # closing twice is harmless
+
+
+def test_empty_log(log_path):
+    """An empty log has no entries."""
+    log = MmapHistoryLog(log_path)
+    assert len(log) == 0 and log.last() is None and not log.recent()
+    log.close()
+
+
+def test_reopen_appends_after_existing_records(log_path):
+    """Reopening finds the end of the log from the index and keeps appending."""
+    log = MmapHistoryLog(log_path)
+    log.append(HistoryEntry("add", 1, 1, 2))
+    log.close()
+
+    log = MmapHistoryLog(log_path)
+    log.append(HistoryEntry("add", 2, 2, 4))
+    assert [str(e) for e in log.recent()] == ["add 1 1 = 2", "add 2 2 = 4"]
+    log.close()
+
+
+def test_growth_beyond_initial_mapping(log_path):
+    """The log file grows and is remapped when records no longer fit."""
+    with patch.object(history_mmap, "_INITIAL_SIZE", 64):
+        log = MmapHistoryLog(log_path)
+        log.extend(HistoryEntry("multiply", i, i, i * i) for i in range(500))
+        big = "9" * 10_000
+        log.append(HistoryEntry("add", big, 0, big))
+        assert len(log) == 501
+        assert str(log.read(250)[1]) == "multiply 250 250 = 62500"
+        assert log.last().a == big
+        log.close()
+
+
+def test_records_survive_without_close(log_path):
+    """Appended records are visible to a new reader even if the writer never closes (e.g. it crashed)."""
+    writer = MmapHistoryLog(log_path)
+    writer.append(HistoryEntry("add", 1, 2, 3))
+    writer.extend([HistoryEntry("add", 2, 2, 4)])
+    reader = MmapHistoryLog(log_path)
+    assert [str(entry) for entry in reader.recent()] == ["add 1 2 = 3", "add 2 2 = 4"]
+    reader.close()
+    writer.close()
+
+
+def test_partial_index_entry_is_discarded(log_path):
+    """A torn trailing index write is ignored on reopen."""
+    log = MmapHistoryLog(log_path)
+    log.append(HistoryEntry("add", 1, 1, 2))
+    log.close()
+    with open(f"{log_path}.idx", "ab") as index:
+        index.write(b"\x01\x02")
+
+    log = MmapHistoryLog(log_path)
+    assert len(log) == 1
+    log.close()
+
+
+def test_configure_mmap_history(log_path):
+    """HISTORY_BACKEND=mmap attaches the log to History."""
+    with patch("calculator.Config.HISTORY_LOG_PATH", log_path), patch("calculator.atexit.register"):
+        log = configure_history("mmap")
+    History.add_entry("subtract", 5, 2, 3)
+    assert str(log.last()) == "subtract 5 2 = 3"
+    log.close()
@@ -0,0 +1,124 @@
+"""Tests for the SQLite-backed persistent history store."""
+
+from datetime import datetime
+import sqlite3
+import time
+from unittest.mock import patch
+import pytest
+from calculator import configure_history
+from history import History, HistoryEntry, ExpressionEntry
+from history_sqlite import SQLiteHistoryStore, path_from_url
+
+
+@pytest.fixture
+def store(tmp_path):
+    """An open store in a temporary database."""
+    store = SQLiteHistoryStore(str(tmp_path / "history.db"), flush_interval=0.01)
+    yield store
+    store.close()
+
+
+@pytest.fixture(autouse=True)
+def reset_history():
+    """Ensures history is cleared and detached before and after each test."""
+    History.detach_store()
+    History.clear_history()
+    yield
+    History.detach_store()
+    History.clear_history()
+
+
+def test_path_from_url():
+    """DATABASE_URL values map to file paths."""
+    assert path_from_url("sqlite:///calculator2.db") == "calculator2.db"
+    assert path_from_url("sqlite:////tmp/history.db") == "/tmp/history.db"
+    with pytest.raises(ValueError, match="Unsupported DATABASE_URL"):
+        path_from_url("postgres://localhost/db")
+
+
+def test_writes_are_batched_and_persisted(store, tmp_path):
+    """Entries are written by the background thread in WAL mode and survive reopening."""
+    store.extend(HistoryEntry("add", i, 1, i + 1) for i in range(1000))
+    store.append(ExpressionEntry("a + 1", {"a": 2}, 3))
+    store.close()
+
+    with sqlite3.connect(str(tmp_path / "history.db")) as connection:
+        assert connection.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert connection.execute("SELECT COUNT(*) FROM history").fetchone()[0] == 1001
+    connection.close()
+
+    reopened = SQLiteHistoryStore(str(tmp_path / "history.db"))
+    recent = [str(entry) for entry in reopened.recent(2)]
+    reopened.close()
+    assert recent == ["add 999 1 = 1000", "a + 1 with a=2 = 3"]
+
+
+class UnpersistableEntry:
+    """An entry whose row cannot be built, or holds a value SQLite cannot store."""
+
+    def __init__(self, row):
+        self.row = row
+
+    def to_row(self):
+        if self.row is None:
+            raise TypeError("no row")
+        return self.row
+
+
+def test_bad_entries_do_not_stop_the_writer(store, caplog):
+    """A failing entry or batch is logged; the writer keeps running and flush never hangs."""
+    store.append(UnpersistableEntry(None))
+    store.flush()
+    store.append(UnpersistableEntry(("add", object(), "1", "2")))
+    store.flush()
+    store.append(HistoryEntry("add", 1, 2, 3))
+    assert [str(entry) for entry in store.recent()] == ["add 1 2 = 3"]
+    assert "cannot be persisted" in caplog.text and "Failed to persist 1 history entries" in caplog.text
+
+
+def test_query_by_operation_and_time(store):
+    """Rows can be filtered by operation and time range."""
+    store.append(HistoryEntry("add", 1, 2, 3))
+    store.flush()
+    middle = time.time()
+    time.sleep(0.01)
+    store.append(HistoryEntry("divide", 1, 4, "0.25"))
+    store.append(HistoryEntry("add", 2, 2, 4))
+
+    assert [row[2:] for row in store.query(operation="add")] == [("1", "2", "3"), ("2", "2", "4")]
+    assert [row[1] for row in store.query(start=middle)] == ["divide", "add"]
+    assert [row[1] for row in store.query(end=datetime.fromtimestamp(middle))] == ["add"]
+    assert len(store.query(limit=1)) == 1
+
+    store.clear()
+    assert not store.query()
+
+
+def test_history_attach_store(store):
+    """History preloads persisted entries and writes new ones through the store."""
+    store.append(HistoryEntry("add", 1, 1, 2))
+    History.attach_store(store)
+    assert History.get_history() == "add 1 1 = 2"
+
+    History.add_entry("multiply", 2, 3, 6)
+    History.add_entries([("subtract", 5, 1, 4)])
+    History.add_expression("x * 2", {"x": 1}, 2)
+    History.clear_history()
+
+    assert [str(entry) for entry in store.recent()] == [
+        "add 1 1 = 2", "multiply 2 3 = 6", "subtract 5 1 = 4", "x * 2 with x=1 = 2",
+    ]
+    assert History.detach_store() is store
+
+
+def test_configure_history(tmp_path):
+    """HISTORY_BACKEND selects the store attached at startup."""
+    assert configure_history("memory") is None
+    with pytest.raises(ValueError, match="Unknown HISTORY_BACKEND"):
+        configure_history("nosql")
+
+    with patch("calculator.Config.DATABASE_URL", f"sqlite:///{tmp_path / 'calc.db'}"), \
+         patch("calculator.atexit.register") as register:
+        store = configure_history("sqlite")
+    register.assert_called_once_with(store.close)
+    store.close()
@@ -0,0 +1,135 @@
+"""Tests for `isolation.py` (plugins run in worker processes with time and memory limits)."""
+
+import sys
+import textwrap
+from decimal import Decimal
+import pytest
+import isolation
+import plugin_loader
+from calculator import CalculatorREPL
+from isolation import IsolatedOperation, IsolationPool, LimitExceeded
+from metrics import LIMIT_EXCEEDED, Metrics
+from operation_base import Operation
+
+PLUGIN_SOURCE = textwrap.dedent("""
+    import os
+    import time
+    from operation_base import Operation
+
+    class Hypot(Operation):
+        @staticmethod
+        def execute(a, b):
+            return (a * a + b * b).sqrt()
+
+        @classmethod
+        def reduce(cls, operands):
+            return sum(value * value for value in operands).sqrt()
+
+    class Ratio(Operation):
+        @staticmethod
+        def execute(a, b):
+            return a / b
+
+    class Stall(Operation):
+        @staticmethod
+        def execute(a, b):
+            time.sleep(60)
+
+    class Hog(Operation):
+        @staticmethod
+        def execute(a, b):
+            return len(bytearray(4 * 1024 ** 3))
+
+    class Crash(Operation):
+        @staticmethod
+        def execute(a, b):
+            os._exit(1)
+
+    class Pid(Operation):
+        @staticmethod
+        def execute(a, b):
+            return os.getpid()
+""")
+NAMES = ("hypot", "ratio", "stall", "hog", "crash", "pid")
+
+
+@pytest.fixture(scope="module")
+def pool(tmp_path_factory):
+    """A one-worker pool that can import the `untrusted_ops` plugin module."""
+    directory = tmp_path_factory.mktemp("isolated")
+    (directory / "untrusted_ops.py").write_text(PLUGIN_SOURCE)
+    sys.path.insert(0, str(directory))
+    pool = IsolationPool(workers=1, timeout=2, memory_mb=128).start()
+    yield pool
+    pool.close()
+    sys.path.remove(str(directory))
+
+
+@pytest.fixture
+def isolated(pool):
+    """Registers the plugin's operations as isolated stand-ins on `pool`."""
+    Operation.registry.update({name: IsolatedOperation(name, "untrusted_ops", pool) for name in NAMES})
+    return pool
+
+
+def test_results_and_errors_come_back_from_the_worker(isolated):
+    """Values and the operation's own exceptions cross the process boundary unchanged."""
+    assert Operation.registry["hypot"].execute(Decimal(3), Decimal(4)) == Decimal(5)
+    assert Operation.registry["hypot"].reduce([Decimal(2), Decimal(3), Decimal(6)]) == Decimal(7)
+    with pytest.raises(ZeroDivisionError):
+        Operation.registry["ratio"].execute(Decimal(1), Decimal(0))
+    assert "untrusted_ops" not in sys.modules
+
+
+@pytest.mark.parametrize("name, message", [("stall", "timed out after 2s"),
+                                           ("hog", "exceeded the 128 MB memory limit"),
+                                           ("crash", "crashed its worker process")])
+def test_limits_replace_the_worker(isolated, name, message):
+    """A call that times out, exhausts memory or crashes raises LimitExceeded; the next call gets a fresh worker."""
+    before = Operation.registry["pid"].execute(0, 0)
+    with pytest.raises(LimitExceeded, match=message):
+        Operation.registry[name].execute(Decimal(1), Decimal(2))
+    assert Operation.registry["pid"].execute(0, 0) != before
+    assert Operation.registry["hypot"].execute(Decimal(6), Decimal(8)) == Decimal(10)
+
+
+def test_recycle_retires_workers(isolated):
+    """After recycle() the next call runs in a fresh worker, e.g. one that imports a changed plugin."""
+    before = Operation.registry["pid"].execute(0, 0)
+    isolated.recycle()
+    assert Operation.registry["pid"].execute(0, 0) != before
+
+
+def test_calculator_reports_limit_errors(isolated, monkeypatch):
+    """run_operation turns a limit into an error message and counts it as `limit_exceeded`."""
+    monkeypatch.setattr(Metrics, "enabled", True)
+    Metrics.reset()
+    result = CalculatorREPL.run_operation("crash", Decimal(1), Decimal(2))
+    assert result == "Error: Operation 'crash' crashed its worker process"
+    assert Metrics.operations()["crash"].errors == {LIMIT_EXCEEDED: 1}
+    assert CalculatorREPL.run_operation("hypot", Decimal(5), Decimal(12)) == Decimal(13)
+    Metrics.reset()
+
+
+def test_configured_modules_are_never_imported(tmp_path, monkeypatch):
+    """ISOLATED_PLUGINS modules are registered as stand-ins by discovery and loading alike."""
+    (tmp_path / "sandboxed.py").write_text("raise SystemExit('imported')\n"
+                                           "class Sandboxed(Operation):\n    pass\n")
+    monkeypatch.setattr(plugin_loader.Config, "ISOLATED_PLUGINS", "sandboxed, other")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    plugin_loader.discover_plugins([str(tmp_path)])
+    assert isinstance(Operation.registry["sandboxed"], IsolatedOperation)
+    Operation.registry.clear()
+    plugin_loader.load_plugins([str(tmp_path)])
+    assert Operation.registry["sandboxed"].module_name == "sandboxed"
+    assert "sandboxed" not in sys.modules
+    assert plugin_loader.isolated_modules() == {"sandboxed", "other"}
+
+
+def test_closed_pool_rejects_calls():
+    """Calls after close() fail fast instead of starting workers."""
+    pool = IsolationPool(workers=1)
+    pool.close()
+    with pytest.raises(RuntimeError, match="closed"):
+        IsolatedOperation("hypot", "untrusted_ops", pool).execute(1, 2)
+    assert isolation.get_pool() is isolation.get_pool()
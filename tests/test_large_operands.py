@@ -0,0 +1,71 @@
+"""Tests for `large_operands.py` (bracketed multiply/divide for very long operands)."""
+
+import random
+from decimal import Decimal, Inexact, ROUND_05UP, ROUND_CEILING, ROUND_FLOOR, ROUND_HALF_EVEN, ROUND_HALF_UP, localcontext
+import pytest
+import large_operands
+from operations.divide import Divide
+from operations.multiply import Multiply
+
+ROUNDINGS = (ROUND_HALF_EVEN, ROUND_HALF_UP, ROUND_FLOOR, ROUND_CEILING, ROUND_05UP)
+
+
+def random_decimal(rng, digits):
+    """An exactly represented Decimal with `digits` random digits and a random sign and point."""
+    text = "".join(rng.choice("0123456789") for _ in range(digits - 1)) + rng.choice("123456789")
+    point = rng.randint(1, digits)
+    return Decimal(rng.choice("+-") + text[:point] + "." + text[point:])
+
+
+@pytest.mark.parametrize("rounding", ROUNDINGS)
+@pytest.mark.parametrize("prec", [1, 9, 28, 60])
+def test_results_identical_to_plain_arithmetic(prec, rounding):
+    """Whenever a shortcut answers, the value, digits and exponent match the plain operation."""
+    rng = random.Random(prec)
+    answered = 0
+    with localcontext() as context:
+        context.prec, context.rounding = prec, rounding
+        for _ in range(200):
+            a = random_decimal(rng, rng.choice([3, 40, 300, 3000]))
+            b = random_decimal(rng, rng.choice([1, 40, 3000]))
+            for shortcut, plain in ((large_operands.multiply, a * b), (large_operands.divide, a / b)):
+                result = shortcut(a, b)
+                if result is not None:
+                    answered += 1
+                    assert result.compare_total(plain) == 0, (a, b)
+    assert answered > 200
+
+
+def test_shortcuts_decline_when_they_cannot_help():
+    """Short, zero or non-finite operands, exact quotients and trapping contexts use the plain path."""
+    long = Decimal("1." + "3" * 2000)
+    assert large_operands.multiply(Decimal("1.5"), Decimal("2")) is None
+    assert large_operands.multiply(long, Decimal("0")) is None
+    assert large_operands.divide(long, Decimal("Infinity")) is None
+    assert large_operands.divide(long * 2, Decimal("2")) is None or (long * 2) / 2 == long  # exact quotient
+    with localcontext() as context:
+        context.traps[Inexact] = True
+        assert large_operands.multiply(long, long) is None
+
+
+def test_size_gate_and_flags():
+    """The size gate tracks digit count; shortcut results raise Inexact and Rounded like plain ones."""
+    long = Decimal("2." + "7" * 5000)
+    assert Decimal("9" * 50).__sizeof__() <= large_operands.size_limit(1000) < long.__sizeof__()
+    assert large_operands.multiply(5000, long) is None  # only Decimal operands qualify
+    with localcontext() as context:
+        context.clear_flags()
+        assert large_operands.multiply(long, long) == long * long
+        assert context.flags[Inexact]
+
+
+def test_operations_route_large_operands(monkeypatch):
+    """Multiply and Divide use the shortcuts for long operands and give the usual results."""
+    long = Decimal("9." + "8" * 30_000)
+    calls = []
+    monkeypatch.setattr(large_operands, "multiply", lambda a, b: calls.append("multiply"))
+    monkeypatch.setattr(large_operands, "divide", lambda a, b: calls.append("divide"))
+    assert Multiply.execute(long, long) == long * long  # a declining shortcut falls back to plain arithmetic
+    assert Divide.execute(long, Decimal("3")) == long / 3
+    assert Multiply.execute(Decimal("2"), Decimal("3")) == Decimal("6")
+    assert calls == ["multiply", "divide"]
@@ -1,8 +1,15 @@
 """Tests for `log_config.py` logging behavior."""
 
+import os
+import subprocess
+import sys
 import pytest
 import logging
+import logging.handlers
+from unittest.mock import MagicMock
+import log_config
 from log_config import logger  # ✅ Import centralized logger
+from app.env import LOG_MAX_BYTES
 
 @pytest.fixture(autouse=True)
 def setup_logging(caplog):
@@ -23,3 +30,68 @@ def test_error_logging(caplog):
     """Test to ensure error messages are logged correctly."""
     logger.error("Test error message")
     assert "Test error message" in caplog.text
+
+def test_records_are_written_by_listener_thread(tmp_path):
+    """Records are formatted and written by the queue listener, not the caller."""
+    handler = logging.FileHandler(tmp_path / "out.log")
+    handler.setFormatter(log_config.formatter)
+    handler.emit = MagicMock(wraps=handler.emit)
+    log_config.listener.handlers += (handler,)
+    try:
+        logger.warning("Queued %s", "message")
+        log_config.shutdown_logging()
+        assert handler.emit.call_args.args[0].getMessage() == "Queued message"
+        assert handler.emit.call_args.args[0].msg == "Queued %s"  # formatting was deferred
+    finally:
+        log_config.listener.handlers = log_config.listener.handlers[:-1]
+        log_config.start_logging()
+        handler.close()
+    assert "WARNING - Queued message" in (tmp_path / "out.log").read_text(encoding="utf-8")
+
+def test_shutdown_logging_is_idempotent():
+    """Shutting down twice is harmless and logging can be restarted."""
+    log_config.shutdown_logging()
+    log_config.shutdown_logging()
+    log_config.start_logging()
+    log_config.start_logging()
+    assert log_config.queue_handler in logger.handlers
+
+def test_level_follows_configuration(tmp_path):
+    """The logger level comes from LOG_LEVEL, so disabled levels are dropped up front."""
+    env = {**os.environ, "LOG_LEVEL": "warning", "LOG_FILE": str(tmp_path / "app.log")}
+    output = subprocess.run(
+        [sys.executable, "-c", "import log_config; print(log_config.logger.getEffectiveLevel())"],
+        env=env, capture_output=True, text=True, check=True,
+    ).stdout
+    assert int(output) == logging.WARNING
+
+def test_invalid_level_falls_back_to_info(tmp_path):
+    """An unknown LOG_LEVEL logs a warning and uses INFO instead of failing at import."""
+    env = {**os.environ, "LOG_LEVEL": "verbose", "LOG_FILE": str(tmp_path / "app.log")}
+    result = subprocess.run(
+        [sys.executable, "-c", "import log_config; print(log_config.logger.getEffectiveLevel())"],
+        env=env, capture_output=True, text=True, check=True,
+    )
+    assert int(result.stdout) == logging.INFO
+    assert "Invalid LOG_LEVEL 'VERBOSE'; using INFO" in result.stderr
+    assert log_config.resolve_level(" debug ") == logging.DEBUG and log_config.resolve_level("15") == 15
+
+def test_forked_workers_log_directly(tmp_path):
+    """Records logged in a pool worker reach the log file although the listener thread did not survive the fork."""
+    script = (
+        "import multiprocessing, parallel\n"
+        "from log_config import logger\n"
+        "def work(_):\n"
+        "    logger.warning('from worker')\n"
+        "if __name__ == '__main__':\n"
+        "    with multiprocessing.get_context('fork').Pool(1, initializer=parallel._init_worker) as pool:\n"
+        "        pool.map(work, [0])\n"
+    )
+    env = {**os.environ, "LOG_FILE": str(tmp_path / "app.log")}
+    subprocess.run([sys.executable, "-c", script], env=env, capture_output=True, text=True, check=True)
+    assert "WARNING - from worker" in (tmp_path / "app.log").read_text(encoding="utf-8")
+
+def test_file_handler_rotates():
+    """The file handler rotates by size."""
+    assert isinstance(log_config.file_handler, logging.handlers.RotatingFileHandler)
+    assert log_config.file_handler.maxBytes == LOG_MAX_BYTES
@@ -0,0 +1,131 @@
+"""Tests for `metrics.py` histograms, counters and the OpenMetrics exporter."""
+
+import random
+from decimal import Decimal
+from unittest.mock import patch
+import pytest
+import metrics
+import stream
+from calculator import CalculatorREPL
+from metrics import LatencyHistogram, Metrics, MetricsExporter
+
+
+pytestmark = pytest.mark.usefixtures("register_operations")
+
+
+@pytest.fixture(autouse=True)
+def fresh_metrics(monkeypatch):
+    """Each test starts with empty, enabled metrics."""
+    monkeypatch.setattr(Metrics, "enabled", True)
+    Metrics.reset()
+    yield
+    Metrics.reset()
+
+
+def test_bucket_ranges_are_contiguous():
+    """Every integer falls in exactly one bucket, and buckets tile the number line."""
+    previous_upper = 0
+    for index in range(200):
+        lower, upper = metrics._bucket_bounds(index)  # pylint: disable=protected-access
+        assert lower == previous_upper and upper > lower
+        assert metrics._bucket_index(lower) == index == metrics._bucket_index(upper - 1)  # pylint: disable=protected-access
+        previous_upper = upper
+
+
+def test_histogram_percentiles_within_resolution():
+    """Percentiles are accurate to the 12.5% bucket width."""
+    values = sorted(random.Random(7).randint(100, 5_000_000) for _ in range(10_000))
+    histogram = LatencyHistogram()
+    for value in values:
+        histogram.record(value)
+    for percent in (50, 90, 99):
+        exact = values[int(len(values) * percent / 100) - 1]
+        assert histogram.percentile(percent) == pytest.approx(exact, rel=0.125)
+    assert histogram.percentile(100) <= histogram.max == values[-1]
+    assert histogram.min == values[0]
+    assert LatencyHistogram().percentile(50) is None
+
+
+def test_run_operation_counts_calls_errors_and_latency():
+    """Successes get latency; failures are counted by kind; unknown names are counted globally."""
+    CalculatorREPL.run_operation("add", Decimal("1"), Decimal("2"))
+    CalculatorREPL.run_operation("ADD", Decimal("3"), Decimal("4"))
+    CalculatorREPL.run_operation("divide", Decimal("1"), Decimal("0"))
+    CalculatorREPL.run_operation("divide", "x", "1", backend="float")
+    CalculatorREPL.run_operation("power", Decimal("1"), Decimal("2"))
+
+    operations = Metrics.operations()
+    assert operations["add"].calls == 2 and operations["add"].latency.count == 2
+    assert operations["divide"].calls == 2 and operations["divide"].latency.count == 0
+    assert operations["divide"].errors == {metrics.ZERO_DIVISION: 1, metrics.INVALID_INPUT: 1}
+    assert "power" not in operations
+    assert Metrics.unknown_operations == 1
+
+
+def test_run_batch_is_instrumented_per_item():
+    """Batches record each item like a single call."""
+    CalculatorREPL.run_batch(["add", "divide", "nope"], [1, 1, 1], [2, 0, 1])
+    operations = Metrics.operations()
+    assert operations["add"].latency.count == 1
+    assert operations["divide"].errors == {metrics.ZERO_DIVISION: 1}
+    assert Metrics.unknown_operations == 1
+
+
+def test_expressions_streams_and_invalid_types_are_counted():
+    """Expressions count as `eval`, stream lines per operation, and TypeError as invalid input."""
+    CalculatorREPL.evaluate_expression("(1 + 2) / 3")
+    CalculatorREPL.evaluate_expression("1 / (a + b)", {"a": 1, "b": -1})
+    CalculatorREPL.evaluate_expression("a + 1")
+    CalculatorREPL.run_operation("add", None, Decimal("1"))
+    list(stream.evaluate_lines(stream.parse_lines(["add 1 2", "divide 1 0", "add x 1", "nope 1 2"])))
+
+    operations = Metrics.operations()
+    assert operations["eval"].calls == 3 and operations["eval"].latency.count == 1
+    assert operations["eval"].errors == {metrics.ZERO_DIVISION: 1, metrics.INVALID_INPUT: 1}
+    assert operations["add"].calls == 3 and operations["add"].latency.count == 1
+    assert operations["add"].errors == {metrics.INVALID_INPUT: 2}
+    assert operations["divide"].errors == {metrics.ZERO_DIVISION: 1}
+    assert Metrics.unknown_operations == 1
+
+
+def test_disabled_metrics_record_nothing(monkeypatch):
+    """With metrics off, the clock is never read and nothing is stored."""
+    monkeypatch.setattr(Metrics, "enabled", False)
+    with patch("calculator.perf_counter_ns") as clock:
+        CalculatorREPL.run_operation("add", Decimal("1"), Decimal("2"))
+        CalculatorREPL.run_batch("add", [1], [2])
+    clock.assert_not_called()
+    assert not Metrics.operations()
+    assert Metrics.format_stats().startswith("Metrics are disabled")
+
+
+def test_stats_command_prints_table(capsys):
+    """The REPL `stats` command shows per-operation calls, errors and percentiles."""
+    with patch("builtins.input", side_effect=["add 1 2", "divide 1 0", "stats", "exit"]):
+        CalculatorREPL.repl()
+    output = capsys.readouterr().out
+    assert "p99 µs" in output
+    assert "zero_division=1" in output
+    assert "Unknown operation lookups: 0" in output
+
+
+def test_openmetrics_export(tmp_path):
+    """The exporter writes a complete OpenMetrics document atomically, including on stop."""
+    for nanoseconds in (800, 3_000, 40_000):
+        Metrics.observe("add", nanoseconds)
+    Metrics.observe("divide", 0, metrics.ZERO_DIVISION)
+
+    text = Metrics.to_openmetrics()
+    assert 'calculator_operation_calls_total{operation="add"} 3' in text
+    assert 'calculator_operation_errors_total{operation="divide",kind="zero_division"} 1' in text
+    assert 'calculator_operation_latency_seconds_bucket{operation="add",le="1e-06"} 1' in text
+    assert 'calculator_operation_latency_seconds_bucket{operation="add",le="5e-05"} 3' in text
+    assert 'calculator_operation_latency_seconds_count{operation="add"} 3' in text
+    assert text.endswith("# EOF\n")
+
+    path = tmp_path / "calculator.prom"
+    exporter = MetricsExporter(str(path), interval=60).start()
+    exporter.stop()
+    exporter.stop()
+    assert path.read_text() == Metrics.to_openmetrics()
+    assert not (tmp_path / "calculator.prom.tmp").exists()
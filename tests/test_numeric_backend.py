@@ -0,0 +1,96 @@
+"""Tests for `numeric_backend.py` number types and backend dispatch."""
+
+from decimal import Decimal
+from fractions import Fraction
+import pytest
+from numeric_backend import (
+    BACKENDS, FixedPoint, FixedPointBackend, get_backend,
+)
+from operation_base import Operation
+from operations.add import Add
+from operations.subtract import Subtract
+from operations.multiply import Multiply
+from operations.divide import Divide
+
+
+class DecimalOnly(Operation):
+    """An operation without a kernel, written only against Decimal."""
+
+    @classmethod
+    def execute(cls, a, b):
+        if not isinstance(a, Decimal) or not isinstance(b, Decimal):
+            raise TypeError("Decimal operands required")
+        return max(a, b)
+
+
+@pytest.mark.parametrize("name, operation, a, b, expected", [
+    ("decimal", Add, "0.1", "0.2", Decimal("0.3")),
+    ("float", Add, "0.1", "0.2", 0.1 + 0.2),
+    ("fraction", Divide, "1", "3", Fraction(1, 3)),
+    ("fraction", Multiply, "0.1", "3", Fraction(3, 10)),
+    ("fixed", Subtract, "10.00", "0.01", FixedPoint(999, 2)),
+    ("fixed", Divide, "10", "3", FixedPoint(333, 2)),
+])
+def test_builtin_operations_run_on_every_backend(name, operation, a, b, expected):
+    """Unmodified operations produce the backend's number type."""
+    backend = get_backend(name)
+    result = backend.execute(operation, backend.convert(a), backend.convert(b))
+    assert result == expected
+    assert type(result) is backend.type  # pylint: disable=unidiomatic-typecheck
+
+
+@pytest.mark.parametrize("name", sorted(BACKENDS))
+def test_operations_without_kernel_run_through_decimal(name):
+    """Operations without a kernel get Decimal operands and a converted result."""
+    backend = get_backend(name)
+    result = backend.execute(DecimalOnly, backend.convert("1.5"), backend.convert("2.25"))
+    assert backend.to_decimal(result) == Decimal("2.25")
+
+
+@pytest.mark.parametrize("name", sorted(BACKENDS))
+def test_division_by_zero_raises_on_every_backend(name):
+    """Every backend reports division by zero the same way."""
+    backend = get_backend(name)
+    with pytest.raises(ZeroDivisionError):
+        backend.execute(Divide, backend.convert("1"), backend.convert("0"))
+
+
+@pytest.mark.parametrize("name", sorted(BACKENDS))
+def test_invalid_numbers_raise_value_error(name):
+    """Unparseable operands raise ValueError regardless of backend."""
+    with pytest.raises(ValueError):
+        get_backend(name).convert("abc")
+
+
+def test_get_backend_unknown_name():
+    """Unknown backend names are rejected; instances pass through."""
+    with pytest.raises(ValueError, match="Unknown numeric backend 'quad'"):
+        get_backend("quad")
+    backend = FixedPointBackend(4)
+    assert get_backend(backend) is backend
+
+
+def test_fixed_point_rounds_half_even_and_checks_range():
+    """Products and quotients round half-to-even; int64 overflow raises."""
+    assert FixedPoint.from_value("0.125") == FixedPoint(12, 2)
+    assert FixedPoint.from_value("-0.135") == FixedPoint(-14, 2)
+    assert str(FixedPoint.from_value("1.05") * FixedPoint.from_value("0.5")) == "0.52"
+    assert str(FixedPoint.from_value("-1") / FixedPoint.from_value("8")) == "-0.12"
+    assert repr(FixedPoint(-5, 2)) == "FixedPoint('-0.05')"
+    with pytest.raises(OverflowError):
+        FixedPoint.from_value("1e18")
+    with pytest.raises(ValueError, match="scales"):
+        FixedPoint(1, 2) + FixedPoint(1, 3)
+
+
+def test_float_execute_batch_declines_what_it_cannot_vectorize():
+    """Short or uneven batches, bad operands and non-finite results are left to the row-by-row path."""
+    backend = get_backend("float")
+    many = [1.5] * backend.VECTOR_MIN_BATCH
+    a, b, results = backend.execute_batch(Divide, ["3"] + many[1:], many)
+    assert (a[0], results[0], results[-1]) == (3.0, 2.0, 1.0)
+    assert backend.execute_batch(Divide, many[:10], many[:10]) is None
+    assert backend.execute_batch(Divide, many, many[1:]) is None
+    assert backend.execute_batch(Divide, ["x"] + many[1:], many) is None
+    assert backend.execute_batch(Divide, many, [0.0] + many[1:]) is None
+    assert get_backend("decimal").execute_batch(Divide, many, many) is None
@@ -1,7 +1,10 @@
 """Tests for the Operation base class and registry behavior."""
 
+import threading
+import time
+from unittest.mock import patch
 import pytest
-from operation_base import Operation
+from operation_base import Capabilities, Operation, LazyRegistry, tree_reduce
 
 class DummyOperation(Operation):
     """Dummy operation class for testing."""
@@ -79,3 +82,142 @@ def test_register_operation_method_duplicate():
 
     with pytest.raises(ValueError, match="already registered"):
         Operation.register_operation("anotheroperation", AnotherOperation)
+
+@pytest.fixture
+def lazy_registry(monkeypatch):
+    """A LazyRegistry with a fake plugin module that registers `lazyop` on import."""
+    registry = LazyRegistry()
+    monkeypatch.setattr(Operation, "registry", registry)
+
+    def fake_load(module_name):
+        class LazyOp(Operation):  # pylint: disable=unused-variable
+            """Operation defined by the fake plugin module."""
+            @classmethod
+            def execute(cls, a, b):
+                return a - b
+        return module_name
+
+    with patch("plugin_loader.load_plugin", side_effect=fake_load) as loader:
+        yield registry, loader
+
+def test_lazy_registry_imports_on_first_lookup(lazy_registry):
+    """Lookups import the plugin module once; listing names does not."""
+    registry, loader = lazy_registry
+    registry.add_lazy("lazyop", "plugins.lazyop")
+
+    assert list(registry.keys()) == ["lazyop"] and len(registry) == 1
+    assert "lazyop" in registry and not registry.is_loaded("lazyop")
+    loader.assert_not_called()
+
+    operation = Operation.get_operation("LazyOp")
+    assert operation.execute(5, 3) == 2
+    assert registry.get("lazyop") is operation
+    loader.assert_called_once_with("plugins.lazyop")
+    assert registry.is_loaded("lazyop")
+
+def test_lazy_registry_missing_names(lazy_registry):
+    """Unknown names still raise KeyError (or return the default)."""
+    registry, _ = lazy_registry
+    with pytest.raises(KeyError, match="not found in registry"):
+        Operation.get_operation("missing")
+    assert registry.get("missing", "default") == "default"
+
+def test_lazy_registry_direct_registration_supersedes_lazy_entry(lazy_registry):
+    """Importing a plugin module directly does not clash with its lazy entry."""
+    registry, loader = lazy_registry
+    registry.add_lazy("directop", "plugins.directop")
+
+    class DirectOp(Operation):
+        """Registered by a direct import."""
+        @classmethod
+        def execute(cls, a, b):
+            return a
+
+    assert registry["directop"] is DirectOp
+    loader.assert_not_called()
+
+def test_lazy_registry_items_load_everything(lazy_registry):
+    """items()/values() import pending modules; clear() forgets pending names."""
+    registry, loader = lazy_registry
+    registry.add_lazy("lazyop", "plugins.lazyop")
+    assert [name for name, _ in registry.items()] == ["lazyop"]
+    loader.assert_called_once()
+
+    registry.add_lazy("other", "plugins.other")
+    registry.clear()
+    assert len(registry) == 0 and "other" not in registry
+
+def test_lazy_registry_iteration_is_a_snapshot(lazy_registry):
+    """Iterating while plugins are swapped or discovered sees the names from when iteration began."""
+    registry, _ = lazy_registry
+    registry.add_lazy("lazyop", "plugins.lazyop")
+    names = iter(registry)
+    registry.swap({"swapped": DummyOperation}, removed=["dummyoperation"])
+    registry.add_lazy("later", "plugins.later")
+    assert list(names) == ["lazyop"]
+    assert registry.provided_by("plugins.later") == ["later"]
+
+def test_lazy_registry_concurrent_lookup_waits_for_the_import(monkeypatch):
+    """A lookup while another thread is importing the name's module waits for it instead of missing."""
+    registry = LazyRegistry()
+    monkeypatch.setattr(Operation, "registry", registry)
+    registry.add_lazy("slowop", "plugins.slowop")
+    importing, module_lock = threading.Event(), threading.Lock()
+
+    def fake_load(module_name):
+        with module_lock:  # like Python's per-module import lock
+            if registry.is_loaded("slowop"):
+                return module_name
+            importing.set()
+            time.sleep(0.05)
+
+            class SlowOp(Operation):  # pylint: disable=unused-variable
+                """Operation defined by the slow fake plugin module."""
+                @classmethod
+                def execute(cls, a, b):
+                    return a
+            return module_name
+
+    with patch("plugin_loader.load_plugin", side_effect=fake_load):
+        first = threading.Thread(target=registry.get, args=("slowop",))
+        first.start()
+        importing.wait()
+        assert registry["slowop"].__name__ == "SlowOp"
+        first.join()
+    assert "slowop" in registry and len(registry) == 1
+
+def test_bind_falls_back_to_execute():
+    """Operations without a kernel bind to `execute`; names are not normalized."""
+    assert Operation.bind("dummyoperation") == DummyOperation.execute
+    with pytest.raises(KeyError):
+        Operation.bind("DummyOperation")
+
+def test_tree_reduce_preserves_operand_order():
+    """Pairwise reduction combines neighbours, so non-commutative functions see the original order."""
+    assert tree_reduce(lambda a, b: a + b, list("abcdefg")) == "abcdefg"
+    assert tree_reduce(lambda a, b: a + b, ["x"]) == "x"
+    with pytest.raises(ValueError):
+        tree_reduce(lambda a, b: a + b, [])
+
+
+def test_capabilities_describe_builtin_operations(monkeypatch):
+    """Capabilities come from the class attributes; associative also needs variadic, vectorized a kernel."""
+    monkeypatch.setattr(Operation, "registry", LazyRegistry())
+    from operations.divide import Divide
+    from operations.multiply import Multiply
+
+    assert Multiply.capabilities() == Capabilities(pure=True, commutative=True, associative=True, vectorized=True)
+    assert Divide.capabilities() == Capabilities(pure=True, commutative=False, associative=False, vectorized=True)
+    assert str(Divide.capabilities()) == "pure, vectorized"
+
+    class Concatenate(Operation):
+        """Associative but declared without `variadic`, and without kernels."""
+        associative = True
+        cacheable = False
+
+        @classmethod
+        def execute(cls, a, b):
+            return a
+
+    assert str(Concatenate.capabilities()) == "none"
+    assert Operation.registry.capabilities() == {"concatenate": Concatenate.capabilities()}
@@ -77,3 +77,66 @@ def test_validate_numbers_invalid_type():
     """Ensure `validate_numbers()` raises TypeError for invalid inputs."""
     with pytest.raises(TypeError, match="Invalid type"):
         Operation.validate_numbers("abc", "xyz")
+
+@pytest.mark.parametrize("operation, expected", [
+    (Add, [5.0, 1.5, 7.0]),
+    (Subtract, [-1.0, 0.5, 7.0]),
+    (Multiply, [6.0, 0.5, 0.0]),
+])
+def test_execute_array_vectorized(operation, expected):
+    """Array mode runs float arrays through the vectorized kernel."""
+    np = pytest.importorskip("numpy")
+    result = operation.execute_array(np.array([2.0, 1.0, 7.0]), np.array([3.0, 0.5, 0.0]))
+    assert result.dtype == np.float64
+    assert result.tolist() == expected
+
+def test_execute_array_divide_masks_zero():
+    """Vectorized division masks zero divisors to NaN instead of raising."""
+    np = pytest.importorskip("numpy")
+    result = Divide.execute_array(np.array([10, 5, 3]), np.array([2, 0, 4]))
+    assert result[0] == 5.0 and result[2] == 0.75
+    assert np.isnan(result[1])
+
+def test_execute_array_exact_falls_back_to_decimal():
+    """Exact mode (and Decimal object arrays) use the scalar Decimal path."""
+    np = pytest.importorskip("numpy")
+    result = Add.execute_array(np.array([0.1, 0.2]), np.array([0.2, 0.1]), exact=True)
+    assert result.tolist() == [Decimal("0.3"), Decimal("0.3")]
+
+    decimals = np.array([Decimal("1"), Decimal("2")], dtype=object)
+    result = Divide.execute_array(decimals, np.array([Decimal("3"), Decimal("0")], dtype=object))
+    assert result[0] == Decimal(1) / Decimal(3)
+    assert result[1].is_nan()
+
+@pytest.mark.parametrize("operation", [Add, Subtract, Multiply, Divide])
+def test_kernel_matches_execute(operation):
+    """The unchecked kernel gives the same result as the validated `execute`."""
+    a, b = Decimal("7.5"), Decimal("2.5")
+    assert operation.kernel(a, b) == operation.execute(a, b)
+
+def test_bind_returns_raw_kernel():
+    """`bind` resolves a canonical name once and hands back the bare kernel."""
+    Operation.registry.update({"add": Add, "divide": Divide})
+    add = Operation.bind("add")
+    assert add is Add.kernel
+    assert add(Decimal("1.5"), Decimal("2")) == Decimal("3.5")
+
+    with pytest.raises(ZeroDivisionError):
+        Operation.bind("divide")(Decimal("1"), Decimal("0"))
+
+def test_reduce_sums_decimals_exactly_with_one_rounding():
+    """A Decimal reduction is exact until the single final rounding to context precision."""
+    assert Add.reduce([Decimal("0.1")] * 10) == Decimal("1.0")
+    big, tiny = Decimal("1E+30"), Decimal("1")
+    assert Add.reduce([big, tiny, -big]) == Decimal("1")  # pairwise at 28 digits would give 0
+    assert Multiply.reduce([Decimal("2"), Decimal("3"), Decimal("4")]) == Decimal("24")
+
+def test_reduce_floats_uses_fsum():
+    """Float sums are correctly rounded (no drift from left-to-right accumulation)."""
+    assert Add.reduce([0.1] * 10) == 1.0
+    assert Add.reduce([1e100, 1.0, -1e100]) == 1.0
+
+def test_reduce_rejects_binary_only_operations():
+    """Operations that are not variadic refuse more than two operands."""
+    with pytest.raises(TypeError, match="exactly two operands"):
+        Divide.reduce([Decimal("1"), Decimal("2"), Decimal("3")])
@@ -0,0 +1,89 @@
+"""Tests for the process-pool sharded evaluator."""
+
+import io
+from decimal import Decimal
+import pytest
+from calculator import main
+from operations.add import Add
+from operations.multiply import Multiply
+import parallel
+
+
+pytestmark = pytest.mark.usefixtures("register_operations")
+
+
+@pytest.fixture
+def calculation_file(tmp_path):
+    """A calculation file with a few malformed lines spread through it."""
+    lines = []
+    for i in range(200):
+        if i % 50 == 7:
+            lines.append("divide 1 0")
+        elif i % 60 == 3:
+            lines.append("")
+        else:
+            lines.append(f"add {i} 1")
+    path = tmp_path / "calculations.txt"
+    path.write_text("\n".join(lines), encoding="utf-8")  # no trailing newline
+    return path, lines
+
+
+def test_shard_ranges_cover_file_on_line_boundaries(calculation_file):
+    """Shards cover every byte in order and never split a line."""
+    path, _ = calculation_file
+    data = path.read_bytes()
+    ranges = parallel.shard_ranges(str(path), 7)
+    assert ranges[0][0] == 0 and ranges[-1][1] == len(data)
+    for (_, end), (start, _) in zip(ranges, ranges[1:]):
+        assert end == start
+        assert data[start - 1:start] == b"\n"
+
+
+def test_shard_ranges_empty_file(tmp_path):
+    """An empty file produces no shards."""
+    path = tmp_path / "empty.txt"
+    path.write_text("", encoding="utf-8")
+    assert not parallel.shard_ranges(str(path), 4)
+
+
+def test_run_parallel_matches_sequential_order(calculation_file):
+    """Parallel results are merged in original order with global line numbers."""
+    path, lines = calculation_file
+    out, err = io.StringIO(), io.StringIO()
+    stats = parallel.run_parallel(str(path), workers=2, out=out, err=err, shards_per_worker=3)
+
+    expected = [f"{i + 1}\n" for i, line in enumerate(lines) if line.startswith("add")]
+    assert out.getvalue() == "".join(expected)
+
+    expected_errors = [f"Line {i + 1}: Error: Division by zero is not allowed.\n"
+                       for i, line in enumerate(lines) if line.startswith("divide")]
+    assert err.getvalue() == "".join(expected_errors)
+    assert stats.errors == len(expected_errors)
+    assert stats.lines == len(expected) + len(expected_errors)
+
+
+def test_main_workers_requires_file(capsys):
+    """`--workers` needs a file to shard."""
+    with pytest.raises(SystemExit):
+        main(["--workers", "2"])
+    assert "--workers requires --stream FILE" in capsys.readouterr().err
+
+
+@pytest.mark.parametrize("name, operation", [("add", Add), ("multiply", Multiply)])
+def test_parallel_reduce_matches_serial(name, operation):
+    """Chunked reduction across processes gives exactly the serial result, digits and exponent included."""
+    operands = [Decimal(f"{i}.{i % 7}") / 3 for i in range(1, 300)]
+    result = parallel.parallel_reduce(name, operands, workers=3)
+    assert result.compare_total(operation.reduce(operands)) == 0
+
+
+def test_parallel_reduce_reuses_one_pool():
+    """Reductions share a long-lived pool that never forks; reset_pool retires it."""
+    operands = [Decimal(i) for i in range(1, 101)]
+    assert parallel.parallel_reduce("add", operands, workers=2) == Decimal(5050)
+    pool = parallel.get_pool()
+    assert parallel.parallel_reduce("multiply", operands[:10], workers=2) == Decimal(3628800)
+    assert parallel.get_pool() is pool
+    assert parallel._context().get_start_method() != "fork"  # pylint: disable=protected-access
+    parallel.reset_pool()
+    assert parallel.get_pool() is not pool
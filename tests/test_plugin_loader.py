@@ -1,15 +1,20 @@
 """Tests for `plugin_loader.py` plugin loading behavior."""
 
+import os
 import runpy
+import sys
 import pytest
 import plugin_loader
+from operation_base import Operation, LazyRegistry
 from unittest.mock import patch
 import logging
+from log_config import logger
 
 @pytest.fixture(autouse=True)
 def setup_logging(caplog):
-    """Ensure log capture is set to DEBUG for all tests."""
+    """Ensure log capture is set to DEBUG for all tests (plugin_loader logs through the app logger)."""
     caplog.set_level(logging.DEBUG, logger="plugin_loader")
+    caplog.set_level(logging.DEBUG, logger=logger.name)
 
 @patch("plugin_loader.importlib.import_module", side_effect=ImportError("Mocked failure"))
 @patch("plugin_loader.pkgutil.iter_modules", return_value=[(None, "fake_module", None)])
@@ -75,3 +80,180 @@ def test_plugin_debug_logging(mock_import, caplog):
 
     # ✅ Ensure the debug log is captured
     assert "Attempting to load plugin: invalid_plugin" in caplog.text
+
+@pytest.fixture
+def plugin_package(tmp_path, monkeypatch):
+    """A throwaway plugin package on sys.path with two operation modules and a helper."""
+    package = tmp_path / "lazy_plugins"
+    package.mkdir()
+    (package / "__init__.py").write_text("")
+    (package / "power.py").write_text(
+        "from operation_base import Operation\n"
+        "class Power(Operation):\n"
+        "    @classmethod\n"
+        "    def execute(cls, a, b):\n"
+        "        return a ** b\n"
+        "class SquarePower(Power):\n"
+        "    pass\n"
+    )
+    (package / "helpers.py").write_text("VALUE = 1\n")
+    (package / "broken.py").write_text("class Broken(Operation:\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.setattr(Operation, "registry", LazyRegistry())
+    return package
+
+def test_declared_operations(plugin_package):
+    """Operation classes are found by parsing source, including subclasses of sibling operations."""
+    assert plugin_loader.declared_operations(str(plugin_package / "power.py")) == ["power", "squarepower"]
+    assert not plugin_loader.declared_operations(str(plugin_package / "helpers.py"))
+
+def test_discover_plugins_is_lazy(plugin_package, caplog):
+    """Discovery registers names without importing the package or its modules."""
+    plugin_loader.discover_plugins(str(plugin_package))
+
+    assert "lazy_plugins" not in sys.modules
+    assert sorted(Operation.registry.keys()) == ["power", "squarepower"]
+    assert "power" in Operation.registry
+    assert not Operation.registry.is_loaded("power")
+    assert "Failed to inspect" in caplog.text and "broken.py" in caplog.text
+
+    assert Operation.get_operation("power").execute(2, 3) == 8
+    assert "lazy_plugins.power" in sys.modules
+
+def test_imported_bases_are_resolved_by_importing(tmp_path, monkeypatch):
+    """Aliased `Operation` bases are parsed; subclasses of imported operations make discovery import the module."""
+    (tmp_path / "aliased.py").write_text(
+        "from operation_base import Operation as Op\n"
+        "class Mixin:\n    pass\n"
+        "class Pow(Mixin, Op):\n"
+        "    @classmethod\n"
+        "    def execute(cls, a, b):\n"
+        "        return a ** b\n"
+    )
+    (tmp_path / "checked.py").write_text(
+        "from operations.add import Add\n"
+        "class CheckedAdd(Add):\n"
+        "    pass\n"
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.setattr(Operation, "registry", LazyRegistry())
+    assert plugin_loader.declared_operations(str(tmp_path / "aliased.py")) == ["pow"]
+    assert plugin_loader.declared_operations(str(tmp_path / "checked.py")) is None
+
+    try:
+        plugin_loader.discover_plugins([str(tmp_path)])
+        assert not Operation.registry.is_loaded("pow") and "aliased" not in sys.modules
+        assert Operation.registry.is_loaded("checkedadd") and "checked" in sys.modules
+        assert Operation.get_operation("pow").execute(2, 3) == 8
+    finally:
+        for module_name in ("aliased", "checked"):
+            sys.modules.pop(module_name, None)
+            plugin_loader._loaded_plugins.discard(module_name)  # pylint: disable=protected-access
+
+def test_discover_plugins_missing_directory(caplog, tmp_path):
+    """A missing plugin directory is logged, not raised."""
+    plugin_loader.discover_plugins(str(tmp_path / "missing"))
+    assert "Plugin directory not found" in caplog.text
+
+def test_plugin_directories_from_configuration(tmp_path):
+    """PLUGIN_DIRECTORY may list several directories; relative ones resolve against the project root."""
+    configured = os.pathsep.join(["operations", str(tmp_path)])
+    with patch("plugin_loader.Config.PLUGIN_DIRECTORY", configured):
+        directories = plugin_loader.plugin_directories()
+    assert directories == [os.path.join(plugin_loader.PROJECT_ROOT, "operations"), str(tmp_path)]
+
+def test_plain_directory_plugins_import_as_top_level_modules(tmp_path, monkeypatch):
+    """Plugins in a directory without __init__.py are importable by module name."""
+    (tmp_path / "cube_plugin.py").write_text(
+        "from operation_base import Operation\n"
+        "class Cube(Operation):\n"
+        "    @classmethod\n"
+        "    def execute(cls, a, b):\n"
+        "        return a ** 3\n"
+    )
+    monkeypatch.setattr(Operation, "registry", LazyRegistry())
+    monkeypatch.setattr(sys, "path", list(sys.path))
+    plugin_loader.discover_plugins([str(tmp_path)])
+    assert Operation.get_operation("cube").execute(2, None) == 8
+
+def test_scan_directory_uses_persisted_cache(plugin_package):
+    """A warm scan skips listing and parsing; only changed files are parsed again."""
+    directory = str(plugin_package)
+    cold = plugin_loader.scan_directory(directory)
+    assert cold["power"] == ["power", "squarepower"]
+    assert os.path.isfile(os.path.join(directory, "__pycache__", plugin_loader.MANIFEST_NAME))
+
+    with patch("plugin_loader.declared_operations") as parse, patch("plugin_loader.os.scandir") as listing:
+        assert plugin_loader.scan_directory(directory) == cold
+    parse.assert_not_called()
+    listing.assert_not_called()
+
+    helpers = plugin_package / "helpers.py"
+    helpers.write_text("from operation_base import Operation\nclass Helper(Operation):\n    pass\n")
+    os.utime(helpers, ns=(1, 1))  # force a visible mtime change
+    with patch("plugin_loader.declared_operations", wraps=plugin_loader.declared_operations) as parse:
+        warm = plugin_loader.scan_directory(directory)
+    parse.assert_called_once_with(str(helpers))
+    assert warm["helpers"] == ["helper"]
+
+    (plugin_package / "extra.py").write_text("VALUE = 2\n")
+    os.utime(directory, ns=(2, 2))
+    assert plugin_loader.scan_directory(directory)["extra"] == []
+
+@pytest.fixture
+def watched_package(plugin_package, monkeypatch):
+    """`plugin_package` discovered afresh, with `power` imported and a watcher on the package."""
+    for module_name in ("lazy_plugins", "lazy_plugins.power"):
+        monkeypatch.delitem(sys.modules, module_name, raising=False)
+    monkeypatch.setattr(plugin_loader, "_loaded_plugins", set())
+    plugin_loader.discover_plugins(str(plugin_package))
+    Operation.registry["power"]
+    return plugin_package, plugin_loader.PluginWatcher(str(plugin_package))
+
+def test_watcher_hot_reloads_changed_plugins(watched_package):
+    """A changed module is swapped in whole; classes already in use keep working on the old version."""
+    package, watcher = watched_package
+    old_power = Operation.registry["power"]
+    (package / "power.py").write_text(
+        "from operation_base import Operation\n"
+        "OFFSET = 100\n"
+        "class Power(Operation):\n"
+        "    @classmethod\n"
+        "    def execute(cls, a, b):\n"
+        "        return a ** b + OFFSET\n"
+        "class Root(Operation):\n"
+        "    @classmethod\n"
+        "    def execute(cls, a, b):\n"
+        "        return a ** (1 / b)\n"
+    )
+    assert watcher.check() == ["lazy_plugins.power"]
+    assert Operation.registry["power"].execute(2, 3) == 108
+    assert Operation.registry["root"].execute(9, 2) == 3
+    assert "squarepower" not in Operation.registry
+    assert old_power.execute(2, 3) == 8
+    assert sys.modules["lazy_plugins.power"].OFFSET == 100
+    assert watcher.check() == []
+
+def test_failed_reload_keeps_the_loaded_version(watched_package, caplog):
+    """A plugin that no longer imports, or that claims another plugin's operation, is not swapped in."""
+    package, watcher = watched_package
+    old_power = Operation.registry["power"]
+    (package / "power.py").write_text("class Power(Operation:\n")
+    assert watcher.check() == []
+    assert "Failed to reload plugin lazy_plugins.power" in caplog.text
+
+    Operation.registry.add_lazy("cube", "lazy_plugins.cube")
+    (package / "power.py").write_text("from operation_base import Operation\nclass Cube(Operation):\n    pass\n")
+    with pytest.raises(ImportError, match="already provided by lazy_plugins.cube"):
+        plugin_loader.reload_plugin("lazy_plugins.power")
+    assert Operation.registry["power"] is old_power
+
+def test_watcher_updates_lazy_entries(watched_package):
+    """New and deleted plugin files only change lazy entries; nothing new is imported."""
+    package, watcher = watched_package
+    (package / "square.py").write_text("from operation_base import Operation\nclass Square(Operation):\n    pass\n")
+    (package / "power.py").unlink()
+    assert watcher.check() == ["lazy_plugins.power", "lazy_plugins.square"]
+    assert "power" not in Operation.registry and "lazy_plugins.power" not in sys.modules
+    assert Operation.registry.provider("square") == "lazy_plugins.square"
+    assert not Operation.registry.is_loaded("square")
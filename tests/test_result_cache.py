@@ -0,0 +1,145 @@
+"""Tests for the bounded LRU result cache."""
+
+from decimal import Decimal, localcontext
+import pytest
+from operation_base import Operation
+from result_cache import ResultCache
+
+
+class CountingDivide(Operation):
+    """Division that counts how often it actually runs."""
+
+    calls = 0
+
+    @classmethod
+    def execute(cls, a, b):
+        cls.calls += 1
+        return a / b
+
+
+class CountingMultiply(Operation):
+    """Multiplication (commutative) that counts how often it actually runs."""
+
+    commutative = True
+    calls = 0
+
+    @classmethod
+    def execute(cls, a, b):
+        cls.calls += 1
+        return a * b
+
+
+class RandomOperation(Operation):
+    """An impure operation that opts out of caching."""
+
+    cacheable = False
+    calls = 0
+
+    @classmethod
+    def execute(cls, a, b):
+        cls.calls += 1
+        return Decimal(cls.calls)
+
+
+@pytest.fixture(autouse=True)
+def reset_counters():
+    """Reset call counters before each test."""
+    CountingDivide.calls = 0
+    CountingMultiply.calls = 0
+    RandomOperation.calls = 0
+
+
+def test_hit_and_miss_counting():
+    """Repeated calls are served from the cache."""
+    cache = ResultCache()
+    assert cache.execute(CountingDivide, Decimal("1"), Decimal("3")) == Decimal(1) / Decimal(3)
+    assert cache.execute(CountingDivide, Decimal("1"), Decimal("3")) == Decimal(1) / Decimal(3)
+    assert CountingDivide.calls == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert cache.hit_rate == 0.5
+
+
+def test_key_distinguishes_representation_and_context():
+    """`2` and `2.0`, and different Decimal contexts, are separate entries."""
+    cache = ResultCache()
+    cache.execute(CountingDivide, Decimal("2"), Decimal("1"))
+    assert str(cache.execute(CountingDivide, Decimal("2.0"), Decimal("1"))) == "2.0"
+
+    with localcontext() as ctx:
+        ctx.prec = 5
+        assert cache.execute(CountingDivide, Decimal("1"), Decimal("3")) == Decimal("0.33333")
+    assert cache.execute(CountingDivide, Decimal("1"), Decimal("3")) != Decimal("0.33333")
+    assert CountingDivide.calls == 4
+
+
+def test_commutative_operands_share_an_entry():
+    """Swapped operands hit the same entry only when the operation declares itself commutative."""
+    cache = ResultCache()
+    cache.execute(CountingMultiply, Decimal("2"), Decimal("3.0"))
+    assert str(cache.execute(CountingMultiply, Decimal("3.0"), Decimal("2"))) == "6.0"
+    cache.execute(CountingDivide, Decimal("6"), Decimal("3"))
+    assert cache.execute(CountingDivide, Decimal("3"), Decimal("6")) == Decimal("0.5")
+    assert (CountingMultiply.calls, CountingDivide.calls) == (1, 2)
+
+
+def test_lru_eviction_by_entries():
+    """The least recently used entry is evicted first."""
+    cache = ResultCache(max_entries=2)
+    one, two, three = Decimal("1"), Decimal("2"), Decimal("3")
+    cache.execute(CountingDivide, one, one)
+    cache.execute(CountingDivide, two, one)
+    cache.execute(CountingDivide, one, one)  # refresh 1/1
+    cache.execute(CountingDivide, three, one)  # evicts 2/1
+    assert cache.evictions == 1 and len(cache) == 2
+
+    cache.execute(CountingDivide, one, one)
+    assert CountingDivide.calls == 3
+    cache.execute(CountingDivide, two, one)
+    assert CountingDivide.calls == 4
+
+
+def test_eviction_by_memory():
+    """The memory bound is enforced independently of the entry limit."""
+    cache = ResultCache(max_entries=1000, max_bytes=1000)
+    for i in range(20):
+        cache.execute(CountingDivide, Decimal(i), Decimal("7"))
+    assert cache.memory_bytes <= 1000
+    assert cache.evictions > 0
+
+
+def test_uncacheable_operations_and_operands():
+    """Opted-out operations, non-Decimal operands and a disabled cache always execute."""
+    cache = ResultCache()
+    cache.execute(RandomOperation, Decimal("1"), Decimal("1"))
+    assert cache.execute(RandomOperation, Decimal("1"), Decimal("1")) == Decimal("2")
+
+    cache.execute(CountingDivide, 1, 2)
+    cache.execute(CountingDivide, 1, 2)
+    assert CountingDivide.calls == 2
+
+    disabled = ResultCache(max_entries=0)
+    disabled.execute(CountingDivide, Decimal("1"), Decimal("2"))
+    disabled.execute(CountingDivide, Decimal("1"), Decimal("2"))
+    assert CountingDivide.calls == 4 and len(disabled) == 0
+
+
+def test_errors_are_not_cached():
+    """Exceptions propagate every time."""
+    cache = ResultCache()
+    for _ in range(2):
+        with pytest.raises(ZeroDivisionError):
+            cache.execute(CountingDivide, Decimal("1"), Decimal("0"))
+    assert len(cache) == 0
+
+
+def test_stats_and_clear():
+    """Stats report hits, evictions and memory; clear resets everything."""
+    cache = ResultCache(max_entries=10)
+    cache.execute(CountingDivide, Decimal("1"), Decimal("2"))
+    cache.execute(CountingDivide, Decimal("1"), Decimal("2"))
+    stats = cache.stats()
+    assert "1 hits, 1 misses (50.0% hit rate)" in stats
+    assert "0 evictions, 1/10 entries" in stats
+
+    cache.clear()
+    assert len(cache) == 0 and cache.memory_bytes == 0 and cache.hits == 0
@@ -0,0 +1,212 @@
+"""Tests for `server.py` (local TCP JSON-lines calculation service)."""
+
+import asyncio
+import json
+import threading
+import pytest
+from calculator import CalculatorREPL
+from history import History
+from isolation import LimitExceeded
+from server import BUSY_ERROR, INTERNAL_ERROR, CalculationClient, CalculationServer
+
+
+pytestmark = pytest.mark.usefixtures("register_operations")
+
+
+@pytest.fixture(autouse=True)
+def clear_history():
+    """Sessions must leave the shared history untouched; start each test with it empty."""
+    History.clear_history()
+
+
+def run_with_server(scenario, **options):
+    """Starts a server on an ephemeral local port, runs `scenario(server)` and shuts down."""
+    async def main():
+        server = CalculationServer("127.0.0.1", 0, calculator=CalculatorREPL, **options)
+        await server.start()
+        try:
+            return await scenario(server)
+        finally:
+            await server.close()
+    return asyncio.run(main())
+
+
+def test_calculate_batch_and_eval():
+    """Each method returns exact string results or error messages, echoing the id."""
+    async def scenario(server):
+        client = await CalculationClient.connect(server.host, server.port)
+        responses = [
+            await client.call("calculate", operation="add", a="0.1", b=0.2),
+            await client.call("calculate", operation="divide", a=1, b=0),
+            await client.call("calculate", operation="add", a="x", b=1),
+            await client.call("calculate", operation="divide", a=1, b=3, backend="fraction"),
+            await client.call("batch", operation="add", a=[1, 2], b=[3, "y"]),
+            await client.call("eval", expression="(a + 1) * 2", variables={"a": 2}),
+            await client.call("calculate", operation="add"),
+            await client.call("power"),
+            await client.call("reduce", operation="multiply", operands=["1.5", 2, 3]),
+        ]
+        await client.close()
+        return responses
+
+    responses = run_with_server(scenario)
+    assert responses[0] == {"id": 1, "result": "0.3"}
+    assert responses[1]["error"] == "Error: Division by zero is not allowed."
+    assert responses[2]["error"].startswith("Error: Invalid number format")
+    assert responses[3]["result"] == "1/3"
+    assert responses[4]["results"] == [
+        {"result": "4"}, {"error": "Error: Invalid number format! Ensure you're using numeric values."},
+    ]
+    assert responses[5]["result"] == "6"
+    assert responses[6]["error"] == "Missing field 'a'."
+    assert responses[7]["error"] == "Unknown method 'power'."
+    assert responses[8]["result"] == "9.0"
+
+
+def test_pipelined_responses_arrive_in_request_order():
+    """Many requests sent back to back are answered in order on the same connection."""
+    async def scenario(server):
+        client = await CalculationClient.connect(server.host, server.port)
+        requests = [("batch", {"operation": "add", "a": [i] * 50, "b": [1] * 50}) if i % 7 == 0
+                    else ("calculate", {"operation": "add", "a": i, "b": 1}) for i in range(200)]
+        responses = await client.pipeline(requests)
+        await client.close()
+        return responses
+
+    responses = run_with_server(scenario, pipeline_depth=8, max_concurrency=4)
+    assert [response["id"] for response in responses] == list(range(1, 201))
+    assert responses[9]["result"] == "10"
+    assert responses[14]["results"][0] == {"result": "15"}
+
+
+def test_failing_requests_do_not_drop_the_connection(monkeypatch):
+    """Overflow and limit errors become per-request errors; pipelined requests behind them are still answered."""
+    def crash(*args, **kwargs):
+        raise LimitExceeded("Operation 'eval' crashed its worker process")
+
+    monkeypatch.setattr(CalculatorREPL, "evaluate_expression", staticmethod(crash))
+
+    async def scenario(server):
+        client = await CalculationClient.connect(server.host, server.port)
+        responses = await client.pipeline([
+            ("calculate", {"operation": "multiply", "a": "1e999999999", "b": "1e999999999"}),
+            ("reduce", {"operation": "add", "operands": ["1e1000000", "1e-1000000", "1"]}),
+            ("eval", {"expression": "1 + 1"}),
+            ("calculate", {"operation": "add", "a": 1, "b": 2}),
+        ])
+        await client.close()
+        return responses
+
+    responses = run_with_server(scenario)
+    assert responses[0]["error"] == responses[1]["error"] == "Error: Numeric overflow! The result is out of range."
+    assert responses[2] == {"id": 3, "error": "Error: Operation 'eval' crashed its worker process"}
+    assert responses[3] == {"id": 4, "result": "3"}
+
+
+def test_mistyped_fields_are_request_errors(monkeypatch, caplog):
+    """Valid JSON with wrongly typed fields gets an error response; unexpected failures are logged, not fatal."""
+    def broken(*args, **kwargs):
+        raise AttributeError("unexpected")
+
+    monkeypatch.setattr(CalculatorREPL, "evaluate_expression", staticmethod(broken))
+
+    async def scenario(server):
+        client = await CalculationClient.connect(server.host, server.port)
+        responses = await client.pipeline([
+            ("calculate", {"operation": 5, "a": 1, "b": 2}),
+            ("calculate", {"operation": None, "a": 1, "b": 2}),
+            ("calculate", {"operation": "add", "a": [1], "b": 2}),
+            ("batch", {"operation": ["add", 1], "a": [1, 2], "b": [3, 4]}),
+            ("reduce", {"operation": "add", "operands": "123"}),
+            ("eval", {"expression": "x + 1", "variables": [1]}),
+            ("eval", {"expression": "1 + 1"}),
+            ("calculate", {"operation": "add", "a": 1, "b": 2}),
+        ])
+        await client.close()
+        return responses
+
+    responses = run_with_server(scenario)
+    assert [response.get("error") for response in responses[:6]] == [
+        "Error: Field 'operation' must be a string.",
+        "Error: Field 'operation' must be a string.",
+        "Error: Field 'a' must be a number or a string.",
+        "Error: Field 'operation' must be a string or a list of strings.",
+        "Error: Field 'operands' must be a list.",
+        "Error: Field 'variables' must be an object.",
+    ]
+    assert responses[6] == {"id": 7, "error": INTERNAL_ERROR}
+    assert "Request 7 failed" in caplog.text
+    assert responses[7] == {"id": 8, "result": "3"}
+
+
+def test_calculations_run_off_the_event_loop(monkeypatch):
+    """calculate, reduce and eval execute in worker threads, not on the event loop thread."""
+    threads = []
+
+    def recording(original):
+        def wrapper(*args, **kwargs):
+            threads.append(threading.current_thread())
+            return original(*args, **kwargs)
+        return staticmethod(wrapper)
+
+    for name in ("run_operation", "run_reduction", "evaluate_expression"):
+        monkeypatch.setattr(CalculatorREPL, name, recording(getattr(CalculatorREPL, name)))
+
+    async def scenario(server):
+        client = await CalculationClient.connect(server.host, server.port)
+        await client.call("calculate", operation="add", a=1, b=2)
+        await client.call("reduce", operation="add", operands=[1, 2, 3])
+        await client.call("eval", expression="1 + 2")
+        await client.close()
+
+    run_with_server(scenario)
+    assert len(threads) == 3 and threading.main_thread() not in threads
+
+
+def test_sessions_have_isolated_history():
+    """Each connection sees only its own calculations; the shared history is untouched."""
+    async def scenario(server):
+        first = await CalculationClient.connect(server.host, server.port)
+        second = await CalculationClient.connect(server.host, server.port)
+        await first.call("calculate", operation="add", a=1, b=2)
+        await second.call("calculate", operation="divide", a=8, b=2)
+        histories = [(await client.call("history"))["result"] for client in (first, second)]
+        await first.call("clear")
+        histories.append((await first.call("history"))["result"])
+        await first.close()
+        await second.close()
+        return histories
+
+    assert run_with_server(scenario) == [["add 1 2 = 3"], ["divide 8 2 = 4"], []]
+    assert History.get_entries() == []
+
+
+def test_admission_control_rejects_when_saturated():
+    """Requests beyond `max_pending` are answered with a busy error instead of queueing."""
+    async def scenario(server):
+        server.pending = server.max_pending  # simulate a saturated server
+        client = await CalculationClient.connect(server.host, server.port)
+        busy = await client.call("calculate", operation="add", a=1, b=2)
+        server.pending = 0
+        admitted = await client.call("calculate", operation="add", a=1, b=2)
+        await client.close()
+        return busy, admitted, server.rejected
+
+    busy, admitted, rejected = run_with_server(scenario, max_pending=2)
+    assert busy == {"id": 1, "error": BUSY_ERROR}
+    assert admitted == {"id": 2, "result": "3"}
+    assert rejected == 1
+
+
+def test_invalid_json_gets_an_error_response():
+    """Malformed lines are answered, and the connection stays usable."""
+    async def scenario(server):
+        reader, writer = await asyncio.open_connection(server.host, server.port)
+        writer.write(b"not json\n[1, 2]\n")
+        await writer.drain()
+        responses = [json.loads(await reader.readline()) for _ in range(2)]
+        writer.close()
+        await writer.wait_closed()
+        return responses
+
+    assert run_with_server(scenario) == [{"id": None, "error": "Invalid JSON request."}] * 2
@@ -0,0 +1,94 @@
+"""Tests for `spreadsheet.py` (named cells, formulas and incremental recomputation)."""
+
+from decimal import Decimal
+import pytest
+from spreadsheet import Sheet
+
+
+pytestmark = pytest.mark.usefixtures("register_operations")
+
+
+def names(cells):
+    """The names of the cells an update touched, in order."""
+    return [cell.name for cell in cells]
+
+
+def test_formulas_and_updates():
+    """Operation formulas, infix expressions and constants; changing an input updates its dependents."""
+    sheet = Sheet()
+    sheet.assign("a", "2")
+    sheet.assign("b", "3")
+    sheet.assign("x", "add a b")
+    sheet.assign("y", "(x + 1) * a")
+    sheet.assign("total", "add x y 10")
+    assert sheet.value("total") == Decimal("27")
+
+    assert names(sheet.assign("a", "4")) == ["a", "x", "y", "total"]
+    assert (sheet.value("x"), sheet.value("y"), sheet.value("total")) == (Decimal("7"), Decimal("32"), Decimal("49"))
+
+
+def test_only_dirty_cells_are_recomputed():
+    """Unrelated cells are never touched, and an unchanged result stops propagation."""
+    sheet = Sheet()
+    sheet.assign("x0", "1")
+    for index in range(1, 2001):
+        sheet.assign(f"x{index}", f"add x{index - 1} 1")
+    sheet.assign("rate", "2")
+    sheet.assign("scaled", "multiply rate 3")
+    sheet.assign("sign", "divide rate rate")  # stays 1 whatever the rate
+    sheet.assign("flagged", "add sign 100")
+
+    assert names(sheet.assign("rate", "5")) == ["rate", "scaled", "sign"]
+    assert sheet.value("x2000") == Decimal("2001")
+    assert len(sheet.assign("x0", "2")) == 2001
+    assert sheet.value("x2000") == Decimal("2002")
+
+
+def test_errors_and_undefined_references():
+    """Errors are stored as messages and flow downstream; defining a missing input repairs its dependents."""
+    sheet = Sheet()
+    sheet.assign("ratio", "divide a b")
+    sheet.assign("double", "ratio * 2")
+    assert sheet.value("ratio") == "Error: Undefined variable 'a'"
+    assert sheet.value("double").startswith("Error: 'ratio' has no value")
+
+    sheet.assign("a", "1")
+    sheet.assign("b", "0")
+    assert sheet.value("ratio") == "Error: Division by zero is not allowed."
+    assert names(sheet.assign("b", "4")) == ["b", "ratio", "double"]
+    assert sheet.value("double") == Decimal("0.50")
+
+    sheet.delete("b")
+    assert sheet.value("double").startswith("Error: 'ratio' has no value")
+
+
+@pytest.mark.parametrize("name, formula, message", [
+    ("a", "add a 1", "Circular reference"),
+    ("a", "b * 2", "Circular reference"),
+    ("1x", "2", "Invalid cell name"),
+    ("x", "power a 2", "Operation 'power' not found."),
+    ("x", "add a", "Invalid expression"),
+])
+def test_invalid_assignments_are_rejected(name, formula, message):
+    """Cycles, bad names and malformed formulas raise without changing the sheet."""
+    sheet = Sheet()
+    sheet.assign("a", "1")
+    sheet.assign("b", "add a 1")
+    sheet.assign("c", "7")
+    with pytest.raises(ValueError, match=message):
+        sheet.assign(name, formula)
+    assert sheet.value("c") == Decimal("7") and len(sheet) == 3
+
+
+def test_redefining_a_formula_moves_its_dependencies():
+    """A redefined cell stops following its old inputs and keeps dependents ordered after it."""
+    sheet = Sheet()
+    sheet.assign("a", "1")
+    sheet.assign("b", "10")
+    sheet.assign("x", "add a 1")
+    sheet.assign("y", "add x 1")
+    sheet.assign("b2", "add b 1")
+    sheet.assign("x", "add b2 1")
+    assert sheet.value("y") == Decimal("13")
+    assert names(sheet.assign("a", "5")) == ["a"]
+    assert names(sheet.assign("b", "20")) == ["b", "b2", "x", "y"]
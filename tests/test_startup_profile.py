@@ -0,0 +1,78 @@
+"""Tests for `startup_profile.py` import and plugin profiling."""
+
+import json
+import subprocess
+import sys
+import pytest
+import startup_profile
+from startup_profile import StartupProfiler
+
+
+@pytest.fixture
+def profiler():
+    """An installed profiler that is always uninstalled afterwards."""
+    active = startup_profile.install()
+    yield active
+    startup_profile.uninstall()
+
+
+def test_records_self_and_inclusive_time(profiler, tmp_path, monkeypatch):
+    """Nested imports count toward the parent's inclusive time but not its self time."""
+    (tmp_path / "profiled_outer.py").write_text("import profiled_inner\nDATA = list(range(1000))\n")
+    (tmp_path / "profiled_inner.py").write_text("VALUE = 1\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.delitem(sys.modules, "profiled_outer", raising=False)
+    monkeypatch.delitem(sys.modules, "profiled_inner", raising=False)
+
+    __import__("profiled_outer")
+
+    outer, inner = profiler.records["profiled_outer"], profiler.records["profiled_inner"]
+    assert outer.loads == inner.loads == 1
+    assert outer.inclusive >= outer.self_time + inner.inclusive * 0.99
+    assert outer.allocated >= outer.self_allocated
+    assert not profiler.duplicates()
+
+
+def test_repeated_plugin_loading_is_reported():
+    """Wrapped entry points are counted, and repeated calls show up as duplicates."""
+    module = type(sys)("fake_loader")
+    module.load_plugins = lambda: None
+    profiler = StartupProfiler()
+    profiler.wrap(module, "load_plugins")
+
+    module.load_plugins()
+    module.load_plugins()
+
+    assert profiler.calls == {"fake_loader.load_plugins": 2}
+    assert profiler.records["fake_loader.load_plugins"].kind == "call"
+
+    profiler.calls["plugin_loader.load_plugins"] = 2
+    assert profiler.duplicates() == ["plugin_loader.load_plugins() called 2 times"]
+
+
+def test_format_report_lists_records_by_self_time():
+    """The text report is sorted by self time and truncated to `limit` rows."""
+    profiler = StartupProfiler()
+    for name, seconds in (("slow", 0.5), ("fast", 0.1), ("medium", 0.3)):
+        record = profiler.records[name] = startup_profile.ImportRecord(name)
+        record.self_time = record.inclusive = seconds
+        record.loads = 1
+
+    lines = profiler.format_report(limit=2).splitlines()
+    assert lines[2].endswith("slow") and lines[3].endswith("medium")
+    assert lines[4] == "... 1 more (use JSON output for the full list)"
+    assert lines[-1] == "Duplicate loads: none"
+
+
+def test_cli_writes_json_profile(tmp_path):
+    """`calculator.py --startup-profile FILE` writes the full profile as JSON, plugins included."""
+    output = tmp_path / "profile.json"
+    subprocess.run([sys.executable, "calculator.py", "--startup-profile", str(output)],
+                   check=True, capture_output=True, timeout=60)
+
+    report = json.loads(output.read_text())
+    names = {record["name"]: record for record in report["records"]}
+    assert "operation_base" in names
+    assert names["operations.add"]["kind"] == "plugin"
+    assert report["duplicates"] == []
+    assert report["calls"]["plugin_loader.discover_plugins"] == 1
@@ -0,0 +1,87 @@
+"""Tests for the streaming pipe mode."""
+
+import io
+from decimal import Decimal
+import pytest
+from calculator import main
+from errors import LimitExceeded
+from operation_base import Operation
+import stream
+
+
+pytestmark = pytest.mark.usefixtures("register_operations")
+
+
+def test_parse_lines_skips_blank_and_comments():
+    """Blank and comment lines are skipped but keep their line numbers."""
+    parsed = list(stream.parse_lines(["add 1 2\n", "\n", "# note\n", "divide 4 2\n"]))
+    assert parsed == [(1, ["add", "1", "2"]), (4, ["divide", "4", "2"])]
+
+
+def test_evaluate_lines_reports_errors():
+    """Each line yields either a result or an error message."""
+    parsed = [(1, ["add", "1", "2"]), (2, ["divide", "1", "0"]), (3, ["pow", "1", "2"]),
+              (4, ["add", "x", "2"]), (5, ["add", "1"]), (6, ["multiply", "1e999999", "10"]), (7, ["add", "2", "2"])]
+    results = list(stream.evaluate_lines(parsed))
+    assert results == [
+        (1, Decimal("3"), None),
+        (2, None, "Error: Division by zero is not allowed."),
+        (3, None, "Operation 'pow' not found."),
+        (4, None, "Error: Invalid number format! Ensure you're using numeric values."),
+        (5, None, "Error: Invalid format! Use: <operation> <number1> <number2>"),
+        (6, None, "Error: Numeric overflow! The result is out of range."),
+        (7, Decimal("4"), None),
+    ]
+
+
+def test_isolation_limits_are_line_errors(monkeypatch):
+    """An isolated plugin's limit is reported on its line; the stream keeps going."""
+    class Stall:
+        """Stand-in for an isolated operation whose worker timed out."""
+        @staticmethod
+        def execute(a, b):
+            raise LimitExceeded("Operation 'stall' timed out after 5s")
+
+    monkeypatch.setitem(Operation.registry, "stall", Stall)
+    out, err = io.StringIO(), io.StringIO()
+    stats = stream.run_stream(["stall 1 2\n", "add 1 2\n"], out, err)
+    assert out.getvalue() == "3\n"
+    assert err.getvalue() == "Line 1: Error: Operation 'stall' timed out after 5s\n"
+    assert stats.errors == 1
+
+
+def test_run_stream_buffers_output_and_continues_after_errors():
+    """Results are written in order and malformed lines do not stop the stream."""
+    out, err = io.StringIO(), io.StringIO()
+    lines = (f"add {i} 1\n" for i in range(10))
+    stats = stream.run_stream(lines, out, err, buffer_lines=3)
+    assert out.getvalue() == "".join(f"{i + 1}\n" for i in range(10))
+    assert stats.lines == 10 and stats.errors == 0
+
+    out, err = io.StringIO(), io.StringIO()
+    stats = stream.run_stream(["add 1 2\n", "oops\n", "divide 9 3\n"], out, err)
+    assert out.getvalue() == "3\n3\n"
+    assert err.getvalue() == "Line 2: Error: Invalid format! Use: <operation> <number1> <number2>\n"
+    assert stats.errors == 1
+
+
+def test_stream_file_reports_throughput(tmp_path):
+    """Streaming a file writes results and a lines/sec summary."""
+    path = tmp_path / "input.txt"
+    path.write_text("add 2 3\ndivide 1 4\n", encoding="utf-8")
+    out, err = io.StringIO(), io.StringIO()
+    stats = stream.stream_file(str(path), out, err)
+    assert out.getvalue() == "5\n0.25\n"
+    assert "Processed 2 lines (0 errors)" in err.getvalue()
+    assert "lines/sec" in err.getvalue()
+    assert stats.lines_per_second > 0
+
+
+def test_main_stream_option(tmp_path, capsys):
+    """`calculator.py --stream FILE` runs the pipe mode instead of the REPL."""
+    path = tmp_path / "input.txt"
+    path.write_text("add 1 1\n", encoding="utf-8")
+    main(["--stream", str(path)])
+    captured = capsys.readouterr()
+    assert captured.out == "2\n"
+    assert "lines/sec" in captured.err